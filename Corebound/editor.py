@@ -1,4 +1,4 @@
-import sys, pygame
+import os, sys, pygame
 
 
 def tint_image(img, color):
@@ -9,18 +9,28 @@ def tint_image(img, color):
     tinted.blit(overlay, (0, 0), special_flags=pygame.BLEND_RGBA_MULT)
     return tinted
 
-from scripts.utils import load_image, load_images
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # repo root, for the shared engine package
+
+from scripts.utils import load_image, load_images, resources
 from scripts.tilemap import Tilemap
+from engine.tilemap import rect_cells, line_cells
+from engine.presenter import create_presenter
+from engine.history import EditHistory
+from engine.autosave import Autosave
+from engine.map_view import ChunkCache, MiniMap
+from engine.input import InputMap, NO_INPUT
+from scripts.controls import EDITOR_BINDINGS
 
 RENDER_SCALE = 2.0  # Scaling factor for rendering
+ZOOM_LEVELS = (1 / 16, 1 / 8, 1 / 4, 1 / 2, 1)  # below 1 the map is drawn from cached chunk images
 
 class Editor:
     def __init__(self):
         pygame.init()
 
         pygame.display.set_caption("Corebound - Editor")
-        self.screen = pygame.display.set_mode((640, 480)) #window size = actual screen size (width 640, height 480)
         self.display = pygame.Surface((320, 240)) #scaled display surface = notice its a half of screen size
+        self.presenter = create_presenter((640, 480), self.display.get_size(), hardware=False) #window size = actual screen size (width 640, height 480)
 
         self.clock = pygame.time.Clock() #frame rate controller -> limits fps to 60
         self.font = pygame.font.Font(None, 16)
@@ -70,9 +80,21 @@ class Editor:
             'mush_trees': load_images('tiles/mush_tree'),
         }
 
-        self.movement = [False, False, False, False] #left, right, up, down movement states
+        self.controls = InputMap(EDITOR_BINDINGS) #key events -> named actions
+        self.inputs = NO_INPUT #actions held and pressed last frame
 
         self.tilemap = Tilemap(self, tile_size=16) #tile size in pixels
+        self.history = EditHistory(self.tilemap) #undo/redo of every change made through the tilemap edit methods
+        self.autosave = Autosave(self.tilemap) #journals changed chunks in the background, saves on a worker thread
+        self.recovery_available = False #an unsaved autosave journal exists for the current map
+        self.message = None #flashed text surface, see flash()
+        self.message_timer = 0 #frames the message stays on screen
+        self.chunks = ChunkCache(self.tilemap) #downsampled chunk images for zoomed out views
+        self.minimap = MiniMap(self.tilemap)
+        self.show_minimap = True
+        self.minimap_rect = pygame.Rect(0, 0, 0, 0) #where the minimap was drawn last frame, for clicks
+        self.zoom_level = len(ZOOM_LEVELS) - 1
+        self.zoom = ZOOM_LEVELS[self.zoom_level]
 
         # Defaults so the editor can run even if no map file exists
         self.current_map_id = 2  # track current map id
@@ -82,8 +104,9 @@ class Editor:
         self.tile_variant = 0
         self.clicking = False
         self.right_clicking = False
-        self.shift = False
         self.ongrid = True
+        self.tool = "brush"  # brush paints under the cursor, rect / line paint the dragged shape on release
+        self.drag_start = None  # tile where a rect / line drag started
 
         try:
             self.load_level(self.current_map_id) #load default map
@@ -92,9 +115,13 @@ class Editor:
             self.tilemap.tilemap = {}
             self.tilemap.offgrid_tiles = []
 
+    def map_path(self, map_id):
+        return resources.path("maps/" + str(map_id) + ".json")
+
     def load_level(self, map_id):
+        self.autosave.flush()  # journal unsaved edits of the map being left
         try:
-            self.tilemap.load("Corebound/data/maps/" + str(map_id) + ".json")
+            self.tilemap.load("maps/" + str(map_id) + ".json", resources)
             self.current_map_id = map_id
         except FileNotFoundError:
             # Gracefully fall back to an empty map if the file is missing
@@ -102,6 +129,7 @@ class Editor:
             self.tilemap.offgrid_tiles = []
             self.current_map_id = map_id
         self.scroll = [0, 0]
+        self.recovery_available = self.autosave.open(self.map_path(map_id))
 
         self.tile_list = list(self.assets)
         self.tile_group = 0 #index of current tile group
@@ -109,9 +137,41 @@ class Editor:
 
         self.clicking = False #to track mouse clicking state
         self.right_clicking = False #to track right mouse clicking state
-        self.shift = False #to track shift key state
         self.ongrid = True #to track if placing on grid or offgrid
 
+    def set_zoom(self, level, screen_pos):
+        """Zoom to ZOOM_LEVELS[level], keeping the map point under screen_pos (display pixels) in place."""
+        level = max(0, min(len(ZOOM_LEVELS) - 1, level))
+        zoom = ZOOM_LEVELS[level]
+        self.scroll[0] += screen_pos[0] / self.zoom - screen_pos[0] / zoom
+        self.scroll[1] += screen_pos[1] / self.zoom - screen_pos[1] / zoom
+        self.zoom_level = level
+        self.zoom = zoom
+
+    def shape_cells(self, end):
+        if self.tool == "rect":
+            return rect_cells(self.drag_start, end)
+        return line_cells(self.drag_start, end)
+
+    def apply_cells(self, cells, erase=False):
+        """Paint (or erase) many cells in one go, then autotile only the area they cover."""
+        with self.history.group():
+            area = self.tilemap.fill_cells(cells, None if erase else self.tile_list[self.tile_group], self.tile_variant)
+            if area:
+                self.tilemap.auto_tile(area)
+
+    def flash(self, text):
+        """Show text at the bottom of the screen for two seconds."""
+        self.message = self.font.render(text, True, (255, 120, 120))
+        self.message_timer = 120
+
+    def end_stroke(self):
+        """Drop the mouse drag state and close its undo step, for when the button-up is lost."""
+        self.clicking = False
+        self.right_clicking = False
+        self.drag_start = None
+        self.history.close()
+
     def run(self):
         while True:
             # Ensure critical state exists even if a prior load failed
@@ -124,12 +184,15 @@ class Editor:
 
             self.display.fill((0, 0, 0))
 
-            self.scroll[0] += (self.movement[1] - self.movement[0]) * 2 
-            self.scroll[1] += (self.movement[3] - self.movement[2]) * 2
+            self.scroll[0] += self.inputs.move * 2 / self.zoom #same speed on screen at every zoom
+            self.scroll[1] += self.inputs.move_y * 2 / self.zoom
                             
             render_scroll = (int(self.scroll[0]), int(self.scroll[1]))
 
-            self.tilemap.render(self.display, offset=render_scroll)
+            if self.zoom == 1:
+                self.tilemap.render(self.display, offset=render_scroll)
+            else:
+                self.chunks.render(self.display, render_scroll, self.zoom)
 
             current_tile_img = self.assets[self.tile_list[self.tile_group]][self.tile_variant]  # base tile image
             preview_tile_img = current_tile_img.copy()  # keep base surface untouched for placed tiles
@@ -137,25 +200,40 @@ class Editor:
 
             mpos = pygame.mouse.get_pos()
             mpos = (mpos[0] // RENDER_SCALE, mpos[1] // RENDER_SCALE) #adjust mouse position for scroll and scale
+            screen_mpos = mpos
+            mpos = (mpos[0] / self.zoom, mpos[1] / self.zoom) #map pixels from the top left corner of the view
             tile_pos = (int(mpos[0] + self.scroll[0]) // self.tilemap.tile_size, int(mpos[1] + self.scroll[1]) // self.tilemap.tile_size) #get tile coordinates under mouse
 
-            if self.ongrid: #snap to grid if ongrid mode is active
+            size = self.tilemap.tile_size
+            if self.zoom != 1: #tiles are too small to preview, outline the cell instead
+                pygame.draw.rect(self.display, (255, 255, 255), ((tile_pos[0] * size - render_scroll[0]) * self.zoom, (tile_pos[1] * size - render_scroll[1]) * self.zoom, max(2, size * self.zoom), max(2, size * self.zoom)), 1)
+            elif self.ongrid: #snap to grid if ongrid mode is active
                 self.display.blit(preview_tile_img, (tile_pos[0] * self.tilemap.tile_size - render_scroll[0], tile_pos[1] * self.tilemap.tile_size - render_scroll[1])) #draw preview of current tile at mouse position
             else:
                 self.display.blit(preview_tile_img, mpos) #draw preview of current tile at mouse position
 
 
-            if self.clicking and self.ongrid: #place tile on left click
-                self.tilemap.tilemap[str(tile_pos[0]) + ';' + str(tile_pos[1])] = {"type": self.tile_list[self.tile_group], "variant": self.tile_variant, "pos": tile_pos}
-            if self.right_clicking: #remove tile on right click
-                tile_loc = str(tile_pos[0]) + ';' + str(tile_pos[1])
-                if tile_loc in self.tilemap.tilemap:
-                    del self.tilemap.tilemap[tile_loc]
+            if self.drag_start is not None: #preview the shape being dragged
+                if self.tool == "rect":
+                    x0, x1 = sorted((self.drag_start[0], tile_pos[0]))
+                    y0, y1 = sorted((self.drag_start[1], tile_pos[1]))
+                    pygame.draw.rect(self.display, (255, 255, 255), ((x0 * size - render_scroll[0]) * self.zoom, (y0 * size - render_scroll[1]) * self.zoom, (x1 - x0 + 1) * size * self.zoom, (y1 - y0 + 1) * size * self.zoom), 1)
+                else:
+                    for pos in self.shape_cells(tile_pos):
+                        if self.zoom == 1:
+                            self.display.blit(preview_tile_img, (pos[0] * size - render_scroll[0], pos[1] * size - render_scroll[1]))
+                        else:
+                            self.display.fill((255, 255, 255), ((pos[0] * size - render_scroll[0]) * self.zoom, (pos[1] * size - render_scroll[1]) * self.zoom, max(1, size * self.zoom), max(1, size * self.zoom)))
+
+            if self.clicking and self.ongrid and self.tool == "brush": #place tile on left click
+                self.tilemap.set_tile(tile_pos, self.tile_list[self.tile_group], self.tile_variant)
+            if self.right_clicking and self.tool == "brush": #remove tile on right click
+                self.tilemap.remove_tile(tile_pos)
                 for tile in self.tilemap.offgrid_tiles.copy():
                     tile_img = self.assets[tile['type']][tile['variant']]
                     tile_r = pygame.Rect(tile['pos'][0] - self.scroll[0], tile['pos'][1] - self.scroll[1], tile_img.get_width(), tile_img.get_height()) #get rect of offgrid tile
                     if tile_r.collidepoint(mpos):
-                        self.tilemap.offgrid_tiles.remove(tile)
+                        self.tilemap.remove_offgrid(tile)
 
             self.display.blit(preview_tile_img, (5,5))
             label_text = self.tile_list[self.tile_group]
@@ -165,20 +243,40 @@ class Editor:
                 label_text += f" ({self.tile_variant})"
             text_surf = self.font.render(label_text, True, (255, 255, 255))
             self.display.blit(text_surf, (5, 5 + current_tile_img.get_height()))
+            tool_text = self.font.render(self.tool, True, (255, 255, 255))
+            self.display.blit(tool_text, (self.display.get_width() - tool_text.get_width() - 5, 5))
+            if self.show_minimap:
+                self.minimap.update()
+                view = pygame.Rect(render_scroll, (self.display.get_width() / self.zoom, self.display.get_height() / self.zoom))
+                self.minimap_rect = self.minimap.render(self.display, pygame.Rect(self.display.get_width() - 85, 20, 80, 60), view)
 
             for event in pygame.event.get(): #event handling
                 if event.type == pygame.QUIT:
+                    self.autosave.close() #journal the last edits so they can be recovered
                     pygame.quit()
                     sys.exit()
+                if event.type in (pygame.WINDOWFOCUSLOST, pygame.WINDOWLEAVE):
+                    self.end_stroke() #the button-up may go to another window
                 if event.type == pygame.MOUSEBUTTONDOWN:
+                    if event.button == 1 and self.show_minimap and self.minimap_rect.collidepoint(screen_mpos): #jump to the clicked spot
+                        center = self.minimap.tile_at(self.minimap_rect, screen_mpos)
+                        self.scroll[0] = center[0] * self.tilemap.tile_size - self.display.get_width() / self.zoom / 2
+                        self.scroll[1] = center[1] * self.tilemap.tile_size - self.display.get_height() / self.zoom / 2
+                        continue
+                    if event.button in (1, 3):
+                        if not (self.clicking or self.right_clicking):
+                            self.history.close() #a drag whose button-up never arrived
+                        self.history.begin() #the whole drag is one undo step
                     if event.button == 1: #left click to place tile
                         self.clicking = True
                         if not self.ongrid:
                             mouse_tile_pos = (int(mpos[0]) , int(mpos[1]))
-                            self.tilemap.offgrid_tiles.append({"type": self.tile_list[self.tile_group], "variant": self.tile_variant, "pos": (mpos[0] + self.scroll[0], mpos[1] + self.scroll[1])}) #place offgrid tile
+                            self.tilemap.add_offgrid({"type": self.tile_list[self.tile_group], "variant": self.tile_variant, "pos": (mpos[0] + self.scroll[0], mpos[1] + self.scroll[1])}) #place offgrid tile
                     if event.button == 3: #right click to remove tile
                         self.right_clicking = True
-                    if self.shift:
+                    if event.button in (1, 3) and self.ongrid and self.tool != "brush":
+                        self.drag_start = tile_pos
+                    if self.controls.is_held("variants"):
                         if event.button == 4: #scroll up to change tile variant
                             self.tile_variant = (self.tile_variant - 1) % len(self.assets[self.tile_list[self.tile_group]]) #loop through tile groups
                         if event.button == 5: #scroll down to change tile variant
@@ -195,52 +293,72 @@ class Editor:
                         self.clicking = False
                     if event.button == 3:
                         self.right_clicking = False
-
-                if event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_LEFT or event.key == pygame.K_a:
-                        self.movement[0] = True
-                    if event.key == pygame.K_RIGHT or event.key == pygame.K_d:
-                        self.movement[1] = True
-                    if event.key == pygame.K_UP or event.key == pygame.K_w:
-                        self.movement[2] = True
-                    if event.key == pygame.K_DOWN or event.key == pygame.K_s:
-                        self.movement[3] = True
-                    if event.key == pygame.K_TAB:
-                        self.ongrid = not self.ongrid
-                    if event.key == pygame.K_t:
-                        self.tilemap.auto_tile()
-                    if event.key == pygame.K_f:
-                        self.tilemap.fill_tiles("swamp", 0)
-                    if event.key == pygame.K_r:
-                        self.tilemap.randomize_tiles()
-                    if event.key == pygame.K_o:
-                        self.tilemap.save("Corebound/data/maps/" + str(self.current_map_id) + ".json")
-                    if event.key == pygame.K_1:
-                        self.load_level(0)
-                    if event.key == pygame.K_2:
-                        self.load_level(1)
-                    if event.key == pygame.K_3:
-                        self.load_level(2)
-                    if event.key == pygame.K_4:
-                        self.load_level(3)
-                    if event.key == pygame.K_LSHIFT:
-                        self.shift = True
-                if event.type == pygame.KEYUP:
-                    if event.key == pygame.K_LEFT or event.key == pygame.K_a:
-                        self.movement[0] = False
-                    if event.key == pygame.K_RIGHT or event.key == pygame.K_d:
-                        self.movement[1] = False
-                    if event.key == pygame.K_UP or event.key == pygame.K_w:
-                        self.movement[2] = False
-                    if event.key == pygame.K_DOWN or event.key == pygame.K_s:
-                        self.movement[3] = False
-                    if event.key == pygame.K_TAB:
-                        pass
-                    if event.key == pygame.K_LSHIFT:
-                            self.shift = False
-
-            self.screen.blit(pygame.transform.scale(self.display, self.screen.get_size()))
-            pygame.display.update()
+                    if event.button in (1, 3) and self.drag_start is not None:
+                        self.apply_cells(self.shape_cells(tile_pos), erase=event.button == 3)
+                        self.drag_start = None
+                    if event.button in (1, 3):
+                        self.history.end()
+
+                self.controls.handle(event)
+
+            self.inputs = self.controls.snapshot()
+            pressed = self.inputs.pressed
+            if "grid" in pressed:
+                self.ongrid = not self.ongrid
+            if self.recovery_available and "recover" in pressed:
+                with self.history.group(): #recovery can be undone like any edit
+                    self.autosave.recover()
+                self.recovery_available = False
+            if self.recovery_available and "discard" in pressed:
+                self.autosave.discard()
+                self.recovery_available = False
+            if "autotile" in pressed:
+                with self.history.group(): #one undo step for the whole map
+                    self.tilemap.auto_tile()
+            if "undo" in pressed:
+                self.history.undo()
+            if "redo" in pressed:
+                self.history.redo()
+            if "brush" in pressed:
+                self.tool = "brush"
+            if "rect" in pressed:
+                self.tool = "rect"
+            if "line" in pressed:
+                self.tool = "line"
+            if "fill" in pressed: # flood fill the region under the cursor with the current tile
+                region = self.tilemap.flood_region(tile_pos)
+                if region is None:
+                    self.flash("Fill region is too large")
+                else:
+                    self.apply_cells(region)
+            if "randomize" in pressed:
+                with self.history.group():
+                    self.tilemap.randomize_tiles()
+            if "zoom_out" in pressed:
+                self.set_zoom(self.zoom_level - 1, screen_mpos)
+            if "zoom_in" in pressed:
+                self.set_zoom(self.zoom_level + 1, screen_mpos)
+            if "minimap" in pressed:
+                self.show_minimap = not self.show_minimap
+            if "save" in pressed:
+                self.autosave.save() #written on the worker thread, the editor keeps running
+                self.recovery_available = False
+            for map_id in range(4):
+                if f"map_{map_id + 1}" in pressed:
+                    self.load_level(map_id)
+
+            if self.recovery_available:
+                prompt = self.font.render("Unsaved autosave: ENTER restore, BACKSPACE discard", True, (255, 220, 120))
+                self.display.blit(prompt, (5, self.display.get_height() - prompt.get_height() - 5))
+            if self.message_timer:
+                self.message_timer -= 1
+                y = self.display.get_height() - self.message.get_height() - 5
+                if self.recovery_available:
+                    y -= prompt.get_height() + 2 #above the recovery prompt
+                self.display.blit(self.message, (5, y))
+
+            self.autosave.update()
+            self.presenter.present(self.display)
             self.clock.tick(60)
 
 Editor().run()
\ No newline at end of file
@@ -1,30 +1,44 @@
-import sys, pygame, math
+import os, sys, pygame, math
 
-from scripts.utils import load_image, load_images, Animation
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # repo root, for the shared engine package
+
+from scripts.utils import load_image, load_images, Animation, resources
 from scripts.entities.BasicEntity import PhysicsEntity
 import scripts.entities.Player.PlayerEntity as PlayerEntity
 from scripts.entities.Player.PlayerAttack import PlayerAttack
 from scripts.entities.Enemy.MushroomEntity import MushroomEntity
 from scripts.entities.Enemy.EnemyEntity import EnemyEntity
-from scripts.Powerup import Powerup
-from scripts.Notification import Notification
+from scripts.Powerup import spawn_powerup, update_powerups, render_powerups, collect_powerups
+from scripts.Notification import render_notifications
 from scripts.tilemap import Tilemap
-from scripts.particle import Particle
-from scripts.sparks import Spark
+from scripts.particle import spawn_particle
+from engine.spark import spawn_spark, update_sparks, render_sparks
+from engine.ecs import World, update_motion, update_physics, update_animations, update_lifetimes, render_animations
+from engine.parallax import ParallaxBackground
+from engine.presenter import create_presenter
+from scripts.navigation import Navigation
+from engine.input import InputMap, NO_INPUT
+from engine.frame_pacer import FramePacer
+from scripts.controls import GAME_BINDINGS
 
 class Game:
-    def __init__(self):
+    def __init__(self, hardware=True):
         pygame.init()
 
         screen_width, screen_height = 800, 600
 
         pygame.display.set_caption('Corebound')
-        self.screen = pygame.display.set_mode((screen_width, screen_height))
         # Use integer backbuffer size to avoid float surface dimensions
         self.display = pygame.Surface((int(screen_width / 2.5), int(screen_height / 2.5)))
+        # Opens the window; the display is scaled on the GPU when available, unless started with --software
+        self.presenter = create_presenter((screen_width, screen_height), self.display.get_size(), hardware=hardware)
 
-        self.clock = pygame.time.Clock()
-        self.movement = [False, False]  #left, right
+        # Limits fps to 60; F4 switches to the low latency loop (input read right before the update, frames timed with a busy wait)
+        self.pacer = FramePacer(60)
+        self.show_profiler = False  # Frame time and input latency overlay, toggled with F2
+        self.profiler_font = pygame.font.Font(None, 12)
+        self.controls = InputMap(GAME_BINDINGS)  # key events -> named actions
+        self.inputs = NO_INPUT  # actions held and pressed, one snapshot per frame
         # HUD font for on-screen text (lives, etc.)
         self.font = pygame.font.Font(None, 24)
 
@@ -83,8 +97,7 @@ class Game:
         self.player_attack = PlayerAttack(self, self.player)
         self.tilemap = Tilemap(self, tile_size=16)
         self.enemies = []  # List of enemy entities
-        self.powerups = []  # List of powerup orbs
-        self.notifications = []  # List of notifications
+        self.world = World()  # Particles, sparks, powerup orbs and notifications
         self.screenshake = 0  # Screen shake for impact effects
 
         self.level = 0
@@ -92,32 +105,41 @@ class Game:
         self.debug = True  # Toggle debug hitboxes overlay
         self.load_level(self.level)
 
-        self.bg_images=[]
+        # Parallax backgrounds per level, pre-built so each frame costs one blit per layer
+        self.backgrounds = {}
+        lvl1_bg = ParallaxBackground(self.display.get_size())
+        speed = 0.2  # slower parallax base speed
         for i in range(1,4):
             bg_image = load_image(f"backgrounds/lvl_1/BG_{i}.png")
             # Scale background to be larger than the display surface
             bg_scaled = pygame.transform.scale(bg_image, (int(self.display.get_width() * 1.5), int(self.display.get_height() * 1.5)))
-            self.bg_images.append(bg_scaled)
-        
-        self.bg_width = self.bg_images[0].get_width()
+            # Background sits 50 pixels up; vertical parallax is half the horizontal one
+            lvl1_bg.add_layer(bg_scaled, factor=(speed, speed * 0.5), offset=(0, -50))
+            speed += 0.1  # gentler layering increment
+        lvl1_bg.build()
+        self.backgrounds[0] = lvl1_bg
         
         # Load stationary repeating background for level 2
         try:
-            self.lvl2_bg = load_image("backgrounds/lvl_2/bg.png")
+            lvl2_bg = load_image("backgrounds/lvl_2/bg.png")
             # Scale to match display height while maintaining aspect ratio
             bg_height = self.display.get_height()
-            scale_factor = bg_height / self.lvl2_bg.get_height()
-            new_width = int(self.lvl2_bg.get_width() * scale_factor)
-            self.lvl2_bg = pygame.transform.scale(self.lvl2_bg, (new_width, bg_height))
+            scale_factor = bg_height / lvl2_bg.get_height()
+            new_width = int(lvl2_bg.get_width() * scale_factor)
+            lvl2_bg = pygame.transform.scale(lvl2_bg, (new_width, bg_height))
+            # Not affected by scroll, tiled horizontally across the display
+            self.backgrounds[1] = ParallaxBackground(self.display.get_size())
+            self.backgrounds[1].add_layer(lvl2_bg, factor=(0, 0))
+            self.backgrounds[1].build()
         except:
-            self.lvl2_bg = None
+            pass
 
     def load_level(self, map_id):
-        self.tilemap.load("Corebound/data/maps/" + str(map_id) + ".json")
+        self.tilemap.load("maps/" + str(map_id) + ".json", resources, compiled=True)  # baked map from engine.compile_map when it is up to date
         self.level = map_id
 
         self.enemies = []
-        self.powerups = []  # Reset powerups for new level
+        self.world = World()  # Reset powerups, particles and sparks for new level
         for spawner in self.tilemap.extract([('spawners', 0), ('spawners', 1)]):
             if spawner['variant'] == 1:
                 self.player.pos = spawner['pos']
@@ -125,6 +147,8 @@ class Game:
                 self.player.air_time = 0
             else:
                 self.enemies.append(MushroomEntity(self, spawner['pos'], (8, 15)))
+        # Platform graph for enemy pathfinding, sized for the mushroom sprite
+        self.navigation = Navigation(self.tilemap, self.assets['mushroom/idle'].images[0].get_size())
 
         # Spawn powerups from map variants
         powerup_map = {
@@ -137,59 +161,63 @@ class Game:
         for pu in self.tilemap.extract([('powerups', v) for v in powerup_map]):
             skill = powerup_map.get(pu['variant'])
             if skill:
-                self.powerups.append(Powerup(self, pu['pos'], skill))
+                spawn_powerup(self, pu['pos'], skill)
 
-        self.particles = []
-        self.sparks = []
         self.scroll = [0, 0]
         
 
-    def draw_bg(self, render_scroll):
-        # Tile each layer horizontally and vertically with parallax
-        speed = 0.2  # slower parallax base speed
-        base_y_offset = -50  # Move background up by 50 pixels
-        for img in self.bg_images:
-            # Compute wrapped offset for this parallax speed (horizontal)
-            x = int((-(render_scroll[0] * speed)) % self.bg_width)
-            # Compute vertical parallax offset
-            y = int(base_y_offset - (render_scroll[1] * speed * 0.5))
-            # Draw two copies to cover seam across the viewport
-            self.display.blit(img, (x - self.bg_width, y))
-            self.display.blit(img, (x, y))
-            speed += 0.1  # gentler layering increment
-    
-    def draw_lvl2_bg(self):
-        # Draw stationary repeating background for level 2 (not affected by scroll)
-        if self.lvl2_bg is None:
-            return
-        
-        bg_width = self.lvl2_bg.get_width()
-        display_width = self.display.get_width()
-        
-        # Tile the background horizontally to cover the entire display width
-        x = 0
-        while x < display_width:
-            self.display.blit(self.lvl2_bg, (x, 0))
-            x += bg_width
+    def handle_input(self):
+        """Read this frame's events into self.inputs and act on the presses."""
+        for event in pygame.event.get(): #event handling
+            if event.type in (pygame.QUIT, pygame.WINDOWCLOSE):
+                pygame.quit()
+                sys.exit()
+            self.controls.handle(event)
+        self.inputs = self.controls.snapshot()
+        self.pacer.polled(self.inputs)
+        if 'jump' in self.inputs.pressed:
+            self.player.jump()
+        if 'dash' in self.inputs.pressed:
+            self.player.dash()
+        if 'attack' in self.inputs.pressed:
+            # Trigger player attack
+            self.player_attack.start_attack()
+        if 'debug' in self.inputs.pressed:
+            # Toggle debug overlay
+            self.debug = not self.debug
+        if 'profiler' in self.inputs.pressed:
+            self.show_profiler = not self.show_profiler
+        if 'low_latency' in self.inputs.pressed:
+            self.pacer.toggle()
+        if 'respawn' in self.inputs.pressed:
+            # Reset player to spawn
+            self.player.pos = list(self.spawn_pos)
+            self.player.air_time = 0
+        if 'quit' in self.inputs.pressed:
+            pygame.quit()
+            sys.exit()
 
-        #pygame.Rect(*self.img, self.img.get_size()) #player hitbox
-        #self.clicking = False
-        #self.right_clicking = False
-        
     def run(self):
         while True:
-            self.display.fill((0, 0, 0))
+            low_latency = self.pacer.low_latency  # F4 switches from the next frame
+            if low_latency:
+                self.handle_input()  # read right before the update, shown this frame
+            background = self.backgrounds.get(self.level)
+            if background is None or not background.covers_view:
+                self.display.fill((0, 0, 0))
             self.scroll[0] += (self.player.rect().centerx - self.display.get_width() / 2 - self.scroll[0]) / 30
             self.scroll[1] += (self.player.rect().centery - self.display.get_height() / 2 - self.scroll[1]) / 30
             render_scroll = (int(self.scroll[0]), int(self.scroll[1]))
 
-            if self.level == 0:
-                self.draw_bg(render_scroll)
-            elif self.level == 1:
-                self.draw_lvl2_bg()
+            if background:
+                background.render(self.display, render_scroll)
             self.tilemap.render(self.display, offset=render_scroll)
 
             # Update enemies
+            self.navigation.update(self.player.rect())
+            sight = self.tilemap.lines_of_sight([enemy.rect().center for enemy in self.enemies], self.player.rect().center)
+            for enemy, visible in zip(self.enemies, sight):
+                enemy.sees_player = visible
             for enemy in self.enemies.copy():
                 kill = enemy.update(self.tilemap, (0, 0))
                 if kill:
@@ -198,18 +226,15 @@ class Game:
                     enemy.render(self.display, offset=render_scroll)
             
             # Update powerups and check for collection
-            for powerup in self.powerups.copy():
-                powerup.update(self.tilemap, (0, 0))
-                powerup.render(self.display, offset=render_scroll)
-                # Check collision with player
-                if powerup.rect().colliderect(self.player.rect()):
-                    powerup.collect(self.player)
-                    self.powerups.remove(powerup)
+            update_powerups(self.world)
+            update_physics(self.world, self.tilemap)
+            render_powerups(self.world, self.display, offset=render_scroll)
+            collect_powerups(self.world, self.player)
             
             # Update player attack system
             self.player_attack.update(self.enemies)
             
-            self.player.update(self.tilemap, (self.movement[1] - self.movement[0], 0))
+            self.player.update(self.tilemap, (self.inputs.move, 0))
             self.player.render(self.display, offset=render_scroll)
 
             # HUD: Player lives (top-left) - display sprite for each life
@@ -247,60 +272,25 @@ class Game:
                 # Attack hitboxes
                 self.player_attack.render_debug(self.display, offset=render_scroll)
 
-            for particle in self.particles.copy(): 
-                kill = particle.update()
-                particle.render(self.display, offset=render_scroll)
-                if kill:
-                    self.particles.remove(particle)
-
-            for spark in self.sparks.copy():
-                kill = spark.update()
-                spark.render(self.display, offset=render_scroll)
-                if kill:
-                    self.sparks.remove(spark)
+            # Particles and sparks: every system runs over whole component columns
+            update_motion(self.world)
+            update_animations(self.world)
+            expired = update_lifetimes(self.world) + update_sparks(self.world)
+            render_animations(self.world, self.display, offset=render_scroll)
+            render_sparks(self.world, self.display, offset=render_scroll)
+            for archetype, rows in expired:
+                self.world.despawn_rows(archetype, rows)
             
-            # Update and render notifications
-            for notification in self.notifications.copy():
-                if notification.update():
-                    self.notifications.remove(notification)
-                else:
-                    notification.render(self.display)
+            # Notifications are world entities too; update_lifetimes above counts them down
+            render_notifications(self.world, self.display)
 
-            for event in pygame.event.get(): #event handling
-                if event.type == pygame.QUIT:
-                    pygame.quit()
-                    sys.exit()
+            if not low_latency:
+                self.handle_input()
+            if self.show_profiler:
+                self.pacer.render(self.display, self.profiler_font, (6, 24))
 
-                if event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_LEFT or event.key == pygame.K_a:
-                        self.movement[0] = True
-                    if event.key == pygame.K_RIGHT or event.key == pygame.K_d:
-                        self.movement[1] = True
-                    if event.key == pygame.K_UP or event.key == pygame.K_w:
-                        self.player.jump()
-                    if event.key == pygame.K_LSHIFT or event.key == pygame.K_RSHIFT:
-                        self.player.dash()
-                    if event.key == pygame.K_SPACE or event.key == pygame.K_j:
-                        # Trigger player attack
-                        self.player_attack.start_attack()
-                    if event.key == pygame.K_F3:
-                        # Toggle debug overlay
-                        self.debug = not self.debug
-                    if event.key == pygame.K_r:
-                        # Reset player to spawn
-                        self.player.pos = list(self.spawn_pos)
-                        self.player.air_time = 0
-                    if event.key == pygame.K_ESCAPE:
-                        pygame.quit()
-                        sys.exit()
-                if event.type == pygame.KEYUP:
-                    if event.key == pygame.K_LEFT or event.key == pygame.K_a:
-                        self.movement[0] = False
-                    if event.key == pygame.K_RIGHT or event.key == pygame.K_d:
-                        self.movement[1] = False
-            
-            self.screen.blit(pygame.transform.scale(self.display, self.screen.get_size()), (0, 0))
-            pygame.display.update()
-            self.clock.tick(60)
+            self.presenter.present(self.display)
+            self.pacer.presented()
+            self.pacer.tick()
 
-Game().run()
\ No newline at end of file
+Game(hardware='--software' not in sys.argv[1:]).run()
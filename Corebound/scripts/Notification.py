@@ -1,39 +1,33 @@
 import pygame
+from engine.ecs import register_component
 
-class Notification:
-    """Displays a centered notification that fades out over time."""
-    
-    def __init__(self, game, image, duration=120):
-        self.game = game
-        self.duration = duration  # frames
-        self.timer = duration
-        self.alpha = 255
-        
-        # Scale image to fit middle third of display width
-        display_width = game.display.get_width()
-        target_width = display_width // 3
-        scale_factor = target_width / image.get_width()
-        new_width = int(image.get_width() * scale_factor)
-        new_height = int(image.get_height() * scale_factor)
-        self.image = pygame.transform.scale(image, (new_width, new_height))
-    
-    def update(self):
-        """Update notification fade."""
-        self.timer -= 1
-        # Fade out in last third of duration
-        fade_start = self.duration // 3
-        if self.timer < fade_start:
-            self.alpha = int(255 * (self.timer / fade_start))
-        return self.timer <= 0
-    
-    def render(self, surf):
-        """Render notification centered on screen."""
-        # Create surface with alpha
-        img_copy = self.image.copy()
-        img_copy.set_alpha(self.alpha)
-        
-        # Center on screen
-        center_x = surf.get_width() // 2 - img_copy.get_width() // 2
-        center_y = surf.get_height() // 2 - img_copy.get_height() // 2
-        
-        surf.blit(img_copy, (center_x, center_y))
+# Notifications are ECS entities: a sprite and a lifetime (counted down by ecs.update_lifetimes), plus this component
+register_component('notification', (('duration', 'i'),))
+
+
+def spawn_notification(game, image, duration=120):
+    """Add a centered notification to game.world that fades out over its last third."""
+    # Scale image to fit middle third of display width
+    display_width = game.display.get_width()
+    target_width = display_width // 3
+    scale_factor = target_width / image.get_width()
+    new_width = int(image.get_width() * scale_factor)
+    new_height = int(image.get_height() * scale_factor)
+    image = pygame.transform.scale(image, (new_width, new_height))
+    return game.world.spawn(sprite=(image,), lifetime=(duration,), notification=(duration,))
+
+
+def render_notifications(world, surf):
+    """Render notifications centered on screen, fading out in the last third of their duration."""
+    for archetype in world.query('sprite', 'lifetime', 'notification'):
+        columns = archetype.columns
+        for image, life, duration in zip(columns['img'], columns['life'], columns['duration']):
+            fade_start = duration // 3
+            # The scaled image belongs to this notification, so its alpha can be set directly
+            image.set_alpha(int(255 * (life / fade_start)) if life < fade_start else 255)
+
+            # Center on screen
+            center_x = surf.get_width() // 2 - image.get_width() // 2
+            center_y = surf.get_height() // 2 - image.get_height() // 2
+
+            surf.blit(image, (center_x, center_y))
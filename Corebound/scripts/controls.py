@@ -0,0 +1,41 @@
+# Action -> keys, see engine.input; edit these to rebind
+
+GAME_BINDINGS = {
+    "left": ["a", "left"],
+    "right": ["d", "right"],
+    "jump": ["w", "up"],
+    "dash": ["left shift", "right shift"],
+    "profiler": ["f2"],
+    "low_latency": ["f4"],
+    "attack": ["space", "j"],
+    "debug": ["f3"],
+    "respawn": ["r"],
+    "quit": ["escape"],
+}
+
+EDITOR_BINDINGS = {
+    "left": ["a", "left"],
+    "right": ["d", "right"],
+    "up": ["w", "up"],
+    "down": ["s", "down"],
+    "grid": ["tab"],
+    "recover": ["return"],
+    "discard": ["backspace"],
+    "autotile": ["t"],
+    "randomize": ["r"],
+    "undo": ["ctrl+z"],
+    "redo": ["ctrl+shift+z", "ctrl+y"],
+    "brush": ["b"],
+    "rect": ["x"],
+    "line": ["l"],
+    "fill": ["f"],
+    "zoom_out": ["-", "keypad -"],
+    "zoom_in": ["=", "+", "keypad +"],
+    "minimap": ["m"],
+    "save": ["o"],
+    "map_1": ["1"],
+    "map_2": ["2"],
+    "map_3": ["3"],
+    "map_4": ["4"],
+    "variants": ["left shift"],  # held: the mouse wheel picks variants instead of groups
+}
@@ -1,74 +1,9 @@
-import pygame, math, random
+from engine.entities import PhysicsEntity as BasePhysicsEntity
 
-class PhysicsEntity:
-    def __init__(self, game, e_type, pos, size):
-        self.game = game
-        self.type = e_type
-        self.pos = list(pos)
-        self.size = size
-        self.velocity = [0, 0]
-        self.collisions = {'up': False, 'down': False, 'right': False, 'left': False}
-    
-        self.action = ''
-        self.anim_offset = (0, 0)
-        self.flip = False
-        self.manual_flip = False  # If True, skip auto-flip logic (for enemies with custom flip control)
-        self.set_action ('idle')
 
-        self.last_movement = [0, 0]
-
-    def rect(self):
-        return pygame.Rect(self.pos[0], self.pos[1], self.size[0], self.size[1])
-    
-    def set_action(self, action):
-        if self.action != action:
-            self.action = action
-            self.animation = self.game.assets[self.type + '/' + action].copy()
-        
-    def update(self, tilemap, movement=(0, 0)):
-        self.collisions = {'up': False, 'down': False, 'right': False, 'left': False}
-        
-        frame_movement = (movement[0] * 1.3 + self.velocity[0], movement[1] * 1.3 + self.velocity[1])
-        
-        self.pos[0] += frame_movement[0]
-        entity_rect = self.rect()
-        for rect in tilemap.physics_rects_around(self.pos, self.size):
-            if entity_rect.colliderect(rect):
-                if frame_movement[0] > 0:
-                    entity_rect.right = rect.left
-                    self.collisions['right'] = True
-                if frame_movement[0] < 0:
-                    entity_rect.left = rect.right
-                    self.collisions['left'] = True
-                self.pos[0] = entity_rect.x
-        
-        self.pos[1] += frame_movement[1]
-        entity_rect = self.rect()
-        for rect in tilemap.physics_rects_around(self.pos, self.size):
-            if entity_rect.colliderect(rect):
-                if frame_movement[1] > 0:
-                    entity_rect.bottom = rect.top
-                    self.collisions['down'] = True
-                if frame_movement[1] < 0:
-                    entity_rect.top = rect.bottom
-                    self.collisions['up'] = True
-                self.pos[1] = entity_rect.y
-
-        if not self.manual_flip:
-            if movement[0] > 0:
-                self.flip = False
-            if movement[0] < 0:
-                self.flip = True
-
-        self.last_movement = movement
-        
-        self.velocity[1] = min(5, self.velocity[1] + 0.1)
-        
-        if self.collisions['down'] or self.collisions['up']:
-            self.velocity[1] = 0
-
-        self.animation.update()
+class PhysicsEntity(BasePhysicsEntity):
+    __slots__ = ()
 
     def render(self, surf, offset=(0, 0)):
-        surf.blit(pygame.transform.flip(self.animation.img(), self.flip, False), (self.pos[0] - offset[0] + self.anim_offset[0], self.pos[1] - offset[1] + self.anim_offset[1]))
-        self.animation.update()
\ No newline at end of file
+        super().render(surf, offset=offset)
+        self.animation.update()
@@ -2,10 +2,13 @@ import random
 from scripts.entities.BasicEntity import PhysicsEntity
 
 class EnemyEntity(PhysicsEntity):
+    __slots__ = ('walking', 'sees_player')
+
     def __init__(self, game, pos, size):
         super().__init__(game, "enemy", pos, size)
         self.manual_flip = True  # EnemyEntity controls flipping with patrol behavior
         self.walking = 0 #walking state counter
+        self.sees_player = False #set each frame by the game from a tilemap line of sight test
 
     def update(self, tilemap, movement=(0, 0)):
         if self.walking:
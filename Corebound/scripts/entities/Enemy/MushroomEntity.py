@@ -1,9 +1,11 @@
 import pygame, math, random
 from scripts.entities.Enemy.EnemyEntity import EnemyEntity
-from scripts.particle import Particle
-from scripts.sparks import Spark
+from scripts.particle import spawn_particle
+from engine.spark import spawn_spark
 
 class MushroomEntity(EnemyEntity):
+    __slots__ = ('health', 'detection_range', 'chase_speed', 'jump_strength')
+
     def __init__(self, game, pos, size):
         # Get size from sprite
         sprite_size = game.assets['mushroom/idle'].images[0].get_size()
@@ -13,10 +15,11 @@ class MushroomEntity(EnemyEntity):
         self.health = 2  # Takes 2 hits to kill
         self.detection_range = 100  # Distance to detect player
         self.chase_speed = 0.7  # Speed when chasing
+        self.jump_strength = -3  # Vertical velocity when the path leads up a platform
         self.set_action('idle')
     
     def can_see_player(self):
-        """Check if player is within detection range"""
+        """Check if player is within detection range and not hidden behind tiles"""
         player_center_x = self.game.player.rect().centerx
         my_center_x = self.rect().centerx
         distance_x = player_center_x - my_center_x
@@ -25,14 +28,20 @@ class MushroomEntity(EnemyEntity):
         if abs(distance_x) > self.detection_range:
             return False
         
-        return True
+        return self.sees_player
     
     def update(self, tilemap, movement=(0, 0)):
-        # Check if we can see the player and should chase
-        if self.can_see_player():
+        # Follow the level's flow field towards the player when they are close enough,
+        # even around walls and across platforms; otherwise only chase on sight
+        step = None
+        if abs(self.game.player.rect().centerx - self.rect().centerx) <= self.detection_range * 2:
+            step = self.game.navigation.step_from(self.rect())
+        if step or self.can_see_player():
             player_center_x = self.game.player.rect().centerx
             my_center_x = self.rect().centerx
             distance_x_signed = player_center_x - my_center_x
+            if step and step[0]:
+                distance_x_signed = step[0]  # next tile on the path, not straight at the player
             
             # Chase the player
             if distance_x_signed > 0:
@@ -41,6 +50,8 @@ class MushroomEntity(EnemyEntity):
             else:
                 self.flip = True  # Face left
                 movement = (movement[0] - self.chase_speed, movement[1])
+            if step and step[1] and self.collisions['down']:
+                self.velocity[1] = self.jump_strength  # next link is a jump up to a higher platform
         else:
             # Normal patrol behavior when not chasing
             if self.walking:
@@ -93,12 +104,12 @@ class MushroomEntity(EnemyEntity):
         for i in range(15):
             angle = random.random() * math.pi * 2
             speed = random.random() * 3
-            self.game.sparks.append(Spark(self.rect().center, angle, 1 + random.random()))
-            self.game.particles.append(Particle(
+            spawn_spark(self.game.world, self.rect().center, angle, 1 + random.random())
+            spawn_particle(
                 self.game, "particle", self.rect().center,
                 velocity=[math.cos(angle) * speed * 0.5, math.sin(angle) * speed],
                 frame=random.randint(0, 7)
-            ))
+            )
         
         # Check if dead
         if self.health <= 0:
@@ -107,12 +118,12 @@ class MushroomEntity(EnemyEntity):
             for i in range(20):
                 angle = random.random() * math.pi * 2
                 speed = random.random() * 4
-                self.game.sparks.append(Spark(self.rect().center, angle, 2 + random.random()))
-                self.game.particles.append(Particle(
+                spawn_spark(self.game.world, self.rect().center, angle, 2 + random.random())
+                spawn_particle(
                     self.game, "particle", self.rect().center,
                     velocity=[math.cos(angle) * speed, math.sin(angle) * speed],
                     frame=random.randint(0, 7)
-                ))
+                )
             return True  # Signal to remove this enemy
         
         # Knockback from hit
@@ -1,9 +1,11 @@
 import pygame, math, random
 from scripts.entities.BasicEntity import PhysicsEntity
-from scripts.particle import Particle
+from scripts.particle import spawn_particle
 from scripts.skills.SkillManager import SkillManager
 
 class Player(PhysicsEntity):
+    __slots__ = ('skill_manager', 'air_time', 'jumps', 'wall_slide', 'dashing', 'lives', 'invulnerable')
+
     def __init__(self, game, pos, size):
         super().__init__(game, 'player', pos, size)
         self.skill_manager = SkillManager()
@@ -52,13 +54,13 @@ class Player(PhysicsEntity):
             if abs(self.dashing) == 51:
                 self.velocity[0] *= 0.1 #initial strong deceleration after dash endsmax(0, self.dashing - 1)
             pvelocity = [abs(self.dashing) / self.dashing * random.random() * 3, 0]
-            self.game.particles.append(Particle(self.game, "particle", self.rect().center, velocity=pvelocity, frame=random.randint(0, 7)))
+            spawn_particle(self.game, "particle", self.rect().center, velocity=pvelocity, frame=random.randint(0, 7))
         if abs(self.dashing) in {60, 50}:
             for i in range(20):
                 angle = random.random() * math.pi * 2
                 speed = random.random() * 0.5 + 0.5
                 pvelocity = [math.cos(angle)* speed, math.sin(angle)* speed]
-                self.game.particles.append(Particle(self.game, "particle", self.rect().center, velocity=pvelocity, frame=random.randint(0, 7))) #dash particles
+                spawn_particle(self.game, "particle", self.rect().center, velocity=pvelocity, frame=random.randint(0, 7)) #dash particles
 
         # Decrement invulnerability timer
         if self.invulnerable > 0:
@@ -118,6 +120,6 @@ class Player(PhysicsEntity):
             angle = random.random() * math.pi * 2
             speed = random.random() * 0.8
             pvelocity = [math.cos(angle)* speed, math.sin(angle)* speed]
-            self.game.particles.append(Particle(self.game, "particle", self.rect().center, velocity=pvelocity, frame=random.randint(0, 7)))
+            spawn_particle(self.game, "particle", self.rect().center, velocity=pvelocity, frame=random.randint(0, 7))
         # TODO: handle player death (respawn or game over) when lives == 0
         return self.lives == 0
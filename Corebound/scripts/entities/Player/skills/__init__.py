@@ -1 +0,0 @@
-# Skills package for player abilities
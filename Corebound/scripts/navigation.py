@@ -0,0 +1,139 @@
+import heapq, math
+
+WALK_COST = 1
+JUMP_COST = 3  # jumps are slower and riskier than walking, prefer a walking route of similar length
+DROP_COST = 2
+
+
+class Navigation:
+    """Platform graph of a level plus a shared flow field leading to the player.
+
+    The graph is built once at level load. Nodes are tiles an enemy can stand in (a
+    physics tile below and enough headroom above), linked by walks to the next tile,
+    drops off ledges and short jumps up. Instead of one search per enemy, a single
+    Dijkstra search is run outwards from the player's tile whenever the player moves to
+    another tile; every enemy then just looks up the next step stored for its tile.
+
+    That refresh is a full recompute, not an incremental repair: moving the target
+    changes the cost of every node, so there is little to reuse. It is bounded instead,
+    by max_cost (the search stops spreading that far from the player) and by running at
+    most once per tick, and only on ticks where the player changed node.
+    """
+
+    def __init__(self, tilemap, entity_size, jump_height=2, jump_distance=2, max_drop=10, max_cost=60):
+        self.tilemap = tilemap
+        self.tile_size = tilemap.tile_size
+        self.clearance = math.ceil(entity_size[1] / self.tile_size)  # free tiles needed above a node
+        self.jump_height = jump_height
+        self.jump_distance = jump_distance
+        self.max_drop = max_drop
+        self.max_cost = max_cost  # the field is not spread further than this from the player
+
+        self.links = {}  # node -> [(node, cost), ...]
+        self.reverse_links = {}  # node -> [(node it is reachable from, cost), ...]
+        self.next_step = {}  # node -> next node on the way to the player
+        self.target = None  # player node the field was computed for
+        self.build()
+
+    def is_solid(self, x, y):
+        tile = self.tilemap.tilemap.get(str(x) + ';' + str(y))
+        return tile is not None and tile['type'] in self.tilemap.physics_tiles
+
+    def is_node(self, x, y):
+        if not self.is_solid(x, y + 1):
+            return False
+        for i in range(self.clearance):
+            if self.is_solid(x, y - i):
+                return False
+        return True
+
+    def build(self):
+        self.links = {}
+        self.reverse_links = {}
+        nodes = set()
+        for tile in self.tilemap.tilemap.values():
+            if tile['type'] in self.tilemap.physics_tiles and self.is_node(tile['pos'][0], tile['pos'][1] - 1):
+                nodes.add((tile['pos'][0], tile['pos'][1] - 1))
+
+        for node in nodes:
+            links = []
+            x, y = node
+            for dx in (-1, 1):
+                if (x + dx, y) in nodes:
+                    links.append(((x + dx, y), WALK_COST))
+                elif not self.is_solid(x + dx, y):
+                    # Walk off the ledge and fall down that column to the first place to stand
+                    for fall in range(1, self.max_drop + 1):
+                        if self.is_solid(x + dx, y + fall):
+                            break
+                        if (x + dx, y + fall) in nodes:
+                            links.append(((x + dx, y + fall), DROP_COST + fall * 0.5))
+                            break
+                # Jump up to a higher node, if nothing is in the way above this one
+                for dy in range(1, self.jump_height + 1):
+                    if self.is_solid(x, y - self.clearance - dy + 1):
+                        break
+                    for reach in range(1, self.jump_distance + 1):
+                        if (x + dx * reach, y - dy) in nodes:
+                            links.append(((x + dx * reach, y - dy), JUMP_COST + dy))
+                            break
+            self.links[node] = links
+            self.reverse_links.setdefault(node, [])
+        for node, links in self.links.items():
+            for other, cost in links:
+                self.reverse_links[other].append((node, cost))
+
+        self.next_step = {}
+        self.target = None
+
+    def node_at(self, rect, search_down=4):
+        """Node the entity with this rect stands in, looking a few tiles down while it is in the air."""
+        x = rect.centerx // self.tile_size
+        y = (rect.bottom - 1) // self.tile_size
+        for i in range(search_down + 1):
+            if (x, y + i) in self.links:
+                return (x, y + i)
+        return None
+
+    def update(self, target_rect):
+        """Refresh the flow field when the player has moved to another node.
+
+        Recomputes the whole field from scratch, limited to the nodes within max_cost.
+        """
+        target = self.node_at(target_rect)
+        if target is None or target == self.target:
+            return
+        self.target = target
+
+        # Dijkstra from the player along reversed links: cost[n] = cheapest way from n to the player
+        cost = {target: 0}
+        self.next_step = {}
+        queue = [(0, target)]
+        while queue:
+            node_cost, node = heapq.heappop(queue)
+            if node_cost > cost[node]:
+                continue
+            for other, link_cost in self.reverse_links[node]:
+                new_cost = node_cost + link_cost
+                if new_cost <= self.max_cost and new_cost < cost.get(other, math.inf):
+                    cost[other] = new_cost
+                    self.next_step[other] = node
+                    heapq.heappush(queue, (new_cost, other))
+
+    def step_from(self, rect):
+        """Where an entity should go next to reach the player.
+
+        Returns:
+            (direction, jump) with direction -1/0/1 on the x axis and jump True when the
+            next link is a jump, or None when there is no known path from here.
+        """
+        node = self.node_at(rect, search_down=1)
+        if node is None:
+            return None
+        if node == self.target:
+            return (0, False)
+        next_node = self.next_step.get(node)
+        if next_node is None:
+            return None
+        direction = (next_node[0] > node[0]) - (next_node[0] < node[0])
+        return (direction, next_node[1] < node[1])
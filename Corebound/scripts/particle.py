@@ -1,25 +1,6 @@
-class Particle:
-    def __init__(self, game, p_type, pos, velocity=[0, 0], frame=0):
-        self.game = game
-        self.type = p_type
-        self.pos = list(pos)
-        self.velocity = list(velocity)
-        self.animation = self.game.assets['particle'].copy()
-        self.animation.frame = frame
-    
-    def update(self):
-        kill = False
-        if self.animation.done:
-            kill = True
-        
-        self.pos[0] += self.velocity[0]
-        self.pos[1] += self.velocity[1]
-        
-        self.animation.update()
-        
-        return kill
-    
-    def render(self, surf, offset=(0, 0)):
-        img = self.animation.img()
-        surf.blit(img, (self.pos[0] - offset[0] - img.get_width() // 2, self.pos[1] - offset[1] - img.get_height() // 2))
-    
\ No newline at end of file
+from engine.particle import spawn_particle as spawn_world_particle
+
+
+def spawn_particle(game, p_type, pos, velocity=(0, 0), frame=0):
+    """Add a dust particle to game.world; Corebound has a single particle animation for every p_type."""
+    spawn_world_particle(game.world, game.assets['particle'], pos, velocity, frame)
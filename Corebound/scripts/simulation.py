@@ -0,0 +1,123 @@
+import pygame
+
+from engine.simulation import Simulation as BaseSimulation, world_state
+from engine.ecs import update_motion, update_physics, update_animations, update_lifetimes
+from engine.spark import update_sparks
+from scripts.utils import load_image, load_images, Animation, resources
+import scripts.entities.Player.PlayerEntity as PlayerEntity
+from scripts.entities.Player.PlayerAttack import PlayerAttack
+from scripts.entities.Enemy.MushroomEntity import MushroomEntity
+from scripts.Powerup import spawn_powerup, update_powerups, collect_powerups
+from scripts.tilemap import Tilemap
+from scripts.navigation import Navigation
+
+LEVELS = ("maps/0.json", "maps/1.json")
+POWERUP_SKILLS = {0: 'double_jump', 1: 'wall_slide', 2: 'dash', 3: 'fighting_style', 4: 'bonus_life'}  # same as Game.load_level
+FALL_LIMIT = 10  # tiles below the lowest tile of the map after which the player is lost
+
+
+class Simulation(BaseSimulation):
+    """Game.run without drawing. Corebound levels have no exit and mushrooms are never
+    removed, so a level is completed once every power-up has been collected; falling
+    off the map fails it.
+    """
+
+    def __init__(self, seed=0):
+        super().__init__(seed)
+        self.display = pygame.Surface((320, 240))  # notifications size themselves to it
+        self.assets = {
+            'player': load_image('entities/player.png'),
+            'player/idle': Animation(load_images('entities/player/idle'), img_dur=8),
+            'player/run': Animation(load_images('entities/player/run'), img_dur=6),
+            'player/jump': Animation(load_images('entities/player/jump'), img_dur=10),
+            'player/wall_slide': Animation(load_images('entities/player/wall_slide'), img_dur=6),
+            'particle': Animation(load_images('particles'), img_dur=6, loop=False),
+            'powerup/base': load_image('power-ups/power-up.png'),
+            'powerup/movement': load_image('power-ups/power-up_movement.png'),
+            'powerup/fighting': load_image('power-ups/power-up_fighting_style.png'),
+            'mushroom/idle': Animation(load_images('entities/enemy/mushroom/Idle'), img_dur=8),
+            'mushroom/run': Animation(load_images('entities/enemy/mushroom/Run'), img_dur=6),
+            'mushroom/die': Animation(load_images('entities/enemy/mushroom/Die'), img_dur=6, loop=False),
+        }
+        for skill in POWERUP_SKILLS.values():
+            self.assets['skill/' + skill] = load_image('text/' + skill + '.png')
+        self.tilemap = Tilemap(self, tile_size=16)
+        self.navigation = None
+        self.floor = 0
+
+    def load_level(self, name):
+        self.tilemap.load(name, resources, compiled=True)
+        self.player = PlayerEntity.Player(self, (100, 100), self.assets['player'].get_size())
+        self.player_attack = PlayerAttack(self, self.player)
+        self.enemies = []
+        self.world.clear()
+        for spawner in self.tilemap.extract([('spawners', 0), ('spawners', 1)]):
+            if spawner['variant'] == 1:
+                self.player.pos = spawner['pos']
+                self.player.air_time = 0
+            else:
+                self.enemies.append(MushroomEntity(self, spawner['pos'], (8, 15)))
+        self.navigation = Navigation(self.tilemap, self.assets['mushroom/idle'].images[0].get_size())
+        for pu in self.tilemap.extract([('powerups', v) for v in POWERUP_SKILLS]):
+            spawn_powerup(self, pu['pos'], POWERUP_SKILLS[pu['variant']])
+        bottom = max((tile['pos'][1] for tile in self.tilemap.tilemap.values()), default=0)
+        self.floor = (bottom + 1 + FALL_LIMIT) * self.tilemap.tile_size
+        self.reset()
+
+    def step(self, inputs):
+        if 'jump' in inputs.pressed:
+            self.player.jump()
+        if 'dash' in inputs.pressed:
+            self.player.dash()
+
+        self.navigation.update(self.player.rect())
+        sight = self.tilemap.lines_of_sight([enemy.rect().center for enemy in self.enemies], self.player.rect().center)
+        for enemy, visible in zip(self.enemies, sight):
+            enemy.sees_player = visible
+        for enemy in self.enemies.copy():
+            if enemy.update(self.tilemap, (0, 0)):
+                self.enemies.remove(enemy)
+
+        update_powerups(self.world)
+        update_physics(self.world, self.tilemap)
+        collect_powerups(self.world, self.player)
+        self.player_attack.update(self.enemies)
+        self.player.update(self.tilemap, (inputs.move, 0))
+
+        update_motion(self.world)
+        update_animations(self.world)
+        for archetype, rows in update_lifetimes(self.world) + update_sparks(self.world):
+            self.world.despawn_rows(archetype, rows)
+        self.frame += 1
+
+    def goals(self):
+        goals = []
+        for archetype in self.world.query('position', 'powerup'):
+            columns = archetype.columns
+            goals += [(skill, (x, y)) for x, y, skill in zip(columns['x'], columns['y'], columns['skill_type'])]
+        return goals
+
+    @property
+    def failed(self):
+        return self.player.pos[1] > self.floor
+
+    def state_key(self):
+        player = self.player
+        return (int(player.pos[0]), int(player.pos[1]), round(player.velocity[0]), round(player.velocity[1] * 2),
+                player.jumps, player.wall_slide, (player.dashing + 60) // 10, tuple(sorted(skill for skill, pos in self.goals())))
+
+    def snapshot(self):
+        snapshot = super().snapshot()
+        snapshot["skills"] = self.player.skill_manager.get_unlocked_skills()
+        snapshot["powerups"] = world_state(self.world, 'powerup')
+        snapshot["navigation"] = (self.navigation.target, self.navigation.next_step)  # replaced, not changed, by update()
+        return snapshot
+
+    def restore(self, snapshot):
+        super().restore(snapshot)
+        self.player.skill_manager.reset_skills()
+        for skill in snapshot["skills"]:
+            self.player.skill_manager.unlock_skill(skill)
+        for components in snapshot["powerups"]:
+            self.world.spawn(**components)
+        self.navigation.target, self.navigation.next_step = snapshot["navigation"]
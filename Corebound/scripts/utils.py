@@ -1,36 +1,12 @@
-import os, pygame
+import os
 
-BASE_IMG_PATH = 'Corebound/data/images/'
+from engine.resources import Resources
+from engine.utils import ImageLoader, Animation
 
-def load_image(path):
-    img = pygame.image.load(BASE_IMG_PATH + path).convert()
-    img.set_colorkey((0, 0, 0))
-    return img
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data')
+BASE_IMG_PATH = 'images/'
 
-def load_images(path):
-    images = []
-    for img_name in sorted(os.listdir(BASE_IMG_PATH + path)):
-        images.append(load_image(path + '/' + img_name))
-    return images
-
-class Animation:
-    def __init__(self, images, img_dur=5, loop=True):
-        self.images = images
-        self.loop = loop
-        self.img_duration = img_dur
-        self.done = False
-        self.frame = 0
-    
-    def copy(self):
-        return Animation(self.images, self.img_duration, self.loop)
-    
-    def update(self):
-        if self.loop:
-            self.frame = (self.frame + 1) % (self.img_duration * len(self.images))
-        else:
-            self.frame = min(self.frame + 1, self.img_duration * len(self.images) - 1)
-            if self.frame >= self.img_duration * len(self.images) - 1:
-                self.done = True
-    
-    def img(self):
-        return self.images[int(self.frame / self.img_duration)]
\ No newline at end of file
+resources = Resources(DATA_DIR)  # loose files in Corebound/data, else the packed Corebound/data.zip
+_loader = ImageLoader(resources, BASE_IMG_PATH)
+load_image = _loader.load_image
+load_images = _loader.load_images
@@ -2,29 +2,40 @@ import sys
 import pygame
 import random, math, os
 
-from scripts.utils import load_image, load_images, Animation
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # repo root, for the shared engine package
+
+from scripts.utils import load_image, load_images, Animation, resources
 from scripts.entities import PhysicsEntity, PlayerEntity, EnemyEntity
 from scripts.tilemap import Tilemap
 from scripts.clouds import Clouds
-from scripts.particle import Particle
-from scripts.spark import Spark
+from scripts.particle import spawn_particle, sway_leaves
+from engine.spark import spawn_spark, update_sparks, render_sparks
 from scripts.UI import UI
 from scripts.menu import Menu
-from scripts.leaderboard import Leaderboard
+from scripts.leaderboard import open_leaderboard
+from engine.presenter import create_presenter
+from scripts.projectiles import ProjectileSystem
+from engine.ecs import World, update_motion, update_animations, update_lifetimes, render_animations
+from engine.input import InputMap, NO_INPUT
+from engine.frame_pacer import FramePacer
+from scripts.controls import GAME_BINDINGS
 
 
 class Game:
-    def __init__(self):
+    def __init__(self, hardware=True):
         pygame.init()
 
         pygame.display.set_caption("Ninja game")
-        self.screen = pygame.display.set_mode((640, 480), pygame.RESIZABLE) #window size, allow resizing
         self.pixel_scale = 2  #lower to 1 to make pixels smaller; raise to 3+ for chunkier pixels
         self.display = pygame.Surface((320, 240))  #internal pixel surface
+        self.presenter = create_presenter((640, 480), self.display.get_size(), pygame.RESIZABLE, hardware=hardware) #window size, allow resizing; GPU scaling when available unless started with --software
 
-        self.clock = pygame.time.Clock() #frame rate controller -> limits fps to 60
+        self.pacer = FramePacer(60) #frame rate controller -> limits fps to 60; F4 switches to the low latency loop (input read right before the update, frames timed with a busy wait)
+        self.show_profiler = False #frame time and input latency overlay, toggled with F2
+        self.profiler_font = pygame.font.Font(None, 12)
 
-        self.movement = [False, False] #left, right movement states
+        self.controls = InputMap(GAME_BINDINGS) #key events -> named actions
+        self.inputs = NO_INPUT #actions held and pressed, one snapshot per frame
 
         self.assets = {
             "decor": load_images("tiles/decor"),
@@ -48,15 +59,15 @@ class Game:
         }
 
         # Menu and Leaderboard (initialize first for sfx_enabled check)
-        self.leaderboard = Leaderboard()
+        self.leaderboard = open_leaderboard("json") #"sqlite" keeps every run, for ranks and history on arcade cabinets
         self.menu = Menu()
         
         self.sfx = {
-            "jump": pygame.mixer.Sound("Ninja_game/data/sfx/jump.wav"),
-            "dash": pygame.mixer.Sound("Ninja_game/data/sfx/dash.wav"),
-            "hit": pygame.mixer.Sound("Ninja_game/data/sfx/hit.wav"),
-            "shoot": pygame.mixer.Sound("Ninja_game/data/sfx/shoot.wav"),
-            "ambience": pygame.mixer.Sound("Ninja_game/data/sfx/ambience.wav"),
+            "jump": pygame.mixer.Sound(resources.open("sfx/jump.wav")),
+            "dash": pygame.mixer.Sound(resources.open("sfx/dash.wav")),
+            "hit": pygame.mixer.Sound(resources.open("sfx/hit.wav")),
+            "shoot": pygame.mixer.Sound(resources.open("sfx/shoot.wav")),
+            "ambience": pygame.mixer.Sound(resources.open("sfx/ambience.wav")),
         }
 
         if self.menu.sfx_enabled:
@@ -136,9 +147,38 @@ class Game:
         self.total_game_time = pygame.time.get_ticks()
         self.load_level(self.level)
     
+    def handle_input(self):
+        """Read this frame's events into self.inputs and act on the presses."""
+        for event in pygame.event.get():
+            if event.type in (pygame.QUIT, pygame.WINDOWCLOSE):
+                self.quit_game()
+            self.controls.handle(event)
+        self.inputs = self.controls.snapshot()
+        self.pacer.polled(self.inputs)
+        if "jump" in self.inputs.pressed:
+            if self.player.jump():
+                self.play_sfx("jump")
+        if "dash" in self.inputs.pressed:
+            self.player.dash()
+        if "restart" in self.inputs.pressed:
+            # Restart the current run
+            self.level = 0
+            self.attempts = 0
+            self.level_deaths = 0
+            self.total_game_time = pygame.time.get_ticks()
+            self.load_level(self.level)
+        if "profiler" in self.inputs.pressed:
+            self.show_profiler = not self.show_profiler
+        if "low_latency" in self.inputs.pressed:
+            self.pacer.toggle()
+        if "pause" in self.inputs.pressed:
+            self.pause_game()
+            self.controls.clear() #key releases went to the pause menu
+
     def pause_game(self):
         self.game_state = "paused"
         self.menu.state = "pause"
+        self.menu.invalidate()  # gameplay drew over the last menu frame
     
     def resume_game(self):
         self.game_state = "playing"
@@ -161,6 +201,7 @@ class Game:
         self.refresh_all_leaderboards()
     
     def quit_game(self):
+        self.leaderboard.close() #wait for queued score writes
         pygame.quit()
         sys.exit()
     
@@ -170,7 +211,7 @@ class Game:
             self.level_deaths = 0
             self.current_level_id = map_id
 
-        self.tilemap.load("Ninja_game/data/maps/" + str(map_id) + ".json") #for now only one map
+        self.tilemap.load("maps/" + str(map_id) + ".json", resources, compiled=True) #baked map from engine.compile_map when it is up to date
 
         self.leaf_spawners = []
         for tree in self.tilemap.extract ([("large_decor", 2)], keep=True): #extract large decor tiles to offgrid list for proper rendering
@@ -184,16 +225,15 @@ class Game:
             else:
                 self.enemies.append(EnemyEntity(self, spawner['pos'], (8, 15)))
 
-        self.projectiles = [] #list of active projectiles
-        self.particles = [] #list of active particles
-        self.sparks = [] #list of active spark particles
+        self.projectiles = ProjectileSystem(self.assets["projectile"]) #active enemy projectiles
+        self.world = World() #particles and sparks, stored by component instead of one object each
 
         self.scroll = [0, 0] #scroll offset for camera movement = theres no cake/camera (everythng else moves around player)
         self.dead = 0
         self.transition = -30 #screen transition effect timer
 
     def run(self):
-        pygame.mixer.music.load("Ninja_game/data/music.wav")
+        pygame.mixer.music.load(resources.open("music.wav"), "music.wav")
         pygame.mixer.music.set_volume(0.5)
         pygame.mixer.music.play(-1)  #loop indefinitely
         
@@ -204,63 +244,36 @@ class Game:
             self.sfx["ambience"].play(-1)  # loop indefinitely
 
         while True:
-            self.display.blit(self.assets["background"], (0, 0))
-            
-            # Handle menu state
-            if self.game_state == "menu":
-                mouse_pos = pygame.mouse.get_pos()
-                self.menu.update(mouse_pos)
-                self.menu.render(self.display, self.display.get_width(), self.display.get_height())
-                
-                for event in pygame.event.get():
-                    if event.type == pygame.QUIT:
-                        pygame.quit()
-                        sys.exit()
-                    if event.type == pygame.MOUSEBUTTONDOWN:
-                        self.menu.handle_click(pygame.mouse.get_pos())
-                    if event.type == pygame.KEYDOWN:
-                        self.menu.handle_key_press(event.key)
-                        if event.key == pygame.K_ESCAPE:
-                            pygame.quit()
-                            sys.exit()
-            
-            # Handle end screen state
-            elif self.game_state == "end":
-                mouse_pos = pygame.mouse.get_pos()
-                self.menu.update(mouse_pos)
-                self.menu.render(self.display, self.display.get_width(), self.display.get_height())
-                
-                for event in pygame.event.get():
-                    if event.type == pygame.QUIT:
-                        pygame.quit()
-                        sys.exit()
-                    if event.type == pygame.MOUSEBUTTONDOWN:
-                        self.menu.handle_click(pygame.mouse.get_pos())
-                    if event.type == pygame.KEYDOWN:
-                        self.menu.handle_key_press(event.key)
-                        if event.key == pygame.K_ESCAPE:
-                            pygame.quit()
-                            sys.exit()
-            
-            # Handle paused state
-            elif self.game_state == "paused":
-                mouse_pos = pygame.mouse.get_pos()
-                self.menu.update(mouse_pos)
-                self.menu.render(self.display, self.display.get_width(), self.display.get_height())
+            dirty_rects = None  # set by the menu states; None means the whole frame is presented
+
+            # Handle menu, end screen and paused states
+            if self.game_state in ("menu", "end", "paused"):
+                state = self.game_state
+                self.menu.update(self.presenter.to_display(pygame.mouse.get_pos(), self.display.get_size()))
                 
                 for event in pygame.event.get():
-                    if event.type == pygame.QUIT:
-                        pygame.quit()
-                        sys.exit()
+                    if event.type in (pygame.QUIT, pygame.WINDOWCLOSE):
+                        self.quit_game()
+                    if event.type in (pygame.VIDEORESIZE, pygame.VIDEOEXPOSE):
+                        self.menu.invalidate()  # window contents were lost
                     if event.type == pygame.MOUSEBUTTONDOWN:
-                        self.menu.handle_click(pygame.mouse.get_pos())
+                        self.menu.handle_click(self.presenter.to_display(pygame.mouse.get_pos(), self.display.get_size()))
                     if event.type == pygame.KEYDOWN:
                         self.menu.handle_key_press(event.key)
                         if event.key == pygame.K_ESCAPE:
-                            self.resume_game()
+                            if state == "paused":
+                                self.resume_game()
+                            else:
+                                self.quit_game()
+
+                dirty_rects = self.menu.render(self.display, self.display.get_width(), self.display.get_height())
             
             # Game playing state
             else:
+                low_latency = self.pacer.low_latency #F4 switches from the next frame
+                if low_latency:
+                    self.handle_input() #read right before the update, shown this frame
+                self.display.blit(self.assets["background"], (0, 0))
                 self.screenshake = max(0, self.screenshake - 1)
 
                 if not len(self.enemies):
@@ -281,7 +294,7 @@ class Game:
                 if self.dead:
                     self.dead += 1
                     if self.dead >= 10:
-                        self.level = min(self.level, len(os.listdir("Ninja_game/data/maps")) - 1)
+                        self.level = min(self.level, len(resources.listdir("maps")) - 1)
                         self.transition = min(30, self.transition + 1)
                         self.screenshake = 32
                     if self.dead > 40:
@@ -311,13 +324,16 @@ class Game:
                 for rect in self.leaf_spawners:
                     if random.random() * 49999 < rect.width * rect.height:
                         pos = (rect.x + random.random() * rect.width, rect.y + random.random() * rect.height)
-                        self.particles.append(Particle(self, "leaf", pos, velocity=[-0.1,0.3], frame=random.randint(0, 20)))
+                        spawn_particle(self, "leaf", pos, velocity=[-0.1,0.3], frame=random.randint(0, 20))
 
                 self.clouds.update()
                 self.clouds.render(self.display, offset=render_scroll)
 
                 self.tilemap.render(self.display, offset=render_scroll)
 
+                sight = self.tilemap.lines_of_sight([enemy.rect().center for enemy in self.enemies], self.player.rect().center)
+                for enemy, visible in zip(self.enemies, sight):
+                    enemy.sees_player = visible
                 for enemy in self.enemies.copy():
                     kill = enemy.update(self.tilemap, (0, 0))
                     enemy.render(self.display, offset=render_scroll)
@@ -325,74 +341,35 @@ class Game:
                         self.enemies.remove(enemy)
 
                 if not self.dead:
-                    self.player.update(self.tilemap, (self.movement[1] - self.movement[0], 0))
+                    self.player.update(self.tilemap, (self.inputs.move, 0))
                     self.player.render(self.display, offset=render_scroll)
 
-                for projectile in self.projectiles.copy():
-                    projectile[0][0] += projectile[1]
-                    projectile[2] += 1
-                    img = self.assets["projectile"]
-                    self.display.blit(img, (projectile[0][0] - img.get_width() / 2 - render_scroll[0], projectile[0][1] - img.get_height()/2 - render_scroll[1]))
-                    if self.tilemap.solid_check(projectile[0]):
-                        self.projectiles.remove(projectile)
-                        for i in range(4):
-                            self.sparks.append(Spark(projectile[0], random.random() - 0.5 + (math.pi if projectile[1] > 0 else 0), 2 + random.random()))
-                    elif projectile[2] > 360:
-                        self.projectiles.remove(projectile)
-                    elif abs(self.player.dashing) < 50:
-                        if self.player.rect().collidepoint(projectile[0]):
-                            self.projectiles.remove(projectile)
-                            self.dead += 1
-                            self.play_sfx("hit")
-                            self.screenshake = max(16, self.screenshake)
-                            for i in range(30):
-                                angle = random.random() * math.pi * 2
-                                speed = random.random() * 5
-                                self.sparks.append(Spark(self.player.rect().center, angle, 2 + random.random()))
-                                self.particles.append(Particle(self, "particle", self.player.rect().center, velocity=[math.cos(angle + math.pi) + speed * 0.5,  math.sin(angle + math.pi) * speed], frame=random.randint(0, 7)))
-
-                for spark in self.sparks.copy():
-                    kill = spark.update()
-                    spark.render(self.display, offset=render_scroll)
-                    if kill:
-                        self.sparks.remove(spark)
-
-                for particle in self.particles.copy():
-                    kill = particle.update()
-                    particle.render(self.display, offset=render_scroll)
-                    if particle.type == "leaf":
-                        particle.pos[0] += math.sin(particle.animation.frame * 0.035) * 0.3
-                    if kill:
-                        self.particles.remove(particle)
-
-                for event in pygame.event.get():
-                    if event.type == pygame.QUIT:
-                        pygame.quit()
-                        sys.exit()
-                    if event.type == pygame.KEYDOWN:
-                        if event.key == pygame.K_LEFT or event.key == pygame.K_a:
-                            self.movement[0] = True
-                        if event.key == pygame.K_RIGHT or event.key == pygame.K_d:
-                            self.movement[1] = True
-                        if event.key == pygame.K_UP or event.key == pygame.K_w:
-                            if self.player.jump():
-                                self.play_sfx("jump")
-                        if event.key == pygame.K_LSHIFT or event.key == pygame.K_RSHIFT:
-                            self.player.dash()
-                        if event.key == pygame.K_r:
-                            # Restart the current run
-                            self.level = 0
-                            self.attempts = 0
-                            self.level_deaths = 0
-                            self.total_game_time = pygame.time.get_ticks()
-                            self.load_level(self.level)
-                        if event.key == pygame.K_ESCAPE:
-                            self.pause_game()
-                    if event.type == pygame.KEYUP:
-                        if event.key == pygame.K_LEFT or event.key == pygame.K_a:
-                            self.movement[0] = False
-                        if event.key == pygame.K_RIGHT or event.key == pygame.K_d:
-                            self.movement[1] = False
+                impacts, hits = self.projectiles.update(self.tilemap, self.player.rect() if abs(self.player.dashing) < 50 else None)
+                self.projectiles.render(self.display, offset=render_scroll)
+                for pos, direction in impacts:
+                    for i in range(4):
+                        spawn_spark(self.world, pos, random.random() - 0.5 + (math.pi if direction > 0 else 0), 2 + random.random())
+                if hits:
+                    self.dead += 1
+                    self.play_sfx("hit")
+                    self.screenshake = max(16, self.screenshake)
+                    for i in range(30):
+                        angle = random.random() * math.pi * 2
+                        speed = random.random() * 5
+                        spawn_spark(self.world, self.player.rect().center, angle, 2 + random.random())
+                        spawn_particle(self, "particle", self.player.rect().center, velocity=[math.cos(angle + math.pi) + speed * 0.5,  math.sin(angle + math.pi) * speed], frame=random.randint(0, 7))
+
+                update_motion(self.world)
+                update_animations(self.world)
+                sway_leaves(self.world)
+                expired = update_sparks(self.world) + update_lifetimes(self.world)
+                render_sparks(self.world, self.display, offset=render_scroll)
+                render_animations(self.world, self.display, offset=render_scroll)
+                for archetype, rows in expired:
+                    self.world.despawn_rows(archetype, rows)
+
+                if not low_latency:
+                    self.handle_input()
 
                 if self.transition:
                     transition_surf = pygame.Surface(self.display.get_size())
@@ -402,10 +379,15 @@ class Game:
 
                 elapsed_time = pygame.time.get_ticks() - self.total_game_time
                 self.ui.render(self.display, self.attempts + 1, elapsed_time, self.level + 1)
+                if self.show_profiler:
+                    self.pacer.render(self.display, self.profiler_font, (4, 20))
             
-            screenshake_offset = (random.random() * self.screenshake - self.screenshake / 2, random.random() * self.screenshake - self.screenshake / 2)
-            self.screen.blit(pygame.transform.scale(self.display, self.screen.get_size()), screenshake_offset)
-            pygame.display.update()
-            self.clock.tick(60)
-
-Game().run()
\ No newline at end of file
+            if dirty_rects is None:
+                screenshake_offset = (random.random() * self.screenshake - self.screenshake / 2, random.random() * self.screenshake - self.screenshake / 2)
+                self.presenter.present(self.display, screenshake_offset)
+            elif dirty_rects:
+                self.presenter.present_rects(self.display, dirty_rects)
+            self.pacer.presented()
+            self.pacer.tick()
+
+Game(hardware="--software" not in sys.argv[1:]).run()
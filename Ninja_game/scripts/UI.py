@@ -1,10 +1,13 @@
 import pygame
 import os
 
+from engine.text_cache import TextCache
+
 class UI:
     def __init__(self):
         # Use system courier font (pixel_font.ttf is corrupted)
         self.font = pygame.font.SysFont("courier", 10, bold=True)
+        self.text_cache = TextCache(max_entries=32)
         
     def render(self, display, attempts, elapsed_time, level):
         width = display.get_width()
@@ -21,28 +24,18 @@ class UI:
         outline_color = (0, 0, 0)
         outline_width = 1
         
-        def render_outlined_text(text_surface, pos):
-            """Draw text with black outline"""
-            # Draw outline by rendering text at offset positions
-            for dx in range(-outline_width, outline_width + 1):
-                for dy in range(-outline_width, outline_width + 1):
-                    if dx != 0 or dy != 0:
-                        outline_text = self.font.render(text_surface, True, outline_color)
-                        display.blit(outline_text, (pos[0] + dx, pos[1] + dy))
-            # Draw main text on top
-            main_text = self.font.render(text_surface, True, text_color)
-            display.blit(main_text, pos)
+        def render_outlined_text(text, pos):
+            """Draw text with black outline (composited once, then cached)"""
+            surf = self.text_cache.render(self.font, text, text_color, outline_color, outline_width)
+            display.blit(surf, (pos[0] - outline_width, pos[1] - outline_width))
         
         # Top left: Attempts
         render_outlined_text(f"Attempts: {attempts}", (5, 5))
         
-        # Top middle: Timer
-        timer_text = self.font.render(time_str, True, text_color)
-        timer_x = (width - timer_text.get_width()) // 2
-        render_outlined_text(time_str, (timer_x, 5))
+        # Top middle: Timer - changes every frame, so it is assembled from cached digits
+        timer_x = (width - self.font.size(time_str)[0]) // 2
+        self.text_cache.render_glyphs(display, self.font, time_str, (timer_x, 5), text_color, outline_color, outline_width)
         
         # Top right: Level
-        level_text = self.font.render(f"Level: {level}", True, text_color)
-        level_x = width - level_text.get_width() - 5
+        level_x = width - self.font.size(f"Level: {level}")[0] - 5
         render_outlined_text(f"Level: {level}", (level_x, 5))
-
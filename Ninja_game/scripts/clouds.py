@@ -1,32 +1,53 @@
 import random
+import pygame
+
+from engine.parallax import ParallaxBackground
 
 class Cloud:
+    __slots__ = ('pos', 'img', 'speed', 'depth')
+
     def __init__(self, pos, img, speed, depth):
         self.pos = list(pos)
         self.img = img
         self.speed = speed
         self.depth = depth
 
-    def update(self):
-        self.pos[0] += self.speed
-        
-    def render(self, surf, offset=(0, 0)):
-        render_pos = (self.pos[0] - offset[0] * self.depth, self.pos[1] - offset[1] * self.depth) # Parallax effect based on depth
-        surf.blit(self.img, (render_pos[0] % (surf.get_width() + self.img.get_width()) - self.img.get_width(), render_pos[1] % (surf.get_height() + self.img.get_height()) - self.img.get_height())) # Wrap around screen edges - no teleport
-
 class Clouds:
-    def __init__(self, cloud_images, count=16):
+    def __init__(self, cloud_images, count=16, bands=2):
         self.clouds = []
 
         for i in range(count):
             self.clouds.append(Cloud((random.random() * 99999, random.random() * 99999), random.choice(cloud_images), random.random() * 0.05 + 0.05, random.random() * 0.06 + 0.2))
 
         self.clouds.sort(key=lambda x: x.depth) # Sort clouds by depth for correct rendering order by depth
+        self.bands = bands # clouds are baked into this many layers; each layer is one blit per frame
+        self.background = None
+
+    def build(self, view_size):
+        # Split the depth-sorted clouds into bands; every band moves with its average depth and speed
+        self.background = ParallaxBackground(view_size)
+        band_size = max(1, -(-len(self.clouds) // self.bands))
+        for i in range(0, len(self.clouds), band_size):
+            band = self.clouds[i:i + band_size]
+            # Wrap period matches the old per-cloud wrap: clouds leave the screen fully before reappearing
+            period = (view_size[0] + max(cloud.img.get_width() for cloud in band), view_size[1] + max(cloud.img.get_height() for cloud in band))
+            tile = pygame.Surface(period)
+            tile.set_colorkey((0, 0, 0))
+            for cloud in band:
+                x, y = cloud.pos[0] % period[0], cloud.pos[1] % period[1]
+                for dx in (0, -period[0]):
+                    for dy in (0, -period[1]):
+                        tile.blit(cloud.img, (x + dx, y + dy))
+            depth = sum(cloud.depth for cloud in band) / len(band)
+            speed = sum(cloud.speed for cloud in band) / len(band)
+            self.background.add_layer(tile, factor=(depth, depth), drift=(speed, 0), wrap_y=True)
+        self.background.build()
 
     def update(self):
-        for cloud in self.clouds:
-            cloud.update()
+        if self.background:
+            self.background.update()
 
     def render(self, surf, offset=(0, 0)):
-        for cloud in self.clouds:
-            cloud.render(surf, offset=offset)
\ No newline at end of file
+        if self.background is None or self.background.view_size != surf.get_size():
+            self.build(surf.get_size())
+        self.background.render(surf, offset)
@@ -1,84 +1,24 @@
 import pygame, math, random
-from scripts.particle import Particle
-from scripts.spark import Spark
+from engine.entities import PhysicsEntity as BasePhysicsEntity
+from scripts.particle import spawn_particle
+from engine.spark import spawn_spark
 
 
-class PhysicsEntity:
-    def __init__(self, game, e_type, pos, size):
-        self.game = game
-        self.type = e_type
-        self.pos = list(pos)
-        self.size = size
-        self.velocity = [0, 0]
-        self.collisions = {'up': False, 'down': False, 'right': False, 'left': False} #collision states - remember if we are colliding in any direction
-    
-        self.action = ''
-        self.anim_offset = (-3 , -3) #offset to center the animation properly / hitbox vs sprite size
-        self.flip = False #for horizontal flipping of sprite based on movement direction
-        self.set_action ('idle')
-
-        self.last_movement = [0, 0] #store last movement for wall jump direction detection
-
-    def rect(self): #return the rectangle representing the entity's position and size
-        return pygame.Rect(self.pos[0], self.pos[1], self.size[0], self.size[1])
-    
-    def set_action(self, action): #change animation based on action
-        if self.action != action:
-            self.action = action
-            self.animation = self.game.assets[self.type + '/' + action].copy()
-        
-    def update(self, tilemap, movement=(0, 0)): #movement is a tuple (horizontal_movement, vertical_movement)
-        self.collisions = {'up': False, 'down': False, 'right': False, 'left': False}
-        
-        frame_movement = (movement[0] * 1.3 + self.velocity[0], movement[1] * 1.3 + self.velocity[1]) # Apply velocity to movement
-        
-        self.pos[0] += frame_movement[0]
-        entity_rect = self.rect()
-        for rect in tilemap.physics_rects_around(self.pos):
-            if entity_rect.colliderect(rect):
-                if frame_movement[0] > 0:
-                    entity_rect.right = rect.left # Handle right collision
-                    self.collisions['right'] = True
-                if frame_movement[0] < 0:
-                    entity_rect.left = rect.right # Handle left collision
-                    self.collisions['left'] = True
-                self.pos[0] = entity_rect.x
-        
-        self.pos[1] += frame_movement[1]        #important to separate horizontal and vertical collision checks
-        entity_rect = self.rect()
-        for rect in tilemap.physics_rects_around(self.pos):
-            if entity_rect.colliderect(rect):
-                if frame_movement[1] > 0:
-                    entity_rect.bottom = rect.top # Handle down collision
-                    self.collisions['down'] = True
-                if frame_movement[1] < 0:
-                    entity_rect.top = rect.bottom # Handle up collision
-                    self.collisions['up'] = True
-                self.pos[1] = entity_rect.y
-
-        if movement[0] > 0:
-            self.flip = False
-        if movement[0] < 0:
-            self.flip = True
-
-        self.last_movement = movement #store last movement for wall jump direction detection
-        
-        self.velocity[1] = min(5, self.velocity[1] + 0.1) # Gravity, limit falling speed (it chooses the smaller value between 5 and current velocity + 0.1)
-        
-        if self.collisions['down'] or self.collisions['up']: # Stop vertical velocity on collision
-            self.velocity[1] = 0
+class PhysicsEntity(BasePhysicsEntity):
+    __slots__ = ()
 
-        self.animation.update() #update animation frame
+    def __init__(self, game, e_type, pos, size):
+        super().__init__(game, e_type, pos, size, anim_offset=(-3, -3)) #ninja sprites are wider than their hitbox
 
-    def render(self, surf, offset=(0, 0)):
-        surf.blit(pygame.transform.flip(self.animation.img(), self.flip, False), (self.pos[0] - offset[0] + self.anim_offset[0], self.pos[1] - offset[1] + self.anim_offset[1])) #draw current animation frame with offset and flipping (x and y)
-        # Update animation after rendering to avoid frame skip on first render
 
 class EnemyEntity(PhysicsEntity):
+    __slots__ = ('walking', 'sees_player')
+
     def __init__(self, game, pos, size):
         super().__init__(game, "enemy", pos, size)
 
         self.walking = 0 #walking state counter
+        self.sees_player = False #set each frame by the game from a tilemap line of sight test
 
     def update(self, tilemap, movement=(0, 0)):
         if self.walking:
@@ -92,17 +32,19 @@ class EnemyEntity(PhysicsEntity):
             self.walking = max(0, self.walking - 1)
             if not self.walking:
                 dis = (self.game.player.pos[0] - self.pos[0], self.game.player.pos[1] - self.pos[1])
-                if (abs(dis[1] < 16)):
+                if abs(dis[1]) < 16 and self.sees_player: #player roughly level and not behind a wall
                     if (self.flip and dis[0] < 0):
-                        self.game.projectiles.append([[self.rect().centerx - 7, self.rect().centery], -1.5, 0]) #spawn projectile to the left
+                        shot_pos = (self.rect().centerx - 7, self.rect().centery)
+                        self.game.projectiles.spawn(shot_pos, (-1.5, 0)) #spawn projectile to the left
                         self.game.play_sfx("shoot")
                         for i in range(4):
-                            self.game.sparks.append(Spark(self.game.projectiles[-1][0], random.random() - 0.5 + math.pi, 2 + random.random()))
+                            spawn_spark(self.game.world, shot_pos, random.random() - 0.5 + math.pi, 2 + random.random())
                     elif (not self.flip and dis[0] > 0):
-                        self.game.projectiles.append([[self.rect().centerx + 7, self.rect().centery], 1.5, 0]) #spawn projectile to the right
+                        shot_pos = (self.rect().centerx + 7, self.rect().centery)
+                        self.game.projectiles.spawn(shot_pos, (1.5, 0)) #spawn projectile to the right
                         self.game.play_sfx("shoot")
                         for i in range(4):
-                            self.game.sparks.append(Spark(self.game.projectiles[-1][0], random.random() - 0.5, 2 + random.random()))
+                            spawn_spark(self.game.world, shot_pos, random.random() - 0.5, 2 + random.random())
         elif random.random() < 0.01:
             self.walking = random.randint(30, 120)
 
@@ -120,11 +62,11 @@ class EnemyEntity(PhysicsEntity):
                 for i in range(30):
                     angle = random.random() * math.pi * 2
                     speed = random.random() * 5
-                    self.game.sparks.append(Spark(self.rect().center, angle, 2 + random.random()))
-                    self.game.particles.append(Particle(self.game, "particle", self.rect().center, velocity=[math.cos(angle + math.pi) + speed * 0.5,  math.sin(angle + math.pi) * speed], frame=random.randint(0, 7)))
+                    spawn_spark(self.game.world, self.rect().center, angle, 2 + random.random())
+                    spawn_particle(self.game, "particle", self.rect().center, velocity=[math.cos(angle + math.pi) + speed * 0.5,  math.sin(angle + math.pi) * speed], frame=random.randint(0, 7))
                    
-                self.game.sparks.append(Spark(self.rect().center, 0, 5 + random.random()))
-                self.game.sparks.append(Spark(self.rect().center, math.pi, 5 + random.random()))
+                spawn_spark(self.game.world, self.rect().center, 0, 5 + random.random())
+                spawn_spark(self.game.world, self.rect().center, math.pi, 5 + random.random())
                 return True #enemy killed
 
     def render(self, surf, offset=(0, 0)):
@@ -137,6 +79,8 @@ class EnemyEntity(PhysicsEntity):
 
 
 class PlayerEntity(PhysicsEntity):
+    __slots__ = ('air_time', 'jumps', 'wall_slide', 'dashing')
+
     def __init__(self, game, pos, size):
         super().__init__(game, "player", pos, size)
         self.air_time = 0 #time spent in air counter
@@ -188,13 +132,13 @@ class PlayerEntity(PhysicsEntity):
             if abs(self.dashing) == 51:
                 self.velocity[0] *= 0.1 #initial strong deceleration after dash endsmax(0, self.dashing - 1)
             pvelocity = [abs(self.dashing) / self.dashing * random.random() * 3, 0]
-            self.game.particles.append(Particle(self.game, "particle", self.rect().center, velocity=pvelocity, frame=random.randint(0, 7)))
+            spawn_particle(self.game, "particle", self.rect().center, velocity=pvelocity, frame=random.randint(0, 7))
         if abs(self.dashing) in {60, 50}:
             for i in range(20):
                 angle = random.random() * math.pi * 2
                 speed = random.random() * 0.5 + 0.5
                 pvelocity = [math.cos(angle)* speed, math.sin(angle)* speed]
-                self.game.particles.append(Particle(self.game, "particle", self.rect().center, velocity=pvelocity, frame=random.randint(0, 7))) #dash particles
+                spawn_particle(self.game, "particle", self.rect().center, velocity=pvelocity, frame=random.randint(0, 7)) #dash particles
 
         if self.velocity[0] > 0:
             self.velocity[0] = max(0, self.velocity[0] - 0.1, 0) #friction when moving right
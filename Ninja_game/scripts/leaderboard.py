@@ -1,11 +1,80 @@
+import atexit
 import json
 import os
+import threading
 from datetime import datetime
 
+from scripts.utils import resources
+
+
+class LeaderboardWriter:
+    """Background thread that writes leaderboard files, so finishing a run never waits on the disk.
+
+    Only the newest data per file is kept while a write is pending, so a burst of saves
+    becomes one write. Each file is written to a temporary file that then replaces the
+    old one, so a crash mid-write leaves the previous scores intact.
+    """
+
+    def __init__(self):
+        self.pending = {} #path -> entries to write
+        self.writing = False
+        self.closed = False
+        self.condition = threading.Condition()
+        self.thread = threading.Thread(target=self._run, name="leaderboard-writer", daemon=True)
+        self.thread.start()
+        atexit.register(self.close) #flush queued scores even if the game exits without close()
+
+    def submit(self, path, entries):
+        with self.condition:
+            self.pending[path] = list(entries) #snapshot, the game keeps changing its own list
+            self.condition.notify_all()
+
+    def flush(self):
+        """Block until everything submitted so far is on disk."""
+        with self.condition:
+            while (self.pending or self.writing) and self.thread.is_alive():
+                self.condition.wait()
+
+    def close(self):
+        self.flush()
+        with self.condition:
+            self.closed = True
+            self.condition.notify_all()
+
+    def _run(self):
+        while True:
+            with self.condition:
+                while not self.pending and not self.closed:
+                    self.condition.wait()
+                if not self.pending:
+                    return
+                batch, self.pending = self.pending, {}
+                self.writing = True
+            for path, entries in batch.items():
+                try:
+                    write_atomic(path, entries)
+                except OSError as e:
+                    print(f"Could not save leaderboard {path}: {e}")
+            with self.condition:
+                self.writing = False
+                self.condition.notify_all()
+
+
+def write_atomic(path, entries):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temp_path = path + ".tmp"
+    with open(temp_path, 'w') as f:
+        json.dump(entries, f, indent=2)
+        f.flush()
+        os.fsync(f.fileno()) #data is on disk before the rename makes it the live file
+    os.replace(temp_path, path)
+
+
 class Leaderboard:
-    def __init__(self, data_dir="Ninja_game/data/top_times"):
-        self.data_dir = data_dir
+    def __init__(self, data_dir=None):
+        self.data_dir = data_dir or resources.path("top_times") #next to the game, whatever the working directory
         self.max_entries = 5
+        self.writer = LeaderboardWriter()
         self.leaderboards = {
             "baby_mode": self.load_leaderboard("baby_mode"),
             "normal": self.load_leaderboard("normal"),
@@ -13,9 +82,7 @@ class Leaderboard:
         }
     
     def _get_leaderboard_path(self, dif):
-        # Handle special case for baby_mode file naming
-        filename = "leaderboard_baby.json" if dif == "baby_mode" else f"leaderboard_{dif}.json"
-        return os.path.join(self.data_dir, filename)
+        return os.path.join(self.data_dir, leaderboard_filename(dif))
     
     def load_leaderboard(self, dif="normal"):
         leaderboard_file = self._get_leaderboard_path(dif)
@@ -23,15 +90,18 @@ class Leaderboard:
             try:
                 with open(leaderboard_file, 'r') as f:
                     return json.load(f)
-            except:
+            except (OSError, ValueError) as e:
+                # Keep the unreadable file for recovery instead of overwriting it with the next save
+                print(f"Leaderboard {leaderboard_file} is unreadable ({e}), moved to .bad")
+                os.replace(leaderboard_file, leaderboard_file + ".bad")
                 return []
         return []
     
     def save_leaderboard(self, dif="normal"):
-        leaderboard_file = self._get_leaderboard_path(dif)
-        os.makedirs(os.path.dirname(leaderboard_file), exist_ok=True)
-        with open(leaderboard_file, 'w') as f:
-            json.dump(self.leaderboards[dif], f, indent=2)
+        self.writer.submit(self._get_leaderboard_path(dif), self.leaderboards[dif]) #written on the writer thread
+
+    def close(self):
+        self.writer.close()
     
     def add_score(self, time_ms, att, dif="normal"):
         entry = {
@@ -61,8 +131,26 @@ class Leaderboard:
         return self.leaderboards.get(dif, [])
     
     def _format_time(self, time_ms):
-        total_ms = int(time_ms)
-        minutes = (total_ms // 60000) % 60
-        seconds = (total_ms // 1000) % 60
-        milliseconds = total_ms % 1000
-        return f"{minutes:02d}:{seconds:02d}:{milliseconds:03d}"
+        return format_time(time_ms)
+
+
+def format_time(time_ms):
+    total_ms = int(time_ms)
+    minutes = (total_ms // 60000) % 60
+    seconds = (total_ms // 1000) % 60
+    milliseconds = total_ms % 1000
+    return f"{minutes:02d}:{seconds:02d}:{milliseconds:03d}"
+
+
+def leaderboard_filename(dif):
+    # Handle special case for baby_mode file naming
+    return "leaderboard_baby.json" if dif == "baby_mode" else f"leaderboard_{dif}.json"
+
+
+def open_leaderboard(backend="json", data_dir=None):
+    """Create the leaderboard store: "json" keeps the top 5 per difficulty in JSON files,
+    "sqlite" keeps every run in one SQLite database (importing the JSON files once)."""
+    if backend == "sqlite":
+        from scripts.leaderboard_sqlite import SQLiteLeaderboard
+        return SQLiteLeaderboard(data_dir)
+    return Leaderboard(data_dir)
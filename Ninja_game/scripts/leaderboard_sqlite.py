@@ -0,0 +1,181 @@
+import json
+import os
+import sqlite3
+from datetime import datetime
+
+from scripts.leaderboard import format_time, leaderboard_filename
+from scripts.utils import resources
+
+SCHEMA_VERSION = 2
+DIFFICULTIES = ("baby_mode", "normal", "hard")
+BUCKET_MS = 1000  # run_buckets counts runs per difficulty and whole second of time, run_times per millisecond
+
+
+class SQLiteLeaderboard:
+    """Leaderboard that keeps every finished run in one SQLite database.
+
+    Runs are indexed by (difficulty, time_ms), so the top list is an index range read.
+    For ranks triggers keep run counts per second (run_buckets) and per millisecond
+    (run_times). A rank adds up the counts of the faster seconds, then the counts of the
+    faster milliseconds inside its own second (at most BUCKET_MS rows), and only looks
+    at single runs that have exactly its time. Its cost grows with the number of
+    distinct seconds below the time and the ties at that exact time, not with the
+    number of runs, so a million runs clustered around one time stay cheap.
+    The database uses WAL mode: the menu can read while a run is being stored, and a
+    commit only appends to the log instead of rewriting the file.
+
+    get_leaderboard() / add_score() match Leaderboard, so the game can use either.
+    """
+
+    def __init__(self, data_dir=None, db_name="leaderboard.sqlite3"):
+        self.data_dir = data_dir or resources.path("top_times")
+        self.max_entries = 5
+        os.makedirs(self.data_dir, exist_ok=True)
+        self.db = sqlite3.connect(os.path.join(self.data_dir, db_name))
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL") # WAL stays consistent on a crash, only the last commits can be lost on power loss
+        self._create_schema()
+
+    def _create_schema(self):
+        version = self.db.execute("PRAGMA user_version").fetchone()[0]
+        if version >= SCHEMA_VERSION:
+            return
+        with self.db:
+            if version < 1:
+                self._create_runs()
+            if version < 2:
+                self._create_run_times()
+            self.db.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    def _create_runs(self):
+        self.db.execute("""CREATE TABLE IF NOT EXISTS runs (
+            id INTEGER PRIMARY KEY,
+            difficulty TEXT NOT NULL,
+            time_ms INTEGER NOT NULL,
+            attempts INTEGER NOT NULL,
+            player TEXT NOT NULL DEFAULT 'player',
+            timestamp TEXT NOT NULL
+        )""")
+        self.db.execute("CREATE INDEX IF NOT EXISTS runs_by_time ON runs (difficulty, time_ms, id)")
+        self.db.execute("CREATE INDEX IF NOT EXISTS runs_by_player ON runs (player, difficulty, time_ms)")
+        self.db.execute("""CREATE TABLE IF NOT EXISTS run_buckets (
+            difficulty TEXT NOT NULL,
+            bucket INTEGER NOT NULL,
+            runs INTEGER NOT NULL,
+            PRIMARY KEY (difficulty, bucket)
+        ) WITHOUT ROWID""")
+        self.db.execute(f"""CREATE TRIGGER IF NOT EXISTS count_run AFTER INSERT ON runs BEGIN
+            INSERT INTO run_buckets VALUES (new.difficulty, new.time_ms / {BUCKET_MS}, 1)
+            ON CONFLICT (difficulty, bucket) DO UPDATE SET runs = runs + 1;
+        END""")
+        self.db.execute(f"""CREATE TRIGGER IF NOT EXISTS uncount_run AFTER DELETE ON runs BEGIN
+            UPDATE run_buckets SET runs = runs - 1 WHERE difficulty = old.difficulty AND bucket = old.time_ms / {BUCKET_MS};
+        END""")
+        self.migrate_json()
+
+    def _create_run_times(self):
+        self.db.execute("""CREATE TABLE IF NOT EXISTS run_times (
+            difficulty TEXT NOT NULL,
+            time_ms INTEGER NOT NULL,
+            runs INTEGER NOT NULL,
+            PRIMARY KEY (difficulty, time_ms)
+        ) WITHOUT ROWID""")
+        self.db.execute("""CREATE TRIGGER IF NOT EXISTS count_run_time AFTER INSERT ON runs BEGIN
+            INSERT INTO run_times VALUES (new.difficulty, new.time_ms, 1)
+            ON CONFLICT (difficulty, time_ms) DO UPDATE SET runs = runs + 1;
+        END""")
+        self.db.execute("""CREATE TRIGGER IF NOT EXISTS uncount_run_time AFTER DELETE ON runs BEGIN
+            UPDATE run_times SET runs = runs - 1 WHERE difficulty = old.difficulty AND time_ms = old.time_ms;
+        END""")
+        # Runs stored before this table existed (an older database, or the JSON import)
+        self.db.execute("INSERT INTO run_times SELECT difficulty, time_ms, COUNT(*) FROM runs GROUP BY difficulty, time_ms")
+
+    def migrate_json(self):
+        """Import the runs kept by the JSON leaderboard files (they are left in place)."""
+        for dif in DIFFICULTIES:
+            path = os.path.join(self.data_dir, leaderboard_filename(dif))
+            if not os.path.exists(path):
+                continue
+            try:
+                with open(path, 'r') as f:
+                    entries = json.load(f)
+            except (OSError, ValueError) as e:
+                print(f"Skipping unreadable leaderboard {path}: {e}")
+                continue
+            self.db.executemany(
+                "INSERT INTO runs (difficulty, time_ms, attempts, timestamp) VALUES (?, ?, ?, ?)",
+                [(dif, int(entry["time_ms"]), entry.get("att:", 0), entry.get("timestamp", "")) for entry in entries],
+            )
+
+    def add_score(self, time_ms, att, dif="normal", player="player"):
+        """Store a run; returns its rank if it made the top list, else None (like Leaderboard)."""
+        with self.db:
+            run_id = self.db.execute(
+                "INSERT INTO runs (difficulty, time_ms, attempts, player, timestamp) VALUES (?, ?, ?, ?, ?)",
+                (dif, int(time_ms), att, player, datetime.now().isoformat()),
+            ).lastrowid
+        rank = self.rank(dif, time_ms, run_id)
+        return rank if rank <= self.max_entries else None
+
+    def rank(self, dif, time_ms, run_id=None):
+        """1-based position of a time among all runs of a difficulty (earlier runs win ties)."""
+        time_ms = int(time_ms)
+        bucket = time_ms // BUCKET_MS
+        faster = self.db.execute(
+            "SELECT TOTAL(runs) FROM run_buckets WHERE difficulty = ? AND bucket < ?", (dif, bucket)
+        ).fetchone()[0]
+        # Inside its own second, the faster milliseconds
+        faster += self.db.execute(
+            "SELECT TOTAL(runs) FROM run_times WHERE difficulty = ? AND time_ms >= ? AND time_ms < ?",
+            (dif, bucket * BUCKET_MS, time_ms),
+        ).fetchone()[0]
+        # and the runs with exactly this time that were stored earlier
+        ties = 0
+        if run_id is not None:
+            ties = self.db.execute(
+                "SELECT COUNT(*) FROM runs WHERE difficulty = ? AND time_ms = ? AND id < ?", (dif, time_ms, run_id)
+            ).fetchone()[0]
+        return int(faster) + ties + 1
+
+    def percentile(self, dif, time_ms):
+        """Share of runs (0-100) that were slower than time_ms."""
+        total = self.count(dif)
+        if not total:
+            return 100.0
+        at_most = self.rank(dif, int(time_ms) + 1) - 1
+        return (total - at_most) * 100.0 / total
+
+    def count(self, dif):
+        return int(self.db.execute("SELECT TOTAL(runs) FROM run_buckets WHERE difficulty = ?", (dif,)).fetchone()[0])
+
+    def top(self, dif="normal", limit=None):
+        rows = self.db.execute(
+            "SELECT time_ms, attempts, timestamp FROM runs WHERE difficulty = ? ORDER BY time_ms, id LIMIT ?",
+            (dif, limit or self.max_entries),
+        )
+        return [self._entry(*row) for row in rows]
+
+    def get_leaderboard(self, dif="normal"):
+        return self.top(dif)
+
+    def history(self, player="player", dif=None):
+        """Every run of a player, newest first."""
+        if dif is None:
+            rows = self.db.execute("SELECT time_ms, attempts, timestamp FROM runs WHERE player = ? ORDER BY id DESC", (player,))
+        else:
+            rows = self.db.execute("SELECT time_ms, attempts, timestamp FROM runs WHERE player = ? AND difficulty = ? ORDER BY id DESC", (player, dif))
+        return [self._entry(*row) for row in rows]
+
+    def personal_best(self, player="player", dif="normal"):
+        row = self.db.execute(
+            "SELECT time_ms, attempts, timestamp FROM runs WHERE player = ? AND difficulty = ? ORDER BY time_ms LIMIT 1",
+            (player, dif),
+        ).fetchone()
+        return self._entry(*row) if row else None
+
+    def _entry(self, time_ms, attempts, timestamp):
+        # Same dict shape as the JSON leaderboard entries the menu renders
+        return {"time_ms": time_ms, "att:": attempts, "timestamp": timestamp, "formatted_time": format_time(time_ms)}
+
+    def close(self):
+        self.db.close()
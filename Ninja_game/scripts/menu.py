@@ -1,6 +1,8 @@
 import pygame
 import os
 
+from engine.text_cache import TextCache
+
 class TextButton:
     def __init__(self, x, y, text, font, callback=None):
         self.x = x
@@ -9,6 +11,7 @@ class TextButton:
         self.font = font
         self.callback = callback
         self.selected = False
+        self.dirty = False  # needs redrawing on the next partial menu render
         self.color_text = (255, 255, 255)
         self.color_selected = (255, 100, 100)
     
@@ -17,21 +20,20 @@ class TextButton:
         if self.callback:
             self.callback()
     
-    def render(self, display):
+    def get_rect(self):
+        """Area the button covers on the display, including its outline."""
+        rect = pygame.Rect((0, 0), self.font.size(self.text))
+        rect.center = (self.x, self.y)
+        return rect.inflate(2, 2)
+
+    def render(self, display, text_cache):
         """Render button text with outline."""
         color = self.color_selected if self.selected else self.color_text
-        text_surf = self.font.render(self.text, True, color)
-        text_rect = text_surf.get_rect(center=(self.x, self.y))
+        text_rect = pygame.Rect((0, 0), self.font.size(self.text))
+        text_rect.center = (self.x, self.y)
         
-        # Draw outline
-        outline_width = 1
-        for dx in range(-outline_width, outline_width + 1):
-            for dy in range(-outline_width, outline_width + 1):
-                if dx != 0 or dy != 0:
-                    outline_text = self.font.render(self.text, True, (0, 0, 0))
-                    display.blit(outline_text, (text_rect.x + dx, text_rect.y + dy))
-        # Draw main text
-        display.blit(text_surf, text_rect)
+        # Outline and main text come pre-composited from the cache
+        display.blit(text_cache.render(self.font, self.text, color, (0, 0, 0), 1), (text_rect.x - 1, text_rect.y - 1))
         return text_rect
     
     def is_clicked(self, pos, rect):
@@ -44,6 +46,7 @@ class Menu:
         self.font = self._load_pixel_font()
         self.title_font = self._load_title_font()
         self.small_font = self._load_small_font()
+        self.text_cache = TextCache(max_entries=256)
         self.state = "main"  # main, settings, end, pause
         self.buttons = {}
         self.button_rects = {}
@@ -69,6 +72,13 @@ class Menu:
         self.difficulty_names = ["baby_mode", "normal", "hard"]  # Actual difficulty names for leaderboard
         self.difficulty_index = 1  # Start with normal
         self.difficulty_change_callback = None
+        # Retained rendering: static part of the current screen and what changed since last render
+        self.background = None
+        self.full_redraw = True
+        self.dirty_rects = []
+        self._rendered_state = None
+        self._last_mouse_pos = None
+
     def _load_pixel_font(self):
         """Load system font."""
         return pygame.font.SysFont("courier", 10, bold=True)
@@ -84,15 +94,7 @@ class Menu:
     def _render_outlined_text(self, display, text, font, color, outline_color, x, y):
         """Draw text with black outline."""
         outline_width = 1
-        # Draw outline by rendering text at offset positions
-        for dx in range(-outline_width, outline_width + 1):
-            for dy in range(-outline_width, outline_width + 1):
-                if dx != 0 or dy != 0:
-                    outline_text = font.render(text, True, outline_color)
-                    display.blit(outline_text, (x + dx, y + dy))
-        # Draw main text on top
-        main_text = font.render(text, True, color)
-        display.blit(main_text, (x, y))
+        display.blit(self.text_cache.render(font, text, color, outline_color, outline_width), (x - outline_width, y - outline_width))
     
     def setup_main_menu(self, width, height):
         center_x = width // 2
@@ -122,6 +124,7 @@ class Menu:
     
     def _toggle_sfx(self):
         self.sfx_enabled = not self.sfx_enabled
+        self._mark_dirty(self.buttons["settings"][0])
         self.buttons["settings"][0].text = "SFX: ON" if self.sfx_enabled else "SFX: OFF"
         # Call callback if set (for controlling ambience sound)
         if hasattr(self, 'toggle_sfx_callback') and self.toggle_sfx_callback:
@@ -153,10 +156,31 @@ class Menu:
     def _update_button_selection(self):
         current_buttons = self.buttons.get(self.state, [])
         for i, button in enumerate(current_buttons):
-            button.selected = (i == self.selected_button_index)
-    
+            selected = (i == self.selected_button_index)
+            if button.selected != selected:
+                self._mark_dirty(button)
+            button.selected = selected
+
+    def _mark_dirty(self, button):
+        """Queue a button for redrawing; call before changing its text so the old area is cleared too."""
+        self.dirty_rects.append(button.get_rect())
+        button.dirty = True
+
+    def invalidate(self):
+        """Force a full redraw, e.g. after gameplay drew over the display or the window was resized."""
+        self.full_redraw = True
+
     def update(self, mouse_pos):
-        pass
+        """Select the button under the mouse; mouse_pos is in display coordinates."""
+        if mouse_pos == self._last_mouse_pos:
+            return  # keep keyboard selection while the mouse stands still
+        self._last_mouse_pos = mouse_pos
+        for i, rect in enumerate(self.button_rects.get(self.state, [])):
+            if rect.collidepoint(mouse_pos):
+                if i != self.selected_button_index:
+                    self.selected_button_index = i
+                    self._update_button_selection()
+                break
     
     def handle_click(self, mouse_pos):
         current_buttons = self.buttons.get(self.state, [])
@@ -184,12 +208,14 @@ class Menu:
             # Cycle difficulty left
             self.difficulty_index = (self.difficulty_index - 1) % len(self.difficulties)
             self.difficulty = self.difficulty_names[self.difficulty_index]
+            self.invalidate()
             if self.difficulty_change_callback:
                 self.difficulty_change_callback()
         elif (key == pygame.K_RIGHT or key == pygame.K_d) and self.state == "settings" and self.selected_button_index == 1:
             # Cycle difficulty right
             self.difficulty_index = (self.difficulty_index + 1) % len(self.difficulties)
             self.difficulty = self.difficulty_names[self.difficulty_index]
+            self.invalidate()
             if self.difficulty_change_callback:
                 self.difficulty_change_callback()
             if self.difficulty_change_callback:
@@ -202,12 +228,54 @@ class Menu:
     def set_all_leaderboards(self, data_by_mode):
         for key in self.leaderboard_data_by_mode.keys():
             self.leaderboard_data_by_mode[key] = data_by_mode.get(key, [])
+        self.invalidate()
     
     def set_end_game_info(self, time_ms, level):
         self.end_time = time_ms
         self.end_level = level
+        self.invalidate()
     
     def render(self, display, width, height):
+        """Bring display up to date and return the list of changed rects (display coordinates).
+
+        The static part of a screen (titles, labels, leaderboards) is drawn once into
+        self.background; afterwards only buttons whose selection or text changed are redrawn.
+        An empty list means nothing changed and the window does not need updating.
+        """
+        current_buttons = self.buttons.get(self.state, [])
+        if (self.full_redraw or self.state != self._rendered_state
+                or self.background is None or self.background.get_size() != display.get_size()):
+            self.background = pygame.Surface(display.get_size())
+            self._render_static(self.background, width, height)
+            display.blit(self.background, (0, 0))
+            self.button_rects[self.state] = [button.render(display, self.text_cache) for button in current_buttons]
+            for button in current_buttons:
+                button.dirty = False
+            self.full_redraw = False
+            self._rendered_state = self.state
+            self.dirty_rects = []
+            return [display.get_rect()]
+
+        dirty = self.dirty_rects
+        self.dirty_rects = []
+        for button in current_buttons:
+            if button.dirty:
+                dirty.append(button.get_rect())  # new text may be wider than the old one
+                button.dirty = False
+
+        rects = self.button_rects.setdefault(self.state, [button.get_rect() for button in current_buttons])
+        for rect in dirty:
+            # Restore the static layer under the rect, then redraw every button touching it.
+            # Clipping keeps neighbouring text from being blended twice.
+            display.set_clip(rect)
+            display.blit(self.background, rect, rect)
+            for i, button in enumerate(current_buttons):
+                if button.get_rect().colliderect(rect):
+                    rects[i] = button.render(display, self.text_cache)
+        display.set_clip(None)
+        return dirty
+
+    def _render_static(self, display, width, height):
         if self.state == "main":
             self._render_main_menu(display, width, height)
         elif self.state == "settings":
@@ -221,8 +289,8 @@ class Menu:
         display.fill((30, 30, 30))
         
         # Title
-        title_text = self.title_font.render("NINJA GAME", True, (255, 255, 255))
-        title_rect = title_text.get_rect(center=(width // 2, 30))
+        title_rect = pygame.Rect((0, 0), self.title_font.size("NINJA GAME"))
+        title_rect.center = (width // 2, 30)
         self._render_outlined_text(display, "NINJA GAME", self.title_font, (255, 255, 255), (0, 0, 0), title_rect.x, title_rect.y)
         
         # Leaderboards for all modes side by side
@@ -236,62 +304,39 @@ class Menu:
         for title, key, cx in modes:
             data = self.leaderboard_data_by_mode.get(key, [])
             self._render_leaderboard_column(display, cx, start_y, title, data)
-        
-        # Buttons
-        self.button_rects["main"] = []
-        for button in self.buttons.get("main", []):
-            rect = button.render(display)
-            self.button_rects["main"].append(rect)
     
     def _render_settings_menu(self, display, width, height):
         display.fill((30, 30, 30))
         
         # Title
-        title_text = self.title_font.render("SETTINGS", True, (255, 255, 255))
-        title_x = width // 2 - title_text.get_width() // 2
+        title_x = width // 2 - self.title_font.size("SETTINGS")[0] // 2
         self._render_outlined_text(display, "SETTINGS", self.title_font, (255, 255, 255), (0, 0, 0), title_x, 30)
         
         # Display difficulty selection
         difficulty_text = f"Difficulty: {self.difficulties[self.difficulty_index]}"
-        diff_surf = self.font.render(difficulty_text, True, (200, 200, 200))
-        diff_x = width // 2 - diff_surf.get_width() // 2
+        diff_x = width // 2 - self.font.size(difficulty_text)[0] // 2
         self._render_outlined_text(display, difficulty_text, self.font, (200, 200, 200), (0, 0, 0), diff_x, 60)
         self._render_outlined_text(display, "(Use LEFT/RIGHT to change)", self.font, (150, 150, 150), (0, 0, 0), width // 2 - 70, 75)
-        
-        # Buttons
-        self.button_rects["settings"] = []
-        for button in self.buttons.get("settings", []):
-            rect = button.render(display)
-            self.button_rects["settings"].append(rect)
     
     def _render_end_menu(self, display, width, height):
         display.fill((30, 30, 30))
         
         # Title
-        title_surf = self.title_font.render("LEVEL COMPLETE!", True, (255, 255, 255))
-        title_x = width // 2 - title_surf.get_width() // 2
+        title_x = width // 2 - self.title_font.size("LEVEL COMPLETE!")[0] // 2
         self._render_outlined_text(display, "LEVEL COMPLETE!", self.title_font, (255, 255, 255), (0, 0, 0), title_x, 30)
         
         # Display completion time
         time_str = self._format_time(self.end_time)
         time_text = f"Time: {time_str}"
-        time_surf = self.font.render(time_text, True, (255, 255, 255))
-        time_x = width // 2 - time_surf.get_width() // 2
+        time_x = width // 2 - self.font.size(time_text)[0] // 2
         self._render_outlined_text(display, time_text, self.font, (255, 255, 255), (0, 0, 0), time_x, 70)
         
         level_text = f"Level: {self.end_level}"
-        level_surf = self.font.render(level_text, True, (255, 255, 255))
-        level_x = width // 2 - level_surf.get_width() // 2
+        level_x = width // 2 - self.font.size(level_text)[0] // 2
         self._render_outlined_text(display, level_text, self.font, (255, 255, 255), (0, 0, 0), level_x, 90)
         
         # Leaderboard
         self._render_leaderboard(display, width, height, 110)
-        
-        # Buttons
-        self.button_rects["end"] = []
-        for button in self.buttons.get("end", []):
-            rect = button.render(display)
-            self.button_rects["end"].append(rect)
     
     def _render_leaderboard(self, display, width, height, start_y):
         """Render leaderboard columns for the end menu."""
@@ -309,20 +354,12 @@ class Menu:
         display.fill((30, 30, 30))
         
         # Title
-        title_surf = self.title_font.render("PAUSED", True, (255, 255, 255))
-        title_x = width // 2 - title_surf.get_width() // 2
+        title_x = width // 2 - self.title_font.size("PAUSED")[0] // 2
         self._render_outlined_text(display, "PAUSED", self.title_font, (255, 255, 255), (0, 0, 0), title_x, height // 2 - 60)
-        
-        # Buttons
-        self.button_rects["pause"] = []
-        for button in self.buttons.get("pause", []):
-            rect = button.render(display)
-            self.button_rects["pause"].append(rect)
     
     def _render_leaderboard_column(self, display, center_x, start_y, title, data):
         """Render a single leaderboard column at center_x."""
-        title_surf = self.title_font.render(title, True, (255, 255, 255))
-        title_x = center_x - title_surf.get_width() // 2
+        title_x = center_x - self.title_font.size(title)[0] // 2
         self._render_outlined_text(display, title, self.title_font, (255, 255, 255), (0, 0, 0), title_x, start_y)
         
         y_offset = start_y + 18
@@ -331,8 +368,7 @@ class Menu:
             time_str = entry.get("formatted_time", "00:00:000")
             att = entry.get("att:", 0)
             text = f"{rank}. {time_str} - {att}"
-            text_surf = self.small_font.render(text, True, (200, 200, 200))
-            text_x = center_x - text_surf.get_width() // 2
+            text_x = center_x - self.small_font.size(text)[0] // 2
             self._render_outlined_text(display, text, self.small_font, (200, 200, 200), (0, 0, 0), text_x, y_offset)
             y_offset += 14
     
@@ -1,24 +1,19 @@
-class Particle:
-    def __init__ (self, game, p_type, pos, velocity = [0, 0], frame= 0):
-        self.game = game
-        self.type = p_type
-        self.pos = list(pos)
-        self.velocity = list(velocity)
-        self.animation = self.game.assets["particle/" + p_type].copy() #copy to avoid modifying original
-        self.animation.frame = frame
-        
-    def update(self):
-        kill = False
-        if self.animation.done:
-            kill = True
+import math
 
-        self.pos[0] += self.velocity[0]
-        self.pos[1] += self.velocity[1]
+from engine.ecs import register_component
+from engine.particle import spawn_particle as spawn_world_particle
 
-        self.animation.update()
+register_component('leaf', ())  # tag: leaves sway sideways while they fall
 
-        return kill
-    
-    def render(self, surf, offset=(0,0)):
-        img = self.animation.img()
-        surf.blit(img, (self.pos[0] - offset[0] - img.get_width() // 2, self.pos[1] - offset[1] - img.get_height() // 2))
\ No newline at end of file
+
+def spawn_particle(game, p_type, pos, velocity=(0, 0), frame=0):
+    """Add a particle of the given kind ("leaf", "particle") to game.world."""
+    tags = ('leaf',) if p_type == "leaf" else ()
+    spawn_world_particle(game.world, game.assets["particle/" + p_type], pos, velocity, frame, tags)
+
+
+def sway_leaves(world):
+    for archetype in world.query('position', 'animation', 'leaf'):
+        x, frames = archetype.columns['x'], archetype.columns['frame']
+        for i in range(len(archetype)):
+            x[i] += math.sin(frames[i] * 0.035) * 0.3
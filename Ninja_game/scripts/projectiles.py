@@ -0,0 +1,71 @@
+from array import array
+
+
+class ProjectileSystem:
+    """All active enemy projectiles, stored as parallel arrays instead of one list per shot.
+
+    Removal swaps the last projectile into the freed slot, so it is O(1) and never
+    shifts the arrays. Movement is tested as a segment against the tile grid, so a
+    fast projectile cannot skip over a thin wall between two frames.
+    """
+
+    def __init__(self, img, max_age=360):
+        self.img = img
+        self.max_age = max_age  # frames before a projectile that hit nothing disappears
+        self.x = array('d')
+        self.y = array('d')
+        self.vx = array('d')
+        self.vy = array('d')
+        self.age = array('i')
+
+    def __len__(self):
+        return len(self.x)
+
+    def spawn(self, pos, velocity):
+        self.x.append(pos[0])
+        self.y.append(pos[1])
+        self.vx.append(velocity[0])
+        self.vy.append(velocity[1])
+        self.age.append(0)
+
+    def clear(self):
+        for column in (self.x, self.y, self.vx, self.vy, self.age):
+            del column[:]
+
+    def _remove(self, i):
+        for column in (self.x, self.y, self.vx, self.vy, self.age):
+            column[i] = column[-1]
+            column.pop()
+
+    def update(self, tilemap, target_rect=None):
+        """Move every projectile one frame.
+
+        Returns (impacts, hits): impacts is a list of (pos, vx) for projectiles stopped by
+        a wall, hits is how many touched target_rect (pass None while it can't be hit).
+        """
+        impacts = []
+        hits = 0
+        i = 0
+        while i < len(self.x):
+            start = (self.x[i], self.y[i])
+            end = (start[0] + self.vx[i], start[1] + self.vy[i])
+            self.age[i] += 1
+            wall_hit = tilemap.raycast(start, end)
+            if wall_hit:
+                impacts.append((wall_hit, self.vx[i]))
+                self._remove(i)
+            elif self.age[i] > self.max_age:
+                self._remove(i)
+            elif target_rect and target_rect.clipline(start, end):
+                hits += 1
+                self._remove(i)
+            else:
+                self.x[i], self.y[i] = end
+                i += 1  # removed slots now hold the last projectile, so only advance when kept
+        return impacts, hits
+
+    def render(self, surf, offset=(0, 0)):
+        img = self.img
+        left = img.get_width() / 2 + offset[0]
+        top = img.get_height() / 2 + offset[1]
+        surf.blits([(img, (x - left, y - top)) for x, y in zip(self.x, self.y)], doreturn=False)
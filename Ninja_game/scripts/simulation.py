@@ -0,0 +1,91 @@
+from engine.simulation import Simulation as BaseSimulation
+from scripts.utils import load_image, load_images, Animation, resources
+from scripts.entities import PlayerEntity, EnemyEntity
+from scripts.tilemap import Tilemap
+from scripts.projectiles import ProjectileSystem
+
+LEVELS = ("maps/0.json", "maps/1.json", "maps/2.json", "the_secret_level/3.json")
+
+
+class Simulation(BaseSimulation):
+    """The playing branch of Game.run without drawing: a level is completed when every enemy is dead."""
+
+    def __init__(self, seed=0):
+        super().__init__(seed)
+        self.assets = {
+            "enemy/idle": Animation(load_images("entities/enemy/idle"), img_dur=6),
+            "enemy/run": Animation(load_images("entities/enemy/run"), img_dur=6),
+            "player/idle": Animation(load_images("entities/player/idle"), img_dur=6),
+            "player/run": Animation(load_images("entities/player/run"), img_dur=4),
+            "player/jump": Animation(load_images("entities/player/jump")),
+            "player/slide": Animation(load_images("entities/player/slide")),
+            "player/wall_slide": Animation(load_images("entities/player/wall_slide")),
+            "particle/particle": Animation(load_images("particles/particle"), img_dur=6, loop=False),
+        }
+        self.tilemap = Tilemap(self, tile_size=16)
+        self.projectiles = ProjectileSystem(load_image("projectile.png"))
+        self.targets = {}  # enemy -> its index in the freshly loaded level, the key of its goal
+
+    def load_level(self, name):
+        self.tilemap.load(name, resources, compiled=True)
+        self.player = PlayerEntity(self, (50, 50), (8, 15))
+        self.enemies = []
+        for spawner in self.tilemap.extract([('spawners', 0), ('spawners', 1)]):
+            if spawner['variant'] == 0:
+                self.player.pos = spawner['pos']
+                self.player.air_time = 0
+            else:
+                self.enemies.append(EnemyEntity(self, spawner['pos'], (8, 15)))
+        self.targets = {enemy: i for i, enemy in enumerate(self.enemies)}
+        self.projectiles.clear()
+        self.world.clear()
+        self.reset()
+
+    def step(self, inputs):
+        if 'jump' in inputs.pressed:
+            self.player.jump()
+        if 'dash' in inputs.pressed:
+            self.player.dash()
+
+        sight = self.tilemap.lines_of_sight([enemy.rect().center for enemy in self.enemies], self.player.rect().center)
+        for enemy, visible in zip(self.enemies, sight):
+            enemy.sees_player = visible
+        for enemy in self.enemies.copy():
+            if enemy.update(self.tilemap, (0, 0)):
+                self.enemies.remove(enemy)
+
+        if not self.dead:
+            self.player.update(self.tilemap, (inputs.move, 0))
+
+        impacts, hits = self.projectiles.update(self.tilemap, self.player.rect() if abs(self.player.dashing) < 50 else None)
+        if hits:
+            self.dead += 1
+        self.world.clear()
+        self.frame += 1
+
+    def goals(self):
+        return [(self.targets[enemy], enemy.rect().center) for enemy in self.enemies]
+
+    @property
+    def completed(self):
+        return not self.dead and not self.enemies
+
+    def hazards(self):
+        projectiles = self.projectiles
+        return [((x, y), (vx, vy)) for x, y, vx, vy in zip(projectiles.x, projectiles.y, projectiles.vx, projectiles.vy)]
+
+    def state_key(self):
+        player = self.player
+        return (int(player.pos[0]), int(player.pos[1]), round(player.velocity[0]), round(player.velocity[1] * 2),
+                player.jumps, player.wall_slide, (player.dashing + 60) // 10, tuple(self.targets[enemy] for enemy in self.enemies))
+
+    def snapshot(self):
+        snapshot = super().snapshot()
+        projectiles = self.projectiles
+        snapshot["projectiles"] = [column[:] for column in (projectiles.x, projectiles.y, projectiles.vx, projectiles.vy, projectiles.age)]
+        return snapshot
+
+    def restore(self, snapshot):
+        super().restore(snapshot)
+        projectiles = self.projectiles
+        projectiles.x, projectiles.y, projectiles.vx, projectiles.vy, projectiles.age = [column[:] for column in snapshot["projectiles"]]
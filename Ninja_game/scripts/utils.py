@@ -1,39 +1,12 @@
 import os
 
-import pygame
+from engine.resources import Resources
+from engine.utils import ImageLoader, Animation
 
-BASE_IMG_PATH = 'Ninja_game/data/images/'
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data')
+BASE_IMG_PATH = 'images/'
 
-def load_image(path):
-    img = pygame.image.load(BASE_IMG_PATH + path).convert()
-    img.set_colorkey((0, 0, 0))
-    return img
-
-def load_images(path):
-    images = []
-    for img_name in sorted(os.listdir(BASE_IMG_PATH + path)):
-        images.append(load_image(path + '/' + img_name))
-    return images
-
-class Animation:
-    def __init__(self, images, img_dur=5, loop=True):
-        self.images = images
-        self.loop = loop
-        self.img_duration = img_dur
-        self.done = False
-        self.frame = 0 #current frame index
-
-    def copy(self):
-        return Animation(self.images, self.img_duration, self.loop)
-    
-    def update(self):
-        if self.loop:
-            self.frame = (self.frame + 1) % (len(self.images) * self.img_duration) #looping animation
-        else:
-            self.frame = min(self.frame + 1, self.img_duration * len(self.images) - 1) #non-looping animation
-            if self.frame >= self.img_duration * len(self.images) - 1:
-                self.done = True
-
-    def img(self):
-        return self.images[self.frame // self.img_duration] 
-        
\ No newline at end of file
+resources = Resources(DATA_DIR) # loose files in Ninja_game/data, else the packed Ninja_game/data.zip
+_loader = ImageLoader(resources, BASE_IMG_PATH)
+load_image = _loader.load_image
+load_images = _loader.load_images
@@ -0,0 +1,5 @@
+"""Code shared by Ninja_game and Corebound: tilemap, physics, animation, effects, ECS and presentation.
+
+Each game configures it with its own tables (image folder, physics and autotile tiles) in
+its scripts package; anything tuned here speeds up both games.
+"""
@@ -0,0 +1,251 @@
+import json
+import os
+import queue
+import threading
+import time
+
+CHUNK_SIZE = 16  # tiles per chunk side; an edit rewrites only its chunk in the journal
+AUTOSAVE_INTERVAL = 5.0  # seconds between journal writes while editing
+COMPACT_RECORDS = 2000  # journal records after which the journal is replaced by one snapshot record
+
+
+class Autosave:
+    """Editor autosave as an append-only journal of changed chunks, written on a worker thread.
+
+    The tilemap tells the autosave which cells change (it is a Tilemap listener), so every
+    interval only the chunks touched since the last write are copied and appended to
+    "<map>.json.autosave" as one JSON line each; a small edit costs the same on any map
+    size. The worker applies the same records to its own copy of the map, so saving the
+    map (save()) also only copies the dirty chunks on the main thread; the worker writes
+    the full file from its copy and empties the journal.
+
+    A journal left over at startup holds edits that were never saved. open() moves it
+    aside to "<map>.json.autosave.pending" and new edits start a fresh journal, so
+    recover() replays exactly the old session and discard() drops only that.
+
+    Tiles are replaced, never changed in place (see Tilemap.write_cell), so the tile
+    dicts can be shared with the worker without copying them.
+    """
+
+    def __init__(self, tilemap, interval=AUTOSAVE_INTERVAL):
+        self.tilemap = tilemap
+        self.interval = interval
+        self.map_path = None
+        self.journal_path = None
+        self.pending_path = None  # journal of an earlier session waiting for recover() or discard()
+        self.dirty_chunks = set()
+        self.offgrid_dirty = False
+        self.last_write = time.monotonic()
+        self.journal_records = 0
+        self.mirror = None  # the worker's copy of the map: {"tilemap", "tile_size", "offgrid"}, only touched on the worker
+        self.tasks = queue.Queue()
+        self.worker = threading.Thread(target=self._run, name="editor-autosave", daemon=True)
+        self.worker.start()
+        tilemap.listeners.append(self)
+
+    def open(self, map_path):
+        """Start journaling edits of the (just loaded) map at map_path; returns True if an unsaved journal exists."""
+        self.flush()
+        self.map_path = map_path
+        self.journal_path = map_path + ".autosave"
+        self.pending_path = self.journal_path + ".pending"
+        self.dirty_chunks = set()
+        self.offgrid_dirty = False
+        self.journal_records = 0
+        if os.path.exists(self.journal_path):
+            if os.path.exists(self.pending_path): # the editor quit before the last prompt was answered: keep both sessions, oldest first
+                with open(self.journal_path, 'r') as f:
+                    self._append_text(self.pending_path, f.read())
+                os.remove(self.journal_path)
+            else:
+                os.replace(self.journal_path, self.pending_path)
+        tilemap = self.tilemap
+        self.tasks.put((self._reset, ({"tilemap": dict(tilemap.tilemap), "tile_size": tilemap.tile_size, "offgrid": list(tilemap.offgrid_tiles)},)))
+        return os.path.exists(self.pending_path) and os.path.getsize(self.pending_path) > 0
+
+    # Tilemap listener interface
+
+    def map_loaded(self):
+        self.dirty_chunks = set()
+        self.offgrid_dirty = False
+
+    def cell_changed(self, loc, old, new):
+        x, y = loc.split(';')
+        self.dirty_chunks.add((int(x) // CHUNK_SIZE, int(y) // CHUNK_SIZE))
+
+    def offgrid_changed(self, tile, index, added):
+        self.offgrid_dirty = True
+
+    # Writing
+
+    def update(self, force=False):
+        """Call once per frame; appends the dirty chunks to the journal every interval."""
+        if not self.journal_path or not (self.dirty_chunks or self.offgrid_dirty):
+            return
+        now = time.monotonic()
+        if not force and now - self.last_write < self.interval:
+            return
+        self.last_write = now
+        records = self.take_records()
+        if self.journal_records + len(records) > COMPACT_RECORDS:
+            self.tasks.put((self._compact, (self.journal_path, records)))
+            self.journal_records = 1
+        else:
+            self.tasks.put((self._append, (self.journal_path, records)))
+            self.journal_records += len(records)
+
+    def take_records(self):
+        """Journal records of everything changed since the last call: one per dirty chunk, plus the offgrid tiles."""
+        records = [{"chunk": list(chunk), "tiles": self.chunk_tiles(chunk)} for chunk in self.dirty_chunks]
+        if self.offgrid_dirty:
+            records.append({"offgrid": list(self.tilemap.offgrid_tiles)})
+        self.dirty_chunks = set()
+        self.offgrid_dirty = False
+        return records
+
+    def chunk_tiles(self, chunk):
+        tiles = {}
+        grid = self.tilemap.tilemap
+        for x in range(chunk[0] * CHUNK_SIZE, (chunk[0] + 1) * CHUNK_SIZE):
+            for y in range(chunk[1] * CHUNK_SIZE, (chunk[1] + 1) * CHUNK_SIZE):
+                loc = str(x) + ';' + str(y)
+                if loc in grid:
+                    tiles[loc] = grid[loc]
+        return tiles
+
+    def save(self):
+        """Write the whole map in the background and drop the journals once it is on disk."""
+        if not self.map_path:
+            return
+        records = self.take_records()
+        self.journal_records = 0
+        self.tasks.put((self._save, (self.map_path, self.journal_path, self.pending_path, records)))
+
+    def flush(self):
+        """Journal pending edits now and wait until the worker has written everything."""
+        self.update(force=True)
+        self.tasks.join()
+
+    def close(self):
+        self.flush()
+        self.tasks.put(None)
+
+    # Recovery
+
+    def recover(self):
+        """Replay the pending journal over the loaded map; returns the number of records applied.
+
+        Recovered chunks replace whatever was edited in them since the editor started. A
+        record cut off by a crash (the last line) is skipped. The replayed changes go into
+        the new journal before the pending one is removed.
+        """
+        if not self.pending_path or not os.path.exists(self.pending_path):
+            return 0
+        applied = 0
+        with open(self.pending_path, 'r') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    break
+                self.apply(record)
+                applied += 1
+        self.update(force=True)
+        self.tasks.put((self._remove, (self.pending_path,)))
+        return applied
+
+    def apply(self, record):
+        tilemap = self.tilemap
+        if "snapshot" in record:
+            snapshot = record["snapshot"]
+            for loc in list(tilemap.tilemap):
+                if loc not in snapshot["tilemap"]:
+                    tilemap.write_cell(loc, None)
+            for loc, tile in snapshot["tilemap"].items():
+                if tilemap.tilemap.get(loc) != tile:
+                    tilemap.write_cell(loc, tile)
+            self._replace_offgrid(snapshot["offgrid"])
+        elif "chunk" in record:
+            cx, cy = record["chunk"]
+            tiles = record["tiles"]
+            for x in range(cx * CHUNK_SIZE, (cx + 1) * CHUNK_SIZE):
+                for y in range(cy * CHUNK_SIZE, (cy + 1) * CHUNK_SIZE):
+                    loc = str(x) + ';' + str(y)
+                    if tilemap.tilemap.get(loc) != tiles.get(loc):
+                        tilemap.write_cell(loc, tiles.get(loc))
+        elif "offgrid" in record:
+            self._replace_offgrid(record["offgrid"])
+
+    def _replace_offgrid(self, tiles):
+        for tile in list(self.tilemap.offgrid_tiles):
+            self.tilemap.remove_offgrid(tile)
+        for tile in tiles:
+            self.tilemap.add_offgrid(tile)
+
+    def discard(self):
+        """Forget the unsaved journal of the earlier session."""
+        if self.pending_path:
+            self.tasks.put((self._remove, (self.pending_path,)))
+
+    # Worker thread
+
+    def _run(self):
+        while True:
+            task = self.tasks.get()
+            try:
+                if task is None:
+                    return
+                func, args = task
+                func(*args)
+            except OSError as e:
+                print(f"Autosave failed: {e}")
+            finally:
+                self.tasks.task_done()
+
+    def _reset(self, mirror):
+        self.mirror = mirror
+
+    def _apply(self, records):
+        for record in records:
+            if "chunk" in record:
+                cx, cy = record["chunk"]
+                grid = self.mirror["tilemap"]
+                for x in range(cx * CHUNK_SIZE, (cx + 1) * CHUNK_SIZE):
+                    for y in range(cy * CHUNK_SIZE, (cy + 1) * CHUNK_SIZE):
+                        grid.pop(str(x) + ';' + str(y), None)
+                grid.update(record["tiles"])
+            elif "offgrid" in record:
+                self.mirror["offgrid"] = record["offgrid"]
+
+    def _append(self, journal_path, records):
+        self._apply(records)
+        self._append_text(journal_path, ''.join(json.dumps(record) + '\n' for record in records))
+
+    def _append_text(self, path, data):
+        with open(path, 'a') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+
+    def _compact(self, journal_path, records):
+        self._apply(records)
+        self._write_atomic(journal_path, json.dumps({"snapshot": self.mirror}) + '\n')
+
+    def _save(self, map_path, journal_path, pending_path, records):
+        self._apply(records)
+        self._write_atomic(map_path, json.dumps(self.mirror))
+        self._remove(journal_path) # everything in it is now in the map file
+        self._remove(pending_path) # saving over an unanswered recovery prompt drops the old session
+
+    def _remove(self, path):
+        if os.path.exists(path):
+            os.remove(path)
+
+    def _write_atomic(self, path, data):
+        temp_path = path + ".tmp"
+        with open(temp_path, 'w') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+
@@ -0,0 +1,63 @@
+"""Offline map compiler: bakes data/maps/*.json into data/compiled/maps/*.json.
+
+A compiled map is already autotiled and carries the indexes the game would otherwise
+rebuild or scan for every frame: a per-chunk render list (offgrid tiles included), a
+tile type index for extract() (spawners, power-ups, leaf trees) and the merged
+collision rects. Its first line holds a content hash of the source map and of the
+game's tile tables, so Tilemap.load(..., compiled=True) falls back to the source map
+when the compiled one is out of date, and this tool skips maps that are unchanged.
+
+    python -m engine.compile_map Ninja_game
+    python -m engine.compile_map Corebound --force
+"""
+import argparse
+import json
+import os
+import sys
+
+
+def compile_maps(game_dir, names=None, force=False):
+    """Compile maps of a game folder; yields (map name, status) for every map."""
+    sys.path.insert(0, os.path.abspath(game_dir))  # the game's scripts package holds its Tilemap tables
+    from scripts.tilemap import Tilemap
+
+    maps_dir = os.path.join(game_dir, 'data', 'maps')
+    out_dir = os.path.join(game_dir, 'data', 'compiled', 'maps')
+    os.makedirs(out_dir, exist_ok=True)
+    for name in names or sorted(os.listdir(maps_dir)):
+        if not name.endswith('.json'):
+            continue
+        with open(os.path.join(maps_dir, name), 'rb') as f:
+            source = f.read()
+        out_path = os.path.join(out_dir, name)
+        if not force and os.path.exists(out_path):
+            with open(out_path, 'r') as f:
+                header = json.loads(f.readline() or '{}')
+            if header.get("hash") == Tilemap.content_hash(source):
+                yield name, "up to date"
+                continue
+        try:
+            baked = Tilemap(None).bake(source)
+        except (ValueError, KeyError) as e:
+            yield name, f"skipped, not a valid map ({e})"
+            continue
+        temp_path = out_path + '.tmp'
+        with open(temp_path, 'w') as f:
+            f.write(baked)
+        os.replace(temp_path, out_path)
+        yield name, "compiled"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bake a game's maps into runtime-ready compiled maps.")
+    parser.add_argument('game_dir', help="game folder, e.g. Ninja_game")
+    parser.add_argument('maps', nargs='*', help="map file names in data/maps (default: all)")
+    parser.add_argument('--force', action='store_true', help="recompile maps that are up to date")
+    args = parser.parse_args()
+
+    for name, status in compile_maps(args.game_dir, args.maps, args.force):
+        print(f"{name}: {status}")
+
+
+if __name__ == '__main__':
+    main()
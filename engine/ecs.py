@@ -0,0 +1,179 @@
+"""Archetype storage for the many small things of a frame: particles, sparks, leaves, power-ups, notifications.
+
+The player and enemies stay PhysicsEntity objects. There are only tens of them, each
+runs its own state machine (AI, navigation, line of sight, attacks) and the headless
+Simulation snapshots them attribute by attribute, so columns would buy little for a
+large rewrite. Ninja projectiles have their own column store, ProjectileSystem.
+"""
+from array import array
+
+# Component name -> the columns it adds to an archetype: (column name, array typecode).
+# A typecode of None stores plain Python objects in a list (shared images, animations).
+COMPONENTS = {
+    'position': (('x', 'd'), ('y', 'd')),
+    'velocity': (('vx', 'd'), ('vy', 'd')),
+    'collider': (('width', 'i'), ('height', 'i'), ('grounded', 'b')),
+    'animation': (('anim', None), ('frame', 'i')),  # the Animation is shared, only the frame is per entity
+    'lifetime': (('life', 'i'),),  # frames left; the entity is removed when it reaches 0
+    'sprite': (('img', None),),
+}
+
+
+def register_component(name, columns):
+    """Add a game-specific component, e.g. register_component('spark', (('angle', 'd'), ('speed', 'd'))).
+
+    A component without columns works as a tag that only selects a different archetype.
+    """
+    COMPONENTS[name] = tuple(columns)
+
+
+class Archetype:
+    """Every entity with exactly the same set of components, stored column by column.
+
+    Each column is one array (or list for object columns) indexed by row, so a system
+    runs over whole columns instead of attribute lookups on thousands of objects.
+    """
+
+    def __init__(self, components):
+        self.components = components
+        self.columns = {}
+        for component in components:
+            for name, typecode in COMPONENTS[component]:
+                self.columns[name] = array(typecode) if typecode else []
+        self.ids = []
+
+    def __len__(self):
+        return len(self.ids)
+
+    def add(self, entity_id, values):
+        for name, column in self.columns.items():
+            column.append(values[name])
+        self.ids.append(entity_id)
+        return len(self.ids) - 1
+
+    def remove(self, row):
+        """Swap-remove a row; returns the id of the entity moved into it, or None."""
+        last = len(self.ids) - 1
+        for column in self.columns.values():
+            column[row] = column[last]
+            column.pop()
+        self.ids[row] = self.ids[last]
+        self.ids.pop()
+        return self.ids[row] if row < last else None
+
+
+class World:
+    """Entities grouped into archetypes by component set.
+
+    spawn() takes components as keyword arguments, each a tuple of column values in
+    COMPONENTS order, e.g. spawn(position=(x, y), velocity=(0, 0.3), lifetime=(60,)).
+    """
+
+    def __init__(self):
+        self.archetypes = {}  # frozenset of component names -> Archetype
+        self.locations = {}  # entity id -> (archetype, row)
+        self.next_id = 0
+
+    def spawn(self, **components):
+        key = frozenset(components)
+        archetype = self.archetypes.get(key)
+        if archetype is None:
+            archetype = self.archetypes[key] = Archetype(sorted(key))
+        values = {}
+        for component, data in components.items():
+            for (name, typecode), value in zip(COMPONENTS[component], data):
+                values[name] = value
+        entity_id = self.next_id
+        self.next_id += 1
+        self.locations[entity_id] = (archetype, archetype.add(entity_id, values))
+        return entity_id
+
+    def despawn(self, entity_id):
+        archetype, row = self.locations.pop(entity_id)
+        moved = archetype.remove(row)
+        if moved is not None:
+            self.locations[moved] = (archetype, row)
+
+    def despawn_rows(self, archetype, rows):
+        """Remove several rows of one archetype, highest first so swap-remove keeps the rest valid."""
+        for row in sorted(rows, reverse=True):
+            self.despawn(archetype.ids[row])
+
+    def query(self, *components):
+        """Archetypes that have all the given components (and possibly more)."""
+        wanted = set(components)
+        return [archetype for key, archetype in self.archetypes.items() if wanted <= key and len(archetype)]
+
+    def count(self, *components):
+        return sum(len(archetype) for archetype in self.query(*components))
+
+    def clear(self):
+        self.archetypes = {}
+        self.locations = {}
+        self.next_id = 0
+
+
+def update_motion(world):
+    for archetype in world.query('position', 'velocity'):
+        if 'collider' in archetype.components:
+            continue  # moved by update_physics instead
+        columns = archetype.columns
+        x, y, vx, vy = columns['x'], columns['y'], columns['vx'], columns['vy']
+        for i in range(len(archetype)):
+            x[i] += vx[i]
+            y[i] += vy[i]
+
+
+def update_physics(world, tilemap, gravity=0.1, max_fall=5):
+    """Movement with gravity and tile collision for entities with a collider, using the tilemap's swept test."""
+    for archetype in world.query('position', 'velocity', 'collider'):
+        columns = archetype.columns
+        x, y, vx, vy = columns['x'], columns['y'], columns['vx'], columns['vy']
+        width, height, grounded = columns['width'], columns['height'], columns['grounded']
+        for i in range(len(archetype)):
+            size = (width[i], height[i])
+            if vx[i]:
+                x[i], hit_x = tilemap.sweep_rect((x[i], y[i]), size, 0, vx[i])
+                if hit_x:
+                    vx[i] = 0  # stopped by a wall, do not keep pushing into it
+            hit = False
+            if vy[i]:
+                y[i], hit = tilemap.sweep_rect((x[i], y[i]), size, 1, vy[i])
+            grounded[i] = hit and vy[i] > 0
+            vy[i] = 0 if hit else min(max_fall, vy[i] + gravity)
+
+
+def update_animations(world):
+    for archetype in world.query('animation'):
+        columns = archetype.columns
+        anims, frames = columns['anim'], columns['frame']
+        for i in range(len(archetype)):
+            anim = anims[i]
+            last = anim.img_duration * len(anim.images) - 1
+            frames[i] = (frames[i] + 1) % (last + 1) if anim.loop else min(frames[i] + 1, last)
+
+
+def update_lifetimes(world):
+    """Count lifetimes down; returns (archetype, rows) pairs of entities that ran out, to despawn after rendering."""
+    expired = []
+    for archetype in world.query('lifetime'):
+        life = archetype.columns['life']
+        rows = []
+        for i in range(len(archetype)):
+            life[i] -= 1
+            if life[i] <= 0:
+                rows.append(i)
+        if rows:
+            expired.append((archetype, rows))
+    return expired
+
+
+def render_animations(world, surf, offset=(0, 0)):
+    """Blit the current animation frame of every animated entity, centered on its position, in one batch per archetype."""
+    for archetype in world.query('position', 'animation'):
+        columns = archetype.columns
+        blits = []
+        for x, y, anim, frame in zip(columns['x'], columns['y'], columns['anim'], columns['frame']):
+            img = anim.images[frame // anim.img_duration]
+            blits.append((img, (x - offset[0] - img.get_width() // 2, y - offset[1] - img.get_height() // 2)))
+        surf.blits(blits, doreturn=False)
@@ -0,0 +1,77 @@
+import math
+
+import pygame
+
+NO_COLLISIONS = {'up': False, 'down': False, 'right': False, 'left': False}
+
+class PhysicsEntity:
+    __slots__ = ('game', 'type', 'pos', 'size', 'velocity', 'collisions', 'action', 'anim_offset', 'flip', 'manual_flip', 'animation', 'last_movement') #fixed attributes, no per-instance __dict__
+
+    def __init__(self, game, e_type, pos, size, anim_offset=(0, 0)):
+        self.game = game
+        self.type = e_type
+        self.pos = list(pos)
+        self.size = size
+        self.velocity = [0, 0]
+        self.collisions = {'up': False, 'down': False, 'right': False, 'left': False} #collision states - remember if we are colliding in any direction
+    
+        self.action = ''
+        self.anim_offset = anim_offset #offset to center the animation properly / hitbox vs sprite size
+        self.flip = False #for horizontal flipping of sprite based on movement direction
+        self.manual_flip = False #if True, skip auto-flip logic (for enemies with custom flip control)
+        self.set_action ('idle')
+
+        self.last_movement = [0, 0] #store last movement for wall jump direction detection
+
+    def rect(self): #return the rectangle representing the entity's position and size
+        return pygame.Rect(self.pos[0], self.pos[1], self.size[0], self.size[1])
+    
+    def set_action(self, action): #change animation based on action
+        if self.action != action:
+            self.action = action
+            self.animation = self.game.assets[self.type + '/' + action].copy()
+        
+    def sweep(self, tilemap, axis, amount):
+        """Move along one axis (0 = x, 1 = y); returns True when a physics tile stopped the movement."""
+        self.pos[axis], hit = tilemap.sweep_rect(self.pos, self.size, axis, amount)
+        return hit
+
+    def update(self, tilemap, movement=(0, 0)): #movement is a tuple (horizontal_movement, vertical_movement)
+        self.collisions.update(NO_COLLISIONS) # reset in place instead of allocating a new dict every frame
+        
+        move_x = movement[0] * 1.3 + self.velocity[0] # Apply velocity to movement
+        move_y = movement[1] * 1.3 + self.velocity[1]
+        
+        # Sweep each axis separately; when both axes move more than half a tile in one frame,
+        # split the move into substeps so corners are not cut diagonally
+        half_tile = tilemap.tile_size / 2
+        steps = 1
+        if abs(move_x) > half_tile and abs(move_y) > half_tile:
+            steps = math.ceil(max(abs(move_x), abs(move_y)) / half_tile)
+            move_x /= steps
+            move_y /= steps
+        for i in range(steps):
+            if move_x and not (self.collisions['right'] or self.collisions['left']):
+                if self.sweep(tilemap, 0, move_x):
+                    self.collisions['right' if move_x > 0 else 'left'] = True
+            if move_y and not (self.collisions['down'] or self.collisions['up']):
+                if self.sweep(tilemap, 1, move_y):
+                    self.collisions['down' if move_y > 0 else 'up'] = True
+
+        if not self.manual_flip:
+            if movement[0] > 0:
+                self.flip = False
+            if movement[0] < 0:
+                self.flip = True
+
+        self.last_movement = movement #store last movement for wall jump direction detection
+        
+        self.velocity[1] = min(5, self.velocity[1] + 0.1) # Gravity, limit falling speed (it chooses the smaller value between 5 and current velocity + 0.1)
+        
+        if self.collisions['down'] or self.collisions['up']: # Stop vertical velocity on collision
+            self.velocity[1] = 0
+
+        self.animation.update() #update animation frame
+
+    def render(self, surf, offset=(0, 0)):
+        surf.blit(pygame.transform.flip(self.animation.img(), self.flip, False), (self.pos[0] - offset[0] + self.anim_offset[0], self.pos[1] - offset[1] + self.anim_offset[1])) #draw current animation frame with offset and flipping (x and y)
@@ -0,0 +1,264 @@
+"""Gym-style environments over a game's headless Simulation, for training agents.
+
+    env = GameEnv('Ninja_game', levels=("maps/0.json",))
+    obs, info = env.reset(seed=1)
+    obs, reward, terminated, truncated, info = env.step(action)  # action: index into env.actions
+
+The API follows gymnasium's (reset() returns (obs, info), step() returns a 5-tuple) but
+does not need it installed; observations are dicts of NumPy arrays:
+
+    tiles     uint8 (2r+1, 2r+1)  1 where a physics tile is, player's tile in the middle
+    player    float32 (7,)        x, y, vx, vy, jumps, wall slide, dash counter / 60
+    enemies   float32 (n, 5)      dx, dy, vx, vy, 1 for the nearest n enemies, zero rows after
+    goals     float32 (n, 3)      dx, dy, 1 for the nearest goals left (enemies, power-ups)
+    hazards   float32 (n, 5)      dx, dy, vx, vy, 1 for the nearest projectiles
+
+Positions of other things are relative to the player, velocities are per frame and
+include walking. Nothing is drawn. VectorEnv steps several environments in lockstep in
+one process, SubprocVectorEnv spreads them over worker processes; both return the same
+arrays with a leading environment axis and reset an environment when its episode ends.
+
+Both games name their package "scripts", so a process holds environments of one game.
+"""
+import multiprocessing
+import os
+import random
+import sys
+
+import numpy as np
+
+from engine.simulation import ACTIONS
+
+FRAME_SKIP = 4  # frames per step; jump and dash are pressed on the first one
+VIEW_RADIUS = 8  # tiles around the player in the tiles observation
+MAX_ENEMIES = 8
+MAX_GOALS = 4
+MAX_HAZARDS = 8
+MAX_FRAMES = 60 * 60  # an episode is truncated after this many frames
+GOAL_REWARD = 1.0
+FAIL_REWARD = -1.0
+FRAME_REWARD = -0.001  # per frame, so faster is better
+
+
+def simulation_class(game_dir):
+    """The Simulation of a game folder, imported from its scripts package."""
+    game_dir = os.path.abspath(game_dir)
+    if game_dir not in sys.path:
+        sys.path.insert(0, game_dir)
+    from scripts.simulation import Simulation
+    module_dir = os.path.dirname(os.path.dirname(os.path.abspath(sys.modules[Simulation.__module__].__file__)))
+    if module_dir != game_dir:
+        raise ValueError(f"this process already runs {module_dir}, it cannot also load {game_dir}")
+    return Simulation
+
+
+def nearest(rows, count, width):
+    """rows (lists, closest first after sorting on the squared distance in column 0) as a (count, width) array."""
+    rows.sort()
+    out = np.zeros((count, width), dtype=np.float32)
+    for i, row in enumerate(rows[:count]):
+        out[i] = row[1:]
+    return out
+
+
+class GameEnv:
+    def __init__(self, game_dir, levels=("maps/0.json",), frame_skip=FRAME_SKIP, view_radius=VIEW_RADIUS, max_frames=MAX_FRAMES, seed=0):
+        self.sim = simulation_class(game_dir)(seed)
+        self.actions = self.sim.actions  # step() takes an index into this
+        self.levels = list(levels)
+        self.frame_skip = frame_skip
+        self.view_radius = view_radius
+        self.max_frames = max_frames
+        self.seed = seed
+        self.episode = 0
+        self.solid = None  # physics tiles of the level, padded by the view radius
+        self.origin = (0, 0)  # tile in solid[0, 0]
+        self.random_state = None  # the random module is shared with other environments in the process
+
+    def reset(self, seed=None, level=None):
+        if seed is not None:
+            self.seed = seed
+            self.episode = 0
+        self.sim.seed = self.seed + self.episode
+        name = level or self.levels[self.episode % len(self.levels)]
+        self.episode += 1
+        self.sim.load_level(name)
+        self.random_state = random.getstate()
+
+        tilemap = self.sim.tilemap
+        cells = [tuple(tile['pos']) for tile in tilemap.tilemap.values() if tile['type'] in tilemap.physics_tiles] or [(0, 0)]
+        r = self.view_radius
+        x0 = min(x for x, y in cells) - r
+        y0 = min(y for x, y in cells) - r
+        self.origin = (x0, y0)
+        self.solid = np.zeros((max(y for x, y in cells) - y0 + r + 1, max(x for x, y in cells) - x0 + r + 1), dtype=np.uint8)
+        for x, y in cells:
+            self.solid[y - y0, x - x0] = 1
+        return self.observe(), {"level": name, "goals": self.sim.goal_count}
+
+    def step(self, action):
+        sim = self.sim
+        goals = len(sim.goals())
+        frame = sim.frame
+        random.setstate(self.random_state)
+        sim.play(self.actions[action], self.frame_skip)
+        self.random_state = random.getstate()
+
+        done_goals = goals - len(sim.goals())
+        terminated = sim.completed or sim.failed
+        truncated = not terminated and sim.frame >= self.max_frames
+        reward = done_goals * GOAL_REWARD + (sim.frame - frame) * FRAME_REWARD
+        if sim.failed:
+            reward += FAIL_REWARD
+        info = {"frame": sim.frame, "goals_done": sim.goal_count - len(sim.goals()), "completed": sim.completed}
+        return self.observe(), reward, terminated, truncated, info
+
+    def local_tiles(self, cell):
+        r = self.view_radius
+        x = cell[0] - self.origin[0]
+        y = cell[1] - self.origin[1]
+        height, width = self.solid.shape
+        if r <= x < width - r and r <= y < height - r:
+            return self.solid[y - r:y + r + 1, x - r:x + r + 1].copy()
+        tiles = np.zeros((2 * r + 1, 2 * r + 1), dtype=np.uint8) # partly outside the map (falling off it)
+        top, left = max(0, y - r), max(0, x - r)
+        bottom, right = min(height, y + r + 1), min(width, x + r + 1)
+        if top < bottom and left < right:
+            tiles[top - y + r:bottom - y + r, left - x + r:right - x + r] = self.solid[top:bottom, left:right]
+        return tiles
+
+    def observe(self):
+        sim = self.sim
+        player = sim.player
+        cx, cy = player.rect().center
+        size = sim.tilemap.tile_size
+        enemies = []
+        for enemy in sim.enemies:
+            ex, ey = enemy.rect().center
+            dx, dy = ex - cx, ey - cy
+            enemies.append([dx * dx + dy * dy, dx, dy, enemy.velocity[0] + enemy.last_movement[0] * 1.3, enemy.velocity[1] + enemy.last_movement[1] * 1.3, 1])
+        goals = []
+        for key, (gx, gy) in sim.goals():
+            dx, dy = gx - cx, gy - cy
+            goals.append([dx * dx + dy * dy, dx, dy, 1])
+        hazards = []
+        for (hx, hy), (vx, vy) in sim.hazards():
+            dx, dy = hx - cx, hy - cy
+            hazards.append([dx * dx + dy * dy, dx, dy, vx, vy, 1])
+        return {
+            "tiles": self.local_tiles((int(cx // size), int(cy // size))),
+            "player": np.array([player.pos[0], player.pos[1], player.velocity[0] + player.last_movement[0] * 1.3, player.velocity[1] + player.last_movement[1] * 1.3,
+                                player.jumps, player.wall_slide, player.dashing / 60], dtype=np.float32),
+            "enemies": nearest(enemies, MAX_ENEMIES, 5),
+            "goals": nearest(goals, MAX_GOALS, 3),
+            "hazards": nearest(hazards, MAX_HAZARDS, 5),
+        }
+
+
+def stack(observations):
+    return {key: np.stack([obs[key] for obs in observations]) for key in observations[0]}
+
+
+class VectorEnv:
+    """count GameEnvs stepped in lockstep in this process; environment i is seeded with seed + i.
+
+    An environment whose episode ended is reset right away: its row then holds the first
+    observation of the next episode and its info the last one under "final_observation".
+    """
+
+    def __init__(self, game_dir, count, seed=0, **options):
+        self.envs = [GameEnv(game_dir, seed=seed + i, **options) for i in range(count)]
+        self.actions = self.envs[0].actions
+
+    def __len__(self):
+        return len(self.envs)
+
+    def reset(self, seed=None):
+        results = [env.reset(None if seed is None else seed + i) for i, env in enumerate(self.envs)]
+        return stack([obs for obs, info in results]), [info for obs, info in results]
+
+    def step(self, actions):
+        observations, rewards, terminated, truncated, infos = [], [], [], [], []
+        for env, action in zip(self.envs, actions):
+            obs, reward, term, trunc, info = env.step(int(action))
+            if term or trunc:
+                info["final_observation"] = obs
+                obs, reset_info = env.reset()
+                info["level"] = reset_info["level"]
+            observations.append(obs)
+            rewards.append(reward)
+            terminated.append(term)
+            truncated.append(trunc)
+            infos.append(info)
+        return stack(observations), np.array(rewards, dtype=np.float32), np.array(terminated), np.array(truncated), infos
+
+    def close(self):
+        pass
+
+
+def worker(connection, game_dir, count, seed, options):
+    envs = VectorEnv(game_dir, count, seed, **options)
+    while True:
+        command, data = connection.recv()
+        if command == "reset":
+            connection.send(envs.reset(data))
+        elif command == "step":
+            connection.send(envs.step(data))
+        else:
+            connection.close()
+            return
+
+
+class SubprocVectorEnv:
+    """VectorEnv spread over worker processes (default: one per CPU), each stepping its share of the environments."""
+
+    def __init__(self, game_dir, count, workers=None, seed=0, **options):
+        workers = max(1, min(count, workers or os.cpu_count() or 1))
+        context = multiprocessing.get_context("spawn") # a fresh interpreter, not a fork of one that may have pygame set up
+        self.counts = [count // workers + (i < count % workers) for i in range(workers)]
+        self.connections = []
+        self.processes = []
+        first = seed
+        for share in self.counts:
+            parent, child = context.Pipe()
+            process = context.Process(target=worker, args=(child, os.path.abspath(game_dir), share, first, options), daemon=True)
+            process.start()
+            child.close()
+            self.connections.append(parent)
+            self.processes.append(process)
+            first += share
+        self.actions = ACTIONS
+
+    def __len__(self):
+        return sum(self.counts)
+
+    def reset(self, seed=None):
+        first = seed
+        for connection, share in zip(self.connections, self.counts):
+            connection.send(("reset", first))
+            if first is not None:
+                first += share
+        results = [connection.recv() for connection in self.connections]
+        return self._concatenate([obs for obs, infos in results]), [info for obs, infos in results for info in infos]
+
+    def step(self, actions):
+        start = 0
+        for connection, share in zip(self.connections, self.counts):
+            connection.send(("step", list(actions[start:start + share])))
+            start += share
+        results = [connection.recv() for connection in self.connections]
+        return (self._concatenate([result[0] for result in results]),
+                np.concatenate([result[1] for result in results]),
+                np.concatenate([result[2] for result in results]),
+                np.concatenate([result[3] for result in results]),
+                [info for result in results for info in result[4]])
+
+    def _concatenate(self, observations):
+        return {key: np.concatenate([obs[key] for obs in observations]) for key in observations[0]}
+
+    def close(self):
+        for connection in self.connections:
+            connection.send(("close", None))
+            connection.close()
+        for process in self.processes:
+            process.join()
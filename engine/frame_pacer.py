@@ -0,0 +1,82 @@
+"""Frame pacing for the game loops, with an input-to-photon latency estimate and a profiler overlay.
+
+By default a game reads its input after updating and drawing the frame, so a press
+shows up one frame later, and Clock.tick() sleeps with the OS scheduler's precision.
+In low latency mode the game reads input right before the update and draws its effect
+in the same tick, and the frame is timed with Clock.tick_busy_loop(), which sleeps
+most of the wait and spins the rest to hit the deadline (at the cost of some CPU).
+The games switch between the two with a key (the "low_latency" action).
+
+Latency is measured for every tick with a press, from when the press arrived to when
+the frame showing it was handed to the display. Events carry no timestamp, so a press
+is taken to arrive halfway between the poll that read it and the poll before.
+"""
+import time
+from collections import deque
+
+import pygame
+
+from engine.text_cache import TextCache
+
+SAMPLES = 120  # frames and presses the overlay averages over
+
+
+class FramePacer:
+    def __init__(self, fps=60, low_latency=False):
+        self.clock = pygame.time.Clock()
+        self.fps = fps
+        self.low_latency = low_latency
+        self.frame = 0  # frames presented
+        self.poll_time = None  # (frame, time) of the last poll
+        self.pending = []  # (arrival estimate, frame that shows it) of presses not on screen yet
+        self.latencies = deque(maxlen=SAMPLES)  # seconds
+        self.frame_times = deque(maxlen=SAMPLES)  # ms
+        self.text_cache = TextCache()
+
+    def polled(self, inputs):
+        """Call right after taking the InputSnapshot of the tick."""
+        now = time.perf_counter()
+        if inputs.pressed and self.poll_time and self.poll_time[0] == self.frame - 1: # no estimate after frames without polling (menus)
+            shown = self.frame if self.low_latency else self.frame + 1 # read after the update: drawn next frame
+            self.pending.append(((self.poll_time[1] + now) / 2, shown))
+        self.poll_time = (self.frame, now)
+
+    def presented(self):
+        """Call once the frame is handed to the display."""
+        if self.pending:
+            now = time.perf_counter()
+            self.latencies.extend(now - arrival for arrival, shown in self.pending if shown <= self.frame)
+            self.pending = [press for press in self.pending if press[1] > self.frame]
+        self.frame += 1
+
+    def toggle(self):
+        """Switch between the default and the low latency loop; takes effect from the next poll."""
+        self.low_latency = not self.low_latency
+
+    def tick(self):
+        """Wait for the next frame; returns the ms since the last tick."""
+        if self.low_latency:
+            ms = self.clock.tick_busy_loop(self.fps)
+        else:
+            ms = self.clock.tick(self.fps)
+        self.frame_times.append(ms)
+        return ms
+
+    def render(self, surf, font, pos=(4, 4), color=(255, 255, 255)):
+        """Profiler overlay: frame time and input latency, averages and worst of the last SAMPLES.
+
+        The numbers change every frame, so lines are drawn from cached outlined glyphs.
+        """
+        lines = ["low latency" if self.low_latency else "default loop"]
+        if self.frame_times:
+            average = sum(self.frame_times) / len(self.frame_times)
+            lines.append(f"frame {average:.1f} ms  max {max(self.frame_times)}  {self.clock.get_fps():.0f} fps")
+        if self.latencies:
+            average = sum(self.latencies) / len(self.latencies) * 1000
+            lines.append(f"input {average:.1f} ms  max {max(self.latencies) * 1000:.1f}")
+        else:
+            lines.append("input - (press a key)")
+        x, y = pos
+        for line in lines:
+            self.text_cache.render_glyphs(surf, font, line, (x, y), color)
+            y += font.get_linesize()
@@ -0,0 +1,143 @@
+from contextlib import contextmanager
+
+MAX_ENTRIES = 200  # undo steps kept
+MAX_CELLS = 100000  # cell changes kept over all steps; the oldest steps are dropped first
+
+
+class EditHistory:
+    """Undo/redo for a Tilemap as a log of per-cell diffs.
+
+    The history listens to Tilemap.write_cell / add_offgrid / remove_offgrid, so it only
+    stores the cells that actually changed, never a copy of the map. Everything changed
+    between begin() and end() (one mouse drag, one auto_tile) becomes a single step, and
+    a cell painted several times in one step keeps only its first and last state.
+    """
+
+    def __init__(self, tilemap, max_entries=MAX_ENTRIES, max_cells=MAX_CELLS):
+        self.tilemap = tilemap
+        self.max_entries = max_entries
+        self.max_cells = max_cells
+        self.undo_stack = []
+        self.redo_stack = []
+        self.cells = 0  # cell changes held by undo_stack
+        self.current = None  # step being recorded
+        self.depth = 0  # nested begin() calls
+        self.applying = False  # undo/redo writes must not be recorded again
+        tilemap.listeners.append(self)
+
+    def begin(self):
+        if not self.depth:
+            self.current = Step()
+        self.depth += 1
+
+    def end(self):
+        self.depth = max(0, self.depth - 1)
+        if self.depth or self.current is None:
+            return
+        step, self.current = self.current, None
+        if not step.size():
+            return
+        self.undo_stack.append(step)
+        self.cells += step.size()
+        self.redo_stack = []
+        while len(self.undo_stack) > 1 and (len(self.undo_stack) > self.max_entries or self.cells > self.max_cells):
+            self.cells -= self.undo_stack.pop(0).size()
+
+    def close(self):
+        """End every open begin(), e.g. when the button-up that ends a drag never arrived."""
+        if self.depth:
+            self.depth = 1
+            self.end()
+
+    @contextmanager
+    def group(self):
+        self.begin()
+        try:
+            yield
+        finally:
+            self.end()
+
+    def clear(self):
+        self.undo_stack = []
+        self.redo_stack = []
+        self.cells = 0
+        self.current = None
+        self.depth = 0
+
+    # Tilemap listener interface
+
+    def map_loaded(self):
+        self.clear()
+
+    def cell_changed(self, loc, old, new):
+        if self.applying:
+            return
+        if self.current is None:
+            with self.group():  # a change outside begin()/end() is a step on its own
+                self.current.cell(loc, old, new)
+        else:
+            self.current.cell(loc, old, new)
+
+    def offgrid_changed(self, tile, index, added):
+        if self.applying:
+            return
+        if self.current is None:
+            with self.group():
+                self.current.offgrid.append((tile, index, added))
+        else:
+            self.current.offgrid.append((tile, index, added))
+
+    # Undo / redo
+
+    def undo(self):
+        self.close()  # a half-built step is finished first, so it can be undone whole
+        if not self.undo_stack:
+            return False
+        step = self.undo_stack.pop()
+        self.cells -= step.size()
+        self._apply(step, undo=True)
+        self.redo_stack.append(step)
+        return True
+
+    def redo(self):
+        self.close()
+        if not self.redo_stack:
+            return False
+        step = self.redo_stack.pop()
+        self._apply(step, undo=False)
+        self.undo_stack.append(step)
+        self.cells += step.size()
+        return True
+
+    def _apply(self, step, undo):
+        self.applying = True
+        try:
+            for loc, (old, new) in step.cells.items():
+                self.tilemap.write_cell(loc, old if undo else new)
+            offgrid = reversed(step.offgrid) if undo else step.offgrid
+            for tile, index, added in offgrid:
+                if added != undo:
+                    self.tilemap.add_offgrid(tile, index)
+                else:
+                    self.tilemap.remove_offgrid(tile)
+        finally:
+            self.applying = False
+
+
+class Step:
+    __slots__ = ('cells', 'offgrid')
+
+    def __init__(self):
+        self.cells = {}  # loc -> (tile before the step, tile after it); None = empty cell
+        self.offgrid = []  # (tile, list index, added) in the order they happened
+
+    def cell(self, loc, old, new):
+        if loc in self.cells:
+            old = self.cells[loc][0]
+        if old == new:
+            self.cells.pop(loc, None)  # painted back to how it was
+        else:
+            self.cells[loc] = (old, new)
+
+    def size(self):
+        return len(self.cells) + len(self.offgrid)
@@ -0,0 +1,138 @@
+"""Named input actions: raw key events go through a rebindable table, gameplay reads one snapshot per tick.
+
+A binding table maps action names to key names as pygame.key.name() spells them,
+optionally with modifiers: {"jump": ["w", "up"], "redo": ["ctrl+shift+z", "ctrl+y"]}.
+Keys with modifiers only trigger with those held; the binding with the most modifiers
+wins, so ctrl+shift+z is redo and not also undo.
+
+Every tick the game feeds its events to InputMap.handle() and takes snapshot(): an
+immutable InputSnapshot of the actions held and the actions pressed since the last
+tick. The same snapshots drive the headless Simulation, so bots, replays and network
+input only have to produce snapshots; encode() / decode() turn one into a small int.
+"""
+from collections import namedtuple
+
+import pygame
+
+MODIFIERS = {"ctrl": pygame.KMOD_CTRL, "shift": pygame.KMOD_SHIFT, "alt": pygame.KMOD_ALT}
+
+
+class InputSnapshot(namedtuple('InputSnapshot', ('held', 'pressed'))):
+    """Input of one tick: frozensets of the action names held down and pressed since the last tick.
+
+    A press shows up in pressed even when the key was released again within the tick.
+    """
+
+    __slots__ = ()
+
+    @property
+    def move(self):
+        """-1, 0 or 1 on the x axis from the "left" and "right" actions."""
+        return ('right' in self.held) - ('left' in self.held)
+
+    @property
+    def move_y(self):
+        return ('down' in self.held) - ('up' in self.held)
+
+    def held_only(self):
+        """The same held actions with no presses, i.e. the next tick when nothing changes."""
+        return InputSnapshot(self.held, frozenset())
+
+
+NO_INPUT = InputSnapshot(frozenset(), frozenset())
+
+
+def parse_binding(name):
+    """"ctrl+shift+z" -> (key code, modifier masks); "+" and "ctrl++" bind the plus key."""
+    mods, _, key = name[:-1].rpartition('+') # the last character always belongs to the key
+    key += name[-1]
+    return pygame.key.key_code(key), tuple(MODIFIERS[mod] for mod in mods.split('+') if mod)
+
+
+class InputMap:
+    """Turns key events into per-tick InputSnapshots through a binding table.
+
+    buffer maps action names to a number of ticks a press is kept in snapshots until
+    consume() is called, so e.g. a jump pressed just before landing is not lost.
+    With record set to a list, every snapshot is appended to it encoded.
+    """
+
+    def __init__(self, bindings, buffer=None):
+        self.actions = tuple(sorted(bindings)) # bit order of encode()
+        self.buffer = dict(buffer or {})
+        self.bindings = {}
+        self.down = {}  # key code -> action it pressed
+        self.pressed = set()
+        self.buffered = {}  # action -> ticks left
+        self.record = None
+        for action, keys in bindings.items():
+            self.rebind(action, keys)
+
+    def rebind(self, action, keys):
+        """Replace the keys of action with keys (names, see parse_binding)."""
+        for key, entries in list(self.bindings.items()):
+            self.bindings[key] = [entry for entry in entries if entry[1] != action]
+        for name in keys:
+            key, mods = parse_binding(name)
+            entries = self.bindings.setdefault(key, [])
+            entries.append((mods, action))
+            entries.sort(key=lambda entry: -len(entry[0])) # most modifiers first
+        if action not in self.actions:
+            self.actions = tuple(sorted(self.actions + (action,)))
+
+    def handle(self, event):
+        """Feed one event; returns True when it was a key bound to an action."""
+        if event.type == pygame.KEYDOWN:
+            for mods, action in self.bindings.get(event.key, ()):
+                if all(event.mod & mod for mod in mods):
+                    self.down[event.key] = action
+                    self.pressed.add(action)
+                    return True
+        elif event.type == pygame.KEYUP:
+            return self.down.pop(event.key, None) is not None
+        return False
+
+    def is_held(self, action):
+        """Whether action is held right now, for code that runs between snapshots (mouse events)."""
+        return action in self.down.values()
+
+    def snapshot(self):
+        """The input of this tick; presses are only reported once (or until consumed when buffered)."""
+        for action in self.pressed:
+            if action in self.buffer:
+                self.buffered[action] = self.buffer[action]
+        pressed = frozenset(self.pressed) | frozenset(self.buffered)
+        for action in list(self.buffered):
+            self.buffered[action] -= 1
+            if self.buffered[action] <= 0:
+                del self.buffered[action]
+        self.pressed = set()
+        snapshot = InputSnapshot(frozenset(self.down.values()), pressed)
+        if self.record is not None:
+            self.record.append(self.encode(snapshot))
+        return snapshot
+
+    def consume(self, action):
+        """A buffered press was acted on; do not report it again."""
+        self.buffered.pop(action, None)
+
+    def clear(self):
+        """Forget held keys and presses, e.g. after events went elsewhere (a menu)."""
+        self.down = {}
+        self.pressed = set()
+        self.buffered = {}
+
+    def encode(self, snapshot):
+        """Snapshot as an int: held actions in the low bits, pressed ones above them."""
+        value = 0
+        for i, action in enumerate(self.actions):
+            if action in snapshot.held:
+                value |= 1 << i
+            if action in snapshot.pressed:
+                value |= 1 << (i + len(self.actions))
+        return value
+
+    def decode(self, value):
+        count = len(self.actions)
+        return InputSnapshot(frozenset(action for i, action in enumerate(self.actions) if value >> i & 1),
+                             frozenset(action for i, action in enumerate(self.actions) if value >> (i + count) & 1))
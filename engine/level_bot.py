@@ -0,0 +1,223 @@
+"""Level-completion bot: plays every shipped map headless and reports a winning route.
+
+    python -m engine.level_bot                  # Ninja_game and Corebound
+    python -m engine.level_bot Ninja_game --beam 32 --json
+
+Each level runs in a worker process (one pool per game, as in engine.validate_maps).
+The search is a beam search over held inputs: every HOLD_FRAMES frames each state of
+the beam is continued with every action of the game's Simulation, states already seen
+(Simulation.state_key()) are dropped, and the best --beam states are kept, scored by
+goals done (enemies killed, power-ups collected) and then by the tile distance to the
+nearest goal left. A route that is found is replayed from a fresh load before it is
+reported, so it completes the level frame for frame. Exits with 1 when any level is not
+completed, which makes it a regression test for physics and level changes.
+"""
+import argparse
+import heapq
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from engine.validate_maps import ROOT, GAMES, map_files
+
+BEAM_WIDTH = 16  # states kept per step
+HOLD_FRAMES = 6  # frames an action is held; jump and dash are pressed on the first one
+MAX_SECONDS = 120  # game time before a level counts as not completable
+TIME_LIMIT = 240  # seconds of search per level
+FIELD_MARGIN = 4  # tiles around the map the distance field spreads into
+GOAL_SCORE = 10000  # a goal done outweighs any distance
+
+
+def init_worker(game_dir):
+    os.environ['PYGAME_HIDE_SUPPORT_PROMPT'] = '1'
+    sys.path.insert(0, ROOT)
+    sys.path.insert(0, game_dir)  # the game's scripts package holds its Simulation
+
+
+class DistanceField:
+    """Walking distance in tiles through non-solid cells, one breadth-first field per goal cell, cached."""
+
+    def __init__(self, tilemap):
+        self.tile_size = tilemap.tile_size
+        self.solid = {tuple(tile['pos']) for tile in tilemap.tilemap.values() if tile['type'] in tilemap.physics_tiles}
+        xs = [tile['pos'][0] for tile in tilemap.tilemap.values()] or [0]
+        ys = [tile['pos'][1] for tile in tilemap.tilemap.values()] or [0]
+        self.bounds = (min(xs) - FIELD_MARGIN, min(ys) - FIELD_MARGIN, max(xs) + FIELD_MARGIN, max(ys) + FIELD_MARGIN)
+        self.fields = {}
+
+    def cell(self, pos):
+        return (int(pos[0] // self.tile_size), int(pos[1] // self.tile_size))
+
+    def field(self, goal):
+        field = self.fields.get(goal)
+        if field is None:
+            x0, y0, x1, y1 = self.bounds
+            field = self.fields[goal] = {goal: 0}
+            queue = deque([goal])
+            while queue:
+                x, y = queue.popleft()
+                for cell in ((x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)):
+                    if x0 <= cell[0] <= x1 and y0 <= cell[1] <= y1 and cell not in field and cell not in self.solid:
+                        field[cell] = field[(x, y)] + 1
+                        queue.append(cell)
+        return field
+
+    def distance(self, pos, goal_pos):
+        return self.field(self.cell(goal_pos)).get(self.cell(pos), (self.bounds[2] - self.bounds[0]) + (self.bounds[3] - self.bounds[1]))
+
+
+def score(sim, distances):
+    goals = sim.goals()
+    nearest = min((distances.distance(sim.player.rect().center, pos) for key, pos in goals), default=0)
+    return (sim.goal_count - len(goals)) * GOAL_SCORE - nearest
+
+
+def search(sim, beam_width=BEAM_WIDTH, hold=HOLD_FRAMES, max_frames=MAX_SECONDS * 60, time_limit=TIME_LIMIT):
+    """Beam search from the loaded level; returns (actions or None, stats dict)."""
+    distances = DistanceField(sim.tilemap)
+    deadline = time.perf_counter() + time_limit
+    seen = {sim.state_key()}
+    beam = [(score(sim, distances), None, sim.snapshot())]  # (score, route as (action, parent) links, snapshot)
+    best = 0
+    expanded = 0
+    result = None
+    while beam and result is None and time.perf_counter() < deadline:
+        candidates = []
+        for value, route, snapshot in beam:
+            for action in sim.actions:
+                sim.restore(snapshot)
+                sim.play(action, hold)
+                expanded += 1
+                if sim.completed:
+                    result = (action, route)
+                    break
+                if sim.failed or sim.frame >= max_frames:
+                    continue
+                key = sim.state_key()
+                if key in seen:
+                    continue
+                seen.add(key)
+                candidates.append((score(sim, distances), (action, route), sim.snapshot()))
+            if result is not None:
+                break
+        beam = heapq.nlargest(beam_width, candidates, key=lambda candidate: candidate[0])
+        if beam:
+            best = max(best, -(-beam[0][0] // GOAL_SCORE)) # goals done by the best state
+    stats = {"expanded": expanded, "states": len(seen), "goals_done": sim.goal_count if result else best}
+    if result is None:
+        return None, stats
+    actions = []
+    while result is not None:
+        action, result = result
+        actions.append(action)
+    actions.reverse()
+    return actions, stats
+
+
+def route_runs(actions, hold):
+    """The route as [token, frames] runs, e.g. ["RJ", 6] for right with a jump pressed, ["R", 30] for right held."""
+    runs = []
+    for inputs in actions:
+        token = {-1: 'L', 0: '.', 1: 'R'}[inputs.move] + ('J' if 'jump' in inputs.pressed else '') + ('D' if 'dash' in inputs.pressed else '')
+        if runs and runs[-1][0] == token and len(token) == 1:
+            runs[-1][1] += hold
+        else:
+            runs.append([token, hold])
+    return runs
+
+
+def solve_level(game_dir, name, beam_width=BEAM_WIDTH, hold=HOLD_FRAMES, max_seconds=MAX_SECONDS, time_limit=TIME_LIMIT):
+    """Report (a plain dict) for one level; runs in a worker set up by init_worker."""
+    from scripts.simulation import Simulation
+
+    report = {"map": os.path.relpath(os.path.join(game_dir, 'data', name), ROOT), "completed": False}
+    sim = Simulation()
+    try:
+        sim.load_level(name)
+    except (OSError, ValueError, KeyError) as e:
+        report["error"] = f"does not load: {e}"
+        return report
+    report["goals"] = sim.goal_count
+    if not sim.goal_count:
+        report["error"] = "nothing to complete"
+        return report
+    start = time.perf_counter()
+    actions, stats = search(sim, beam_width, hold, max_seconds * 60, time_limit)
+    report["search_seconds"] = round(time.perf_counter() - start, 1)
+    report.update(stats)
+    if actions is None:
+        return report
+
+    sim.load_level(name) # replay from scratch: the route has to work without any snapshot
+    frames = []
+    for action in actions:
+        frames += [action] + [action.held_only()] * (hold - 1)
+    sim.run(frames)
+    report["completed"] = sim.completed
+    report["frames"] = sim.frame
+    report["seconds"] = round(sim.frame / 60, 2)
+    report["route"] = route_runs(actions, hold)
+    if not sim.completed:
+        report["error"] = "the route found does not complete the level when replayed"
+    return report
+
+
+def solve_games(game_dirs, jobs=None, **options):
+    """Reports for every map of the given game folders, in map order."""
+    executors = []
+    futures = []
+    try:
+        for game_dir in game_dirs:
+            game_dir = os.path.abspath(game_dir)
+            executor = ProcessPoolExecutor(max_workers=jobs, initializer=init_worker, initargs=(game_dir,))  # one pool per game, both have a scripts package
+            executors.append(executor)
+            data_dir = os.path.join(game_dir, 'data')
+            for path in map_files(game_dir):
+                name = os.path.relpath(path, data_dir).replace(os.sep, '/')
+                futures.append(executor.submit(solve_level, game_dir, name, **options))
+        return [future.result() for future in futures]
+    finally:
+        for executor in executors:
+            executor.shutdown()
+
+
+def format_report(report):
+    if report["completed"]:
+        line = f"{report['map']}: completed in {report['seconds']} s ({report['frames']} frames)"
+    elif "error" in report:
+        return f"{report['map']}: {report['error']}"
+    else:
+        line = f"{report['map']}: NOT completed, {report['goals_done']} of {report['goals']} goals"
+    line += f", searched {report['states']} states in {report['search_seconds']} s"
+    if report["completed"]:
+        line += "\n  route: " + ' '.join(f"{token}{frames}" for token, frames in report["route"])
+    return line
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Play every map with a search bot and report whether it can be completed.")
+    parser.add_argument('games', nargs='*', help="game folders (default: %s)" % ', '.join(GAMES))
+    parser.add_argument('--jobs', type=int, help="worker processes per game (default: one per CPU)")
+    parser.add_argument('--beam', type=int, default=BEAM_WIDTH, help="states kept per search step")
+    parser.add_argument('--hold', type=int, default=HOLD_FRAMES, help="frames each action is held")
+    parser.add_argument('--max-seconds', type=int, default=MAX_SECONDS, help="game time allowed per level")
+    parser.add_argument('--time-limit', type=int, default=TIME_LIMIT, help="seconds of search per level")
+    parser.add_argument('--json', action='store_true', help="print the reports as JSON")
+    args = parser.parse_args()
+
+    games = args.games or [os.path.join(ROOT, game) for game in GAMES]
+    reports = solve_games(games, args.jobs, beam_width=args.beam, hold=args.hold, max_seconds=args.max_seconds, time_limit=args.time_limit)
+    if args.json:
+        print(json.dumps(reports, indent=2))
+    else:
+        print('\n'.join(format_report(report) for report in reports))
+        completed = sum(report["completed"] for report in reports)
+        print(f"\n{completed} of {len(reports)} levels completed")
+    sys.exit(0 if all(report["completed"] for report in reports) else 1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,197 @@
+"""Zoomed-out views of a Tilemap for the level editors.
+
+ChunkCache draws the map from downsampled images of 16x16-tile chunks, so a zoomed-out
+frame blits a few hundred chunk images instead of tens of thousands of tiles. MiniMap
+keeps a one-pixel-per-tile overview of the whole map. Both are Tilemap listeners: an
+edit only throws away the chunk image or redraws the minimap pixel it touched.
+"""
+import time
+
+import pygame
+
+CHUNK_SIZE = 16  # tiles per chunk side
+BUILD_BUDGET = 0.004  # seconds per frame spent drawing missing chunk images
+MINIMAP_BUDGET = 2000  # tiles per frame drawn into a minimap being rebuilt
+MINIMAP_MARGIN = 32  # tiles of room around the map before the minimap has to be rebuilt
+
+
+class ChunkCache:
+    def __init__(self, tilemap):
+        self.tilemap = tilemap
+        self.zoom = None
+        self.images = {}  # chunk -> image scaled to self.zoom, None for an empty chunk
+        tilemap.listeners.append(self)
+
+    # Tilemap listener interface
+
+    def map_loaded(self):
+        self.images = {}
+
+    def cell_changed(self, loc, old, new):
+        x, y = loc.split(';')
+        self.images.pop((int(x) // CHUNK_SIZE, int(y) // CHUNK_SIZE), None)
+
+    def offgrid_changed(self, tile, index, added):
+        span = CHUNK_SIZE * self.tilemap.tile_size
+        img = self.tilemap.game.assets[tile['type']][tile['variant']]
+        for cx in range(int(tile['pos'][0] // span), int((tile['pos'][0] + img.get_width()) // span) + 1):
+            for cy in range(int(tile['pos'][1] // span), int((tile['pos'][1] + img.get_height()) // span) + 1):
+                self.images.pop((cx, cy), None)
+
+    # Drawing
+
+    def render(self, surf, offset, zoom):
+        """Draw the map at zoom (< 1) with the top left corner at world pixel offset.
+
+        Missing chunk images are drawn for at most BUILD_BUDGET per frame; the rest show
+        up over the next frames instead of stalling the editor.
+        """
+        if zoom != self.zoom:
+            self.zoom = zoom
+            self.images = {}
+        span = CHUNK_SIZE * self.tilemap.tile_size
+        size = max(1, int(span * zoom))
+        deadline = time.perf_counter() + BUILD_BUDGET
+        for cx in range(int(offset[0] // span), int((offset[0] + surf.get_width() / zoom) // span) + 1):
+            for cy in range(int(offset[1] // span), int((offset[1] + surf.get_height() / zoom) // span) + 1):
+                if (cx, cy) not in self.images:
+                    if time.perf_counter() > deadline:
+                        continue
+                    self.images[(cx, cy)] = self.build((cx, cy), size)
+                image = self.images[(cx, cy)]
+                if image is not None:
+                    surf.blit(image, (cx * size - int(offset[0] * zoom), cy * size - int(offset[1] * zoom)))
+
+    def build(self, chunk, size):
+        tilemap = self.tilemap
+        assets = tilemap.game.assets
+        span = CHUNK_SIZE * tilemap.tile_size
+        origin = (chunk[0] * span, chunk[1] * span)
+        area = pygame.Rect(origin, (span, span))
+        image = pygame.Surface((span, span), pygame.SRCALPHA)
+        empty = True
+        for tile in tilemap.offgrid_tiles: # drawn first, like Tilemap.render
+            img = assets[tile['type']][tile['variant']]
+            if area.colliderect(pygame.Rect(tile['pos'], img.get_size())):
+                image.blit(img, (tile['pos'][0] - origin[0], tile['pos'][1] - origin[1]))
+                empty = False
+        for x in range(chunk[0] * CHUNK_SIZE, (chunk[0] + 1) * CHUNK_SIZE):
+            for y in range(chunk[1] * CHUNK_SIZE, (chunk[1] + 1) * CHUNK_SIZE):
+                tile = tilemap.tilemap.get(str(x) + ';' + str(y))
+                if tile is not None:
+                    image.blit(assets[tile['type']][tile['variant']], (x * tilemap.tile_size - origin[0], y * tilemap.tile_size - origin[1]))
+                    empty = False
+        if empty:
+            return None
+        return pygame.transform.smoothscale(image, (size, size))
+
+
+class MiniMap:
+    """One pixel per grid tile, coloured with the average colour of the tile image.
+
+    The overview is rebuilt MINIMAP_BUDGET tiles per frame (the old one stays on screen
+    until the new one is complete); after that every edit only sets its own pixel.
+    """
+
+    def __init__(self, tilemap):
+        self.tilemap = tilemap
+        self.colors = {}  # (type, variant) -> average colour of the tile image
+        self.surface = None
+        self.origin = (0, 0)  # tile drawn in the top left pixel of surface
+        self.building = None  # [surface, origin, locs left to draw] while rebuilding
+        self.stale = True
+        self.scaled = None  # surface scaled to the last render size
+        self.bounds = None  # (x0, y0, x1, y1) of the grid tiles, only ever grows until the next load
+        tilemap.listeners.append(self)
+        self.map_loaded()
+
+    # Tilemap listener interface
+
+    def map_loaded(self):
+        self.building = None
+        self.stale = True
+        self.bounds = None
+        if self.tilemap.tilemap: # one pass while loading, edits only extend the bounds afterwards
+            xs = [tile['pos'][0] for tile in self.tilemap.tilemap.values()]
+            ys = [tile['pos'][1] for tile in self.tilemap.tilemap.values()]
+            self.bounds = (min(xs), min(ys), max(xs), max(ys))
+
+    def cell_changed(self, loc, old, new):
+        x, y = loc.split(';')
+        x, y = int(x), int(y)
+        if new is not None:
+            if self.bounds is None:
+                self.bounds = (x, y, x, y)
+            else:
+                self.bounds = (min(self.bounds[0], x), min(self.bounds[1], y), max(self.bounds[2], x), max(self.bounds[3], y))
+        if self.surface is not None and not self.plot(self.surface, self.origin, x, y, new):
+            self.stale = True
+        if self.building is not None and not self.plot(self.building[0], self.building[1], x, y, new):
+            self.stale = True
+        self.scaled = None
+
+    def offgrid_changed(self, tile, index, added):
+        pass  # the overview shows grid tiles only
+
+    def color(self, tile):
+        key = (tile['type'], tile['variant'])
+        if key not in self.colors:
+            img = self.tilemap.game.assets[tile['type']][tile['variant']].convert_alpha() # colorkey -> transparent, left out of the average
+            self.colors[key] = pygame.transform.average_color(img, consider_alpha=True)[:3]
+        return self.colors[key]
+
+    def plot(self, surface, origin, x, y, tile):
+        px, py = x - origin[0], y - origin[1]
+        if not (0 <= px < surface.get_width() and 0 <= py < surface.get_height()):
+            return False
+        surface.set_at((px, py), self.color(tile) if tile is not None else (0, 0, 0, 0))
+        return True
+
+    def update(self, budget=MINIMAP_BUDGET):
+        """Call once per frame; continues (or starts) a rebuild when the map outgrew the overview."""
+        if self.stale and self.building is None:
+            self.stale = False
+            x0, y0, x1, y1 = self.bounds or (0, 0, 0, 0)
+            origin = (x0 - MINIMAP_MARGIN, y0 - MINIMAP_MARGIN)
+            size = (x1 - origin[0] + MINIMAP_MARGIN + 1, y1 - origin[1] + MINIMAP_MARGIN + 1)
+            self.building = [pygame.Surface(size, pygame.SRCALPHA), origin, list(self.tilemap.tilemap)]
+        if self.building is None:
+            return
+        surface, origin, locs = self.building
+        for _ in range(min(budget, len(locs))):
+            loc = locs.pop()
+            tile = self.tilemap.tilemap.get(loc)
+            if tile is not None:
+                self.plot(surface, origin, tile['pos'][0], tile['pos'][1], tile)
+        if not locs:
+            self.surface, self.origin = surface, origin
+            self.building = None
+            self.scaled = None
+
+    def render(self, surf, box, view):
+        """Draw the overview fitted into box, with view (world pixels) outlined; returns the rect used."""
+        if self.surface is None:
+            return pygame.Rect(box.topleft, (0, 0))
+        width, height = self.surface.get_size()
+        factor = min(box.width / width, box.height / height)
+        size = (max(1, int(width * factor)), max(1, int(height * factor)))
+        if self.scaled is None or self.scaled.get_size() != size:
+            self.scaled = pygame.transform.scale(self.surface, size)
+        rect = pygame.Rect(box.right - size[0], box.top, size[0], size[1])
+        surf.fill((20, 20, 30), rect)
+        surf.blit(self.scaled, rect)
+        tile_size = self.tilemap.tile_size
+        view_rect = pygame.Rect(
+            rect.left + (view.left / tile_size - self.origin[0]) * factor,
+            rect.top + (view.top / tile_size - self.origin[1]) * factor,
+            max(2, view.width / tile_size * factor),
+            max(2, view.height / tile_size * factor),
+        )
+        pygame.draw.rect(surf, (255, 255, 255), view_rect.clip(rect), 1)
+        pygame.draw.rect(surf, (90, 90, 110), rect, 1)
+        return rect
+
+    def tile_at(self, rect, point):
+        """Map tile under point of a minimap drawn into rect."""
+        factor = rect.width / self.surface.get_width()
+        return ((point[0] - rect.left) / factor + self.origin[0], (point[1] - rect.top) / factor + self.origin[1])
@@ -0,0 +1,134 @@
+import pygame
+
+
+class ParallaxLayer:
+    def __init__(self, img, factor=(1, 1), offset=(0, 0), drift=(0, 0), wrap_y=False):
+        self.img = img
+        self.factor = tuple(factor)  # how much of the camera scroll the layer follows
+        self.offset = tuple(offset)  # position of the layer when scroll is (0, 0)
+        self.drift = tuple(drift)  # pixels per update() the layer moves on its own (clouds)
+        self.wrap_y = wrap_y  # repeat vertically too, otherwise the layer is a single horizontal band
+        self.drift_pos = [0, 0]
+        self.strip = None
+
+    def motion(self):
+        return (self.factor, self.drift, self.wrap_y)
+
+    def is_opaque(self):
+        if self.img.get_flags() & pygame.SRCALPHA:
+            return False
+        if self.img.get_colorkey() is None:
+            return True
+        return pygame.mask.from_surface(self.img).count() == self.img.get_width() * self.img.get_height()
+
+
+class ParallaxBackground:
+    """Scrolling background built from horizontally wrapping layers, drawn back to front.
+
+    build() prepares everything once: adjacent layers that move the same way are merged
+    into one surface, layers hidden behind an opaque layer are dropped, and each layer is
+    tiled into a strip wide enough that any scroll position is a single blit.
+    """
+
+    def __init__(self, view_size):
+        self.view_size = tuple(view_size)
+        self.layers = []
+        self.built = []
+        self.covers_view = False  # an opaque layer always fills the view, so clearing the display first is not needed
+
+    def add_layer(self, img, factor=(1, 1), offset=(0, 0), drift=(0, 0), wrap_y=False):
+        self.layers.append(ParallaxLayer(img, factor, offset, drift, wrap_y))
+        self.built = []
+
+    def build(self):
+        merged = []
+        for layer in self.layers:
+            if merged and self._can_merge(merged[-1], layer):
+                merged[-1] = self._merge(merged[-1], layer)
+            else:
+                merged.append(ParallaxLayer(layer.img, layer.factor, layer.offset, layer.drift, layer.wrap_y))
+
+        # Cull everything below the topmost layer that always fills the view
+        self.covers_view = False
+        for i in range(len(merged) - 1, -1, -1):
+            if self._covers_view(merged[i]):
+                merged = merged[i:]
+                self.covers_view = True
+                break
+
+        for layer in merged:
+            layer.strip = self._make_strip(layer)
+        self.built = merged
+
+    def update(self):
+        if not self.built:
+            self.build()
+        for layer in self.built:
+            layer.drift_pos[0] += layer.drift[0]
+            layer.drift_pos[1] += layer.drift[1]
+
+    def render(self, surf, scroll=(0, 0)):
+        if not self.built:
+            self.build()
+        view_w, view_h = self.view_size
+        for layer in self.built:
+            width, height = layer.img.get_size()
+            x = int(scroll[0] * layer.factor[0] - layer.drift_pos[0] - layer.offset[0]) % width
+            if layer.wrap_y:
+                y = int(scroll[1] * layer.factor[1] - layer.drift_pos[1] - layer.offset[1]) % height
+                surf.blit(layer.strip, (0, 0), (x, y, view_w, view_h))
+            else:
+                y = int(layer.offset[1] + layer.drift_pos[1] - scroll[1] * layer.factor[1])
+                surf.blit(layer.strip, (0, y), (x, 0, view_w, height))
+
+    def _can_merge(self, below, above):
+        if below.motion() != above.motion() or below.img.get_width() != above.img.get_width():
+            return False
+        if below.wrap_y:
+            return below.img.get_height() == above.img.get_height() and below.offset[1] == above.offset[1]
+        return True
+
+    def _merge(self, below, above):
+        width = below.img.get_width()
+        top = min(below.offset[1], above.offset[1])
+        bottom = max(below.offset[1] + below.img.get_height(), above.offset[1] + above.img.get_height())
+        alpha = (below.img.get_flags() | above.img.get_flags()) & pygame.SRCALPHA
+        img = pygame.Surface((width, bottom - top), pygame.SRCALPHA if alpha else 0)
+        if not alpha:
+            colorkey = below.img.get_colorkey() or (0, 0, 0)
+            img.fill(colorkey)
+            img.set_colorkey(colorkey)
+        for layer in (below, above):
+            # Horizontal offsets are relative to the lower layer; the layer wraps, so blit it twice
+            x = (layer.offset[0] - below.offset[0]) % width
+            img.blit(layer.img, (x, layer.offset[1] - top))
+            img.blit(layer.img, (x - width, layer.offset[1] - top))
+        return ParallaxLayer(img, below.factor, (below.offset[0], top), below.drift, below.wrap_y)
+
+    def _covers_view(self, layer):
+        if not layer.is_opaque():
+            return False
+        if layer.wrap_y:
+            return True
+        stays_put = layer.factor[1] == 0 and layer.drift[1] == 0
+        return stays_put and layer.offset[1] <= 0 and layer.offset[1] + layer.img.get_height() >= self.view_size[1]
+
+    def _make_strip(self, layer):
+        """Tile the layer so a view-sized window at any wrapped offset is one contiguous area."""
+        width, height = layer.img.get_size()
+        strip_w = width + self.view_size[0]
+        strip_h = height + self.view_size[1] if layer.wrap_y else height
+        opaque = layer.is_opaque()
+        colorkey = layer.img.get_colorkey() or (0, 0, 0)
+        strip = pygame.Surface((strip_w, strip_h), layer.img.get_flags() & pygame.SRCALPHA)
+        if not opaque and not layer.img.get_flags() & pygame.SRCALPHA:
+            strip.fill(colorkey)
+        for x in range(0, strip_w, width):
+            for y in range(0, strip_h, height):
+                strip.blit(layer.img, (x, y))
+        if layer.img.get_flags() & pygame.SRCALPHA:
+            return strip.convert_alpha()
+        strip = strip.convert()
+        if not opaque:
+            strip.set_colorkey(colorkey, pygame.RLEACCEL)  # RLE skips transparent runs, much faster for sparse layers
+        return strip
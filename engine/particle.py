@@ -0,0 +1,16 @@
+def spawn_particle(world, anim, pos, velocity=(0, 0), frame=0, tags=()):
+    """Add an animated particle; it lives until its (non-looping) animation has played out.
+
+    anim is shared by every particle of a kind, only the frame is stored per particle.
+    tags are extra component names (registered without columns) to pick particles out later.
+    """
+    last_frame = anim.img_duration * len(anim.images) - 1
+    components = {
+        'position': pos,
+        'velocity': velocity,
+        'animation': (anim, frame),
+        'lifetime': (max(1, last_frame - frame) + 1,), #rendered once more on the frame the animation finishes
+    }
+    for tag in tags:
+        components[tag] = ()
+    return world.spawn(**components)
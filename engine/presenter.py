@@ -0,0 +1,159 @@
+import pygame
+
+
+class SoftwarePresenter:
+    """Scales the low-res display surface onto the window surface on the CPU.
+
+    The display keeps its aspect ratio: when the window has a different shape the image
+    is centered with black bars (letterboxing). Scaling writes straight into the window
+    surface, or into a target surface allocated once per window size when the screen
+    shakes, so presenting a frame allocates nothing.
+    """
+
+    def __init__(self, screen):
+        self.screen = screen
+        self.layout = None  # (window size, display size) the viewport was computed for
+        self.viewport = None  # part of the window the display is scaled into
+        self.letterboxed = False
+        self.bars_dirty = False  # a shaken frame was drawn into the letterbox bars
+        self.screen_view = None  # window subsurface covering the viewport
+        self.target = None  # viewport-sized surface for shaken frames
+
+    def window_size(self):
+        return self.screen.get_size()
+
+    def update_layout(self, display_size):
+        """Recompute the viewport when the window or display size changed."""
+        window_size = self.window_size()
+        if self.layout == (window_size, tuple(display_size)):
+            return
+        self.layout = (window_size, tuple(display_size))
+        window_w, window_h = window_size
+        display_w, display_h = display_size
+        fit = min(window_w / display_w, window_h / display_h)
+        size = (max(1, round(display_w * fit)), max(1, round(display_h * fit)))
+        self.viewport = pygame.Rect(((window_w - size[0]) // 2, (window_h - size[1]) // 2), size)
+        self.letterboxed = self.viewport.size != window_size
+        self._rebuild()
+
+    def _rebuild(self):
+        self.screen_view = self.screen.subsurface(self.viewport)
+        self.target = pygame.Surface(self.viewport.size, 0, self.screen)
+        self.bars_dirty = False
+        if self.letterboxed:
+            self.screen.fill((0, 0, 0))  # the bars are never drawn over, so clearing them once is enough
+            pygame.display.update()
+
+    def present(self, display, offset=(0, 0)):
+        self.update_layout(display.get_size())
+        if offset[0] or offset[1]:
+            # Screenshake: scale into the spare target, then blit it shifted
+            pygame.transform.scale(display, self.viewport.size, self.target)
+            if self.letterboxed:
+                self.screen.fill((0, 0, 0))
+                self.bars_dirty = True
+            self.screen.blit(self.target, (self.viewport.x + offset[0], self.viewport.y + offset[1]))
+        else:
+            self._clear_bars()
+            pygame.transform.scale(display, self.viewport.size, self.screen_view)
+        pygame.display.update()
+
+    def _clear_bars(self):
+        """Black out the letterbox bars after a shaken frame drew into them; returns the window rects cleared."""
+        if not self.bars_dirty:
+            return []
+        self.bars_dirty = False
+        window = self.screen.get_rect()
+        view = self.viewport
+        bars = [pygame.Rect(0, 0, window.width, view.top), pygame.Rect(0, view.bottom, window.width, window.height - view.bottom),
+                pygame.Rect(0, view.top, view.left, view.height), pygame.Rect(view.right, view.top, window.width - view.right, view.height)]
+        bars = [bar for bar in bars if bar.width > 0 and bar.height > 0]
+        for bar in bars:
+            self.screen.fill((0, 0, 0), bar)
+        return bars
+
+    def present_rects(self, display, rects):
+        """Scale only the given display rects to the window and update just those areas."""
+        self.update_layout(display.get_size())
+        screen_rects = self._clear_bars()
+        scale_x = self.viewport.width / display.get_width()
+        scale_y = self.viewport.height / display.get_height()
+        for rect in rects:
+            rect = rect.clip(display.get_rect())
+            if not rect.width or not rect.height:
+                continue
+            # Round both edges so neighbouring rects meet without gaps
+            left, top = int(rect.left * scale_x), int(rect.top * scale_y)
+            view_rect = pygame.Rect(left, top, int(rect.right * scale_x) - left, int(rect.bottom * scale_y) - top)
+            if not view_rect.width or not view_rect.height:
+                continue
+            pygame.transform.scale(display.subsurface(rect), view_rect.size, self.screen_view.subsurface(view_rect))
+            screen_rects.append(view_rect.move(self.viewport.topleft))
+        pygame.display.update(screen_rects)
+
+    def to_display(self, pos, display_size):
+        """Convert a window position (e.g. the mouse) to display surface coordinates."""
+        self.update_layout(display_size)
+        return ((pos[0] - self.viewport.x) * display_size[0] // self.viewport.width,
+                (pos[1] - self.viewport.y) * display_size[1] // self.viewport.height)
+
+
+class HardwarePresenter(SoftwarePresenter):
+    """Uploads the display surface to an SDL2 texture and lets the renderer scale it on the GPU.
+
+    SDL does not allow a renderer on the window pygame.display.set_mode created, so that
+    window is shrunk and hidden (it still provides the pixel format for Surface.convert)
+    and the game is shown in a separate pygame._sdl2 Window. Closing that window sends
+    WINDOWCLOSE rather than QUIT, because the hidden window still exists.
+    """
+
+    def __init__(self, window_size, display_size, resizable=False):
+        from pygame._sdl2.video import Window, Renderer, Texture
+
+        title = pygame.display.get_caption()[0]
+        self.screen = pygame.display.set_mode((1, 1), pygame.HIDDEN)
+        self.window = Window(title, window_size, resizable=resizable)
+        self.renderer = Renderer(self.window)
+        self.renderer.draw_color = (0, 0, 0, 255)
+        self.texture = Texture(self.renderer, display_size, streaming=True)
+        self.layout = None
+        self.viewport = None
+
+    def window_size(self):
+        return self.window.size
+
+    def _rebuild(self):
+        pass  # the renderer clears the bars and scales every frame, no surfaces to keep
+
+    def present(self, display, offset=(0, 0)):
+        self.update_layout(display.get_size())
+        self.texture.update(display)
+        self._draw(offset)
+
+    def present_rects(self, display, rects):
+        # Only the changed areas are uploaded; drawing the texture is cheap on the GPU
+        for rect in rects:
+            rect = rect.clip(display.get_rect())
+            if rect.width and rect.height:
+                self.texture.update(display.subsurface(rect), area=rect)
+        self.update_layout(display.get_size())
+        self._draw()
+
+    def _draw(self, offset=(0, 0)):
+        self.renderer.clear()
+        self.texture.draw(dstrect=self.viewport.move(int(offset[0]), int(offset[1])))
+        self.renderer.present()
+
+
+def create_presenter(window_size, display_size, flags=0, hardware=True):
+    """Open the game window and return the presenter that shows the display surface in it.
+
+    The hardware path is used when requested and available; headless drivers (dummy,
+    offscreen) and pygame builds without _sdl2 fall back to software scaling.
+    """
+    if hardware and pygame.display.get_driver() not in ("dummy", "offscreen"):
+        try:
+            return HardwarePresenter(window_size, display_size, resizable=bool(flags & pygame.RESIZABLE))
+        except (ImportError, RuntimeError) as e:  # pygame.error and the _sdl2 error are both RuntimeErrors
+            print(f"Hardware presentation unavailable, using software scaling: {e}")
+    return SoftwarePresenter(pygame.display.set_mode(window_size, flags))
@@ -0,0 +1,148 @@
+"""Game data lookup by name, relative to the game package instead of the working directory.
+
+Names use forward slashes and are relative to the game's data folder, e.g. "maps/0.json".
+A loose file in the data folder is used when it exists, otherwise the entry from the
+packed archive next to it (data.zip). Stored (uncompressed) entries are served as
+memoryview slices of one memory-mapped archive, so loading an asset reads it straight
+from the page cache without copying the archive or opening a file per asset.
+
+Pack a data folder with:
+    python -m engine.resources pack Ninja_game/data --exclude top_times
+"""
+import argparse
+import io
+import mmap
+import os
+import struct
+import zipfile
+
+LOCAL_HEADER_SIZE = 30  # fixed part of a zip local file header, followed by the name and extra field
+
+
+class BufferReader(io.RawIOBase):
+    """Read-only file object over a memoryview, for loaders that want a file (pygame, json).
+
+    Only the bytes actually read are copied out of the buffer.
+    """
+
+    def __init__(self, buffer, name=''):
+        self.buffer = buffer
+        self.name = name
+        self.pos = 0
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def readinto(self, b):
+        n = max(0, min(len(b), len(self.buffer) - self.pos))
+        b[:n] = self.buffer[self.pos:self.pos + n]
+        self.pos += n
+        return n
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_CUR:
+            offset += self.pos
+        elif whence == io.SEEK_END:
+            offset += len(self.buffer)
+        self.pos = max(0, offset)
+        return self.pos
+
+    def tell(self):
+        return self.pos
+
+
+class Resources:
+    def __init__(self, root, pack=None):
+        self.root = root  # loose data folder; also where writable files (maps, scores) are saved
+        self.pack_path = pack if pack is not None else root + '.zip'
+        self.loose = os.path.isdir(root)  # a shipped build may have only the pack, then no file is stat'ed
+        self.archive = None
+        self.blob = None  # memoryview of the whole mapped pack
+        self.entries = {}  # name -> ZipInfo
+        self.dirs = {}  # directory name -> names of its children in the pack
+        if os.path.isfile(self.pack_path):
+            self.open_pack(self.pack_path)
+
+    def open_pack(self, path):
+        self.archive = zipfile.ZipFile(path)
+        with open(path, 'rb') as f:
+            self.blob = memoryview(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+        for info in self.archive.infolist():
+            if info.is_dir():
+                continue
+            self.entries[info.filename] = info
+            parts = info.filename.split('/')
+            for i in range(1, len(parts)):
+                self.dirs.setdefault('/'.join(parts[:i]), set()).add(parts[i])
+            self.dirs.setdefault('', set()).add(parts[0])
+
+    def path(self, name):
+        """Filesystem path of name in the loose data folder (use it for files the game writes)."""
+        return os.path.join(self.root, *name.split('/'))
+
+    def exists(self, name):
+        return (self.loose and os.path.exists(self.path(name))) or name in self.entries or name in self.dirs
+
+    def listdir(self, name):
+        names = set(self.dirs.get(name.rstrip('/'), ()))
+        if self.loose and os.path.isdir(self.path(name)):
+            names.update(os.listdir(self.path(name)))
+        if not names and not self.exists(name):
+            raise FileNotFoundError(self.path(name))
+        return sorted(names)
+
+    def read(self, name):
+        """Contents of name as a memoryview; a slice of the mapped pack for stored entries."""
+        if self.loose:
+            path = self.path(name)
+            if os.path.isfile(path):
+                with open(path, 'rb') as f:
+                    return memoryview(f.read())
+        info = self.entries.get(name)
+        if info is None:
+            raise FileNotFoundError(self.path(name))
+        if info.compress_type != zipfile.ZIP_STORED:
+            return memoryview(self.archive.read(info))
+        name_len, extra_len = struct.unpack_from('<HH', self.blob, info.header_offset + 26)
+        start = info.header_offset + LOCAL_HEADER_SIZE + name_len + extra_len
+        return self.blob[start:start + info.file_size]
+
+    def open(self, name):
+        return BufferReader(self.read(name), name)
+
+
+def pack(data_dir, output=None, exclude=()):
+    """Write every file under data_dir into one uncompressed zip, the format Resources maps."""
+    output = output or data_dir.rstrip('/\\') + '.zip'
+    count = 0
+    with zipfile.ZipFile(output, 'w', zipfile.ZIP_STORED) as archive:
+        for folder, subfolders, files in os.walk(data_dir):
+            rel_folder = os.path.relpath(folder, data_dir).replace(os.sep, '/')
+            subfolders[:] = sorted(d for d in subfolders if d not in exclude and d != '__pycache__')
+            for file in sorted(files):
+                name = file if rel_folder == '.' else rel_folder + '/' + file
+                if file in exclude or name in exclude:
+                    continue
+                archive.write(os.path.join(folder, file), name)
+                count += 1
+    return output, count
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pack a game data folder into a single resource archive.")
+    commands = parser.add_subparsers(dest='command', required=True)
+    pack_parser = commands.add_parser('pack', help="write <data_dir>.zip next to the folder")
+    pack_parser.add_argument('data_dir')
+    pack_parser.add_argument('-o', '--output', help="archive path (default: <data_dir>.zip)")
+    pack_parser.add_argument('--exclude', nargs='*', default=[], help="file or folder names to leave out, e.g. top_times")
+    args = parser.parse_args()
+
+    output, count = pack(args.data_dir, args.output, set(args.exclude))
+    print(f"Packed {count} files into {output}")
+
+
+if __name__ == '__main__':
+    main()
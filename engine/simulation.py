@@ -0,0 +1,167 @@
+"""Headless gameplay: the update half of a game frame, without a window, sound or drawing.
+
+Each game subclasses Simulation in its scripts/simulation.py with its own level loading
+and frame. A simulation is driven one frame at a time with step(inputs), inputs being
+the engine.input.InputSnapshot the game takes from its InputMap each tick, and can be
+saved and rewound with snapshot() / restore(), which is what engine.level_bot searches
+with. Particles and sparks are still spawned (the entities do that themselves) but are
+not part of a snapshot; they only show what happened.
+"""
+import os
+import random
+
+import pygame
+
+from engine.ecs import COMPONENTS, World
+from engine.input import InputSnapshot
+
+MOVES = (('left',), (), ('right',))  # held
+ACTIONS = tuple(InputSnapshot(frozenset(held), frozenset(pressed)) for held in MOVES for pressed in ((), ('jump',), ('dash',)))
+
+
+def init_display():
+    """Open a 1x1 display on SDL's dummy driver, so images can be loaded with convert()."""
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+    if pygame.display.get_surface() is None:
+        pygame.display.init()
+        pygame.display.set_mode((1, 1))
+
+
+def entity_state(entity):
+    """Copy of everything in an entity's __slots__ except game; the animation frame included."""
+    state = {}
+    for cls in type(entity).__mro__:
+        for name in getattr(cls, '__slots__', ()):
+            if name == 'game':
+                continue
+            value = getattr(entity, name)
+            if isinstance(value, list):
+                value = list(value)
+            elif isinstance(value, dict):
+                value = dict(value)
+            state[name] = value
+    state['frame'] = (entity.animation.frame, entity.animation.done)
+    return state
+
+
+def restore_entity(entity, state):
+    for name, value in state.items():
+        if name == 'frame':
+            continue
+        if isinstance(value, (list, dict)):
+            value = type(value)(value) # the snapshot can be restored again later
+        setattr(entity, name, value)
+    entity.animation.frame, entity.animation.done = state['frame']
+
+
+def world_state(world, component):
+    """Rows of every entity with component, as {component: column values} dicts for spawn()."""
+    rows = []
+    for archetype in world.query(component):
+        columns = archetype.columns
+        for i in range(len(archetype)):
+            rows.append({name: tuple(columns[column][i] for column, typecode in COMPONENTS[name]) for name in archetype.components})
+    return rows
+
+
+class Simulation:
+    """Base for a game's headless simulation; it stands in for the Game the entities expect.
+
+    Subclasses load their assets and entities, and implement load_level(), step(),
+    goals() and state_key(). Runs are deterministic: load_level() seeds the random
+    module, and a snapshot holds its state.
+    """
+
+    actions = ACTIONS
+
+    def __init__(self, seed=0):
+        init_display()
+        self.seed = seed
+        self.frame = 0  # frames since the level was loaded
+        self.dead = 0
+        self.screenshake = 0
+        self.world = World()
+        self.player = None
+        self.enemies = []
+        self.tilemap = None
+        self.goal_count = 0  # goals() of the freshly loaded level
+
+    def play_sfx(self, name):
+        pass
+
+    def reset(self):
+        """Common part of load_level(), called by subclasses once the level is in place."""
+        random.seed(self.seed)
+        self.frame = 0
+        self.dead = 0
+        self.screenshake = 0
+        self.goal_count = len(self.goals())
+
+    def load_level(self, name):
+        raise NotImplementedError
+
+    def step(self, inputs):
+        """Advance one frame with the InputSnapshot of that tick."""
+        raise NotImplementedError
+
+    def goals(self):
+        """[(key, (x, y)), ...] of what is left to do before the level is completed."""
+        raise NotImplementedError
+
+    def state_key(self):
+        """Hashable summary of the state; two states with the same key are treated as one by a search."""
+        raise NotImplementedError
+
+    @property
+    def completed(self):
+        return not self.dead and not self.goals()
+
+    @property
+    def failed(self):
+        return bool(self.dead)
+
+    def play(self, action, frames=1):
+        """step() for frames frames: jump and dash are pressed on the first one, the movement is held for all."""
+        self.step(action)
+        held = action.held_only()
+        for i in range(frames - 1):
+            if self.completed or self.failed:
+                return
+            self.step(held)
+
+    def hazards(self):
+        """[((x, y), (vx, vy)), ...] of what kills the player on touch, e.g. projectiles."""
+        return []
+
+    def run(self, actions):
+        """Step through InputSnapshots until the level is completed or failed; returns the frames played."""
+        start = self.frame
+        for inputs in actions:
+            self.step(inputs)
+            if self.completed or self.failed:
+                break
+        return self.frame - start
+
+    def snapshot(self):
+        return {
+            "frame": self.frame,
+            "dead": self.dead,
+            "random": random.getstate(),
+            "sight": (dict(self.tilemap.sight_cache), self.tilemap.sight_tick), # cached results decide what enemies see
+            "player": entity_state(self.player),
+            "enemies": [(enemy, entity_state(enemy)) for enemy in self.enemies],
+        }
+
+    def restore(self, snapshot):
+        self.frame = snapshot["frame"]
+        self.dead = snapshot["dead"]
+        random.setstate(snapshot["random"])
+        cache, self.tilemap.sight_tick = snapshot["sight"]
+        self.tilemap.sight_cache = dict(cache)
+        restore_entity(self.player, snapshot["player"])
+        self.enemies = []
+        for enemy, state in snapshot["enemies"]:
+            restore_entity(enemy, state)
+            self.enemies.append(enemy)
+        self.world.clear()
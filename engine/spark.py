@@ -0,0 +1,41 @@
+import math, pygame
+
+from engine.ecs import register_component
+
+register_component('spark', (('angle', 'd'), ('speed', 'd')))
+
+
+def spawn_spark(world, pos, angle, speed):
+    world.spawn(position=pos, spark=(angle, speed))
+
+
+def update_sparks(world):
+    """Move sparks along their angle and slow them down; returns (archetype, rows) of sparks that stopped."""
+    expired = []
+    for archetype in world.query('position', 'spark'):
+        columns = archetype.columns
+        x, y, angles, speeds = columns['x'], columns['y'], columns['angle'], columns['speed']
+        rows = []
+        for i in range(len(archetype)):
+            x[i] += math.cos(angles[i]) * speeds[i]
+            y[i] += math.sin(angles[i]) * speeds[i]
+            speeds[i] = max(0, speeds[i] - 0.1) #decelerate
+            if not speeds[i]:
+                rows.append(i)
+        if rows:
+            expired.append((archetype, rows))
+    return expired
+
+
+def render_sparks(world, surface, offset=(0,0)):
+    for archetype in world.query('position', 'spark'):
+        columns = archetype.columns
+        for x, y, angle, speed in zip(columns['x'], columns['y'], columns['angle'], columns['speed']):
+            render_points = [
+                (x + math.cos(angle) * speed * 3 - offset[0], y + math.sin(angle) * speed * 3 - offset[1]),
+                (x + math.cos(angle + math.pi * 0.5) * speed * 0.5 - offset[0], y + math.sin(angle + math.pi * 0.5) * speed * 0.5 - offset[1]),
+                (x + math.cos(angle + math.pi) * speed * 3 - offset[0], y + math.sin(angle) * speed * 3 - offset[1]),
+                (x + math.cos(angle - math.pi * 0.5) * speed * 0.5 - offset[0], y + math.sin(angle + math.pi * 0.5) * speed * 0.5 - offset[1]),
+            ]
+
+            pygame.draw.polygon(surface, (255, 255, 255), render_points)
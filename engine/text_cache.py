@@ -0,0 +1,69 @@
+import pygame
+from collections import OrderedDict
+
+
+class TextCache:
+    """Cache of pre-composited outlined text surfaces with LRU eviction.
+
+    Outlined text used to be drawn by rendering the string 9 times (8 outline
+    offsets + the main text) every frame. Here that work is done once per
+    (font, text, color, outline color, outline width) and reused.
+    """
+
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()  # key -> outlined surface, oldest first
+        self.glyphs = {}  # key -> (outline layer, fill layer, advance) for single characters
+
+    def render(self, font, text, color, outline_color=(0, 0, 0), outline_width=1):
+        """Return the outlined text surface. Blit it at (x - outline_width, y - outline_width)."""
+        key = (font, text, color, outline_color, outline_width)
+        surf = self.entries.get(key)
+        if surf is not None:
+            self.entries.move_to_end(key)  # mark as recently used
+            return surf
+
+        surf = self._render_outline(font, text, outline_color, outline_width)
+        surf.blit(font.render(text, True, color), (outline_width, outline_width))
+        self.entries[key] = surf
+        if len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)  # drop least recently used
+        return surf
+
+    def render_glyphs(self, display, font, text, pos, color, outline_color=(0, 0, 0), outline_width=1):
+        """Draw text from per-character cached glyphs, for strings that change every frame (timers).
+
+        All outlines are blitted first and the fills on top, same as rendering the whole
+        string, so a glyph's outline never covers its neighbour. Returns the text width.
+        """
+        outlines = []
+        fills = []
+        x, y = pos
+        for char in text:
+            key = (font, char, color, outline_color, outline_width)
+            glyph = self.glyphs.get(key)
+            if glyph is None:
+                metrics = font.metrics(char)[0]
+                advance = metrics[4] if metrics else font.size(char)[0]  # pen advance, not the glyph's box width
+                glyph = (self._render_outline(font, char, outline_color, outline_width), font.render(char, True, color), advance)
+                self.glyphs[key] = glyph
+            outlines.append((glyph[0], (x - outline_width, y - outline_width)))
+            fills.append((glyph[1], (x, y)))
+            x += glyph[2]
+        display.blits(outlines, doreturn=False)
+        display.blits(fills, doreturn=False)
+        return x - pos[0]
+
+    def _render_outline(self, font, text, outline_color, outline_width):
+        """Transparent surface with the text drawn at every outline offset around its center."""
+        outline_text = font.render(text, True, outline_color)
+        surf = pygame.Surface((outline_text.get_width() + outline_width * 2, outline_text.get_height() + outline_width * 2), pygame.SRCALPHA)
+        for dx in range(-outline_width, outline_width + 1):
+            for dy in range(-outline_width, outline_width + 1):
+                if dx != 0 or dy != 0:
+                    surf.blit(outline_text, (outline_width + dx, outline_width + dy))
+        return surf
+
+    def clear(self):
+        self.entries.clear()
+        self.glyphs.clear()
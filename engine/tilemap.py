@@ -0,0 +1,582 @@
+import random
+import json
+import hashlib
+
+import pygame
+
+NEIGHBOR_OFFSETS = [(-1, -1), (0, -1), (1, -1),
+                     (-1, 0), (0, 0), (1, 0),
+                     (-1, 1),  (0, 1),  (1, 1)] #relative positions of neighboring tiles (including self)
+CROSS_SHIFTS = [(1, 0), (-1, 0), (0, 1), (0, -1)]
+SIGHT_CACHE_TICKS = 6  # frames a cached line of sight result stays valid
+FLOOD_FILL_LIMIT = 50000  # cells one flood fill may change; a bigger region is left untouched
+COMPILED_FORMAT = 1  # bump when bake() output changes, so old compiled maps are treated as stale
+RENDER_CHUNK = 16  # tiles per side of a chunk in a compiled map's render index
+
+
+def rect_cells(start, end):
+    """Tile positions of the rectangle spanned by two corner tiles (inclusive)."""
+    x0, x1 = sorted((start[0], end[0]))
+    y0, y1 = sorted((start[1], end[1]))
+    return [(x, y) for x in range(x0, x1 + 1) for y in range(y0, y1 + 1)]
+
+
+def line_cells(start, end):
+    """Tile positions on the line between two tiles (Bresenham: one cell per step, diagonal steps touch at corners)."""
+    x, y = start
+    dx, dy = abs(end[0] - x), -abs(end[1] - y)
+    step_x = 1 if end[0] > x else -1
+    step_y = 1 if end[1] > y else -1
+    error = dx + dy
+    cells = [(x, y)]
+    while (x, y) != tuple(end):
+        if 2 * error >= dy:
+            error += dy
+            x += step_x
+        if 2 * error <= dx:
+            error += dx
+            y += step_y
+        cells.append((x, y))
+    return cells
+
+
+class Tilemap:
+    """Grid of tiles keyed "x;y" plus free-placed offgrid tiles.
+
+    A game subclasses it and sets the tile tables below; everything else (collision,
+    line of sight, autotiling, rendering) is shared.
+    """
+    physics_tiles = frozenset()  # tile types entities collide with
+    autotile_tiles = frozenset()  # tile types auto_tile() picks variants for
+    autotile_map = {}  # sorted neighbour shifts -> variant
+    autotile_shifts = CROSS_SHIFTS  # neighbours looked at by auto_tile()
+    autotile_groups = {}  # tile type -> types it autotiles together with (default: only itself)
+    random_variant_tiles = frozenset()  # decor types randomize_tiles() gives a random variant
+    tile_images = {}  # tile type -> image folder it is loaded from, or its number of variants when built in code
+    spawner_tiles = {}  # (type, variant) -> what the game spawns there instead of drawing the tile
+
+    def __init__(self, game, tile_size=16):
+        self.game = game
+        self.tile_size = tile_size
+        self.tilemap = {}
+        self.offgrid_tiles = []
+        self.sight_cache = {}  # (origin tile x, origin tile y, target tile) -> (visible, tick)
+        self.sight_tick = 0
+        self.listeners = []  # told about edits made through the methods below (undo history, autosave)
+        self.chunks = None  # compiled maps only: chunk -> ([(offgrid order, tile)], [locs]) for render()
+        self.type_index = None  # compiled maps only: tile type -> locs, in tilemap order, for extract()
+
+    def extract(self, id_pairs, keep=False): #extract tiles matching given (type, variant) pairs
+        matches = []
+        for tile in self.offgrid_tiles.copy():
+            if (tile['type'], tile['variant']) in id_pairs:
+                matches.append(tile.copy())
+                if not keep:
+                    self.offgrid_tiles.remove(tile) #remove tile from offgrid list
+                    if self.chunks is not None:
+                        entries = self.chunks[self.render_chunk(tile['pos'][0] // self.tile_size, tile['pos'][1] // self.tile_size)][0]
+                        entries[:] = [entry for entry in entries if entry[1] is not tile]
+    
+        types = {pair[0] for pair in id_pairs}
+        if self.type_index is not None and len(types) == 1: #compiled map: only look at tiles of that type
+            locs = self.type_index.get(types.pop(), [])
+        else:
+            locs = self.tilemap
+        to_delete = []
+        for loc in locs:
+            tile = self.tilemap[loc]
+            if (tile['type'], tile['variant']) in id_pairs:
+                matches.append(tile.copy()) 
+                matches [-1]["pos"] = matches[-1]["pos"].copy() #store pixel position instead of tile coordinates #copy to avoid modifying original
+                matches [-1]["pos"][0] *= self.tile_size
+                matches [-1]["pos"][1] *= self.tile_size
+                if not keep:
+                    to_delete.append(loc)
+        
+        for loc in to_delete:
+            tile = self.tilemap.pop(loc) #remove tile from tilemap
+            if self.chunks is not None:
+                x, y = loc.split(';')
+                self.chunks[self.render_chunk(int(x), int(y))][1].remove(loc)
+                self.type_index[tile['type']].remove(loc)
+        
+        return matches
+    
+    def tiles_around(self, pos):
+        tiles = []
+        tile_loc = (int(pos[0] // self.tile_size), int(pos[1] // self.tile_size))
+        for offset in NEIGHBOR_OFFSETS:
+            check_loc = str(tile_loc[0] + offset[0]) + ';' + str(tile_loc[1] + offset[1])
+            if check_loc in self.tilemap:
+                tiles.append(self.tilemap[check_loc])
+        return tiles
+    
+    def save(self, path):
+        f = open(path, 'w')
+        json.dump({"tilemap": self.tilemap, "tile_size": self.tile_size, "offgrid": self.offgrid_tiles}, f)
+        f.close()
+
+    def load(self, path, resources=None, compiled=False): #path is a resource name when resources is given, else a file path
+        """Load a map; with compiled=True the baked "compiled/<path>" is used when it is up to date.
+
+        Games load compiled maps, editors the source (a compiled map is already autotiled).
+        """
+        if compiled and resources and self.load_compiled(path, resources):
+            return
+        f = resources.open(path) if resources else open(path, 'r')
+        map_data = json.load(f)
+        f.close()
+
+        self.tilemap = map_data["tilemap"]
+        self.tile_size = map_data["tile_size"]
+        self.offgrid_tiles = map_data["offgrid"]
+        self.chunks = None
+        self.type_index = None
+        self.sight_cache = {}
+        for listener in self.listeners:
+            listener.map_loaded()
+
+    @classmethod
+    def content_hash(cls, source):
+        """Hash of a map file's bytes together with the tables bake() depends on."""
+        digest = hashlib.sha256(source)
+        tables = (COMPILED_FORMAT, cls.__name__, sorted(cls.autotile_tiles), sorted(cls.autotile_map.items()), list(cls.autotile_shifts),
+                  sorted((tile_type, sorted(group)) for tile_type, group in cls.autotile_groups.items()))
+        digest.update(repr(tables).encode())
+        return digest.hexdigest()
+
+    def bake(self, source):
+        """Runtime-ready form of the map file contents source (bytes), see engine.compile_map.
+
+        The first line is a small header with the content hash, so a loader can tell a
+        stale file from its first line; the second holds the baked map.
+        """
+        map_data = json.loads(source)
+        self.tilemap = map_data["tilemap"]
+        self.tile_size = map_data["tile_size"]
+        self.offgrid_tiles = map_data["offgrid"]
+        self.chunks = None
+        self.type_index = None
+        self.auto_tile()
+
+        type_index = {}
+        chunks = {}
+        for x, y, loc in sorted((tile['pos'][0], tile['pos'][1], loc) for loc, tile in self.tilemap.items()): # x-major, the order render() draws in
+            chunks.setdefault(self.render_chunk(x, y), ([], []))[1].append(loc)
+        for loc, tile in self.tilemap.items():
+            type_index.setdefault(tile['type'], []).append(loc)
+        for i, tile in enumerate(self.offgrid_tiles):
+            chunks.setdefault(self.render_chunk(tile['pos'][0] // self.tile_size, tile['pos'][1] // self.tile_size), ([], []))[0].append(i)
+
+        collision = []
+        if self.tilemap:
+            xs = [tile['pos'][0] for tile in self.tilemap.values()]
+            ys = [tile['pos'][1] for tile in self.tilemap.values()]
+            area = pygame.Rect(min(xs) * self.tile_size, min(ys) * self.tile_size, (max(xs) - min(xs) + 1) * self.tile_size, (max(ys) - min(ys) + 1) * self.tile_size)
+            collision = [list(rect) for rect in self.physics_rects_in(area)]
+
+        header = {"format": COMPILED_FORMAT, "hash": self.content_hash(source)}
+        body = {
+            "tile_size": self.tile_size,
+            "tilemap": self.tilemap,
+            "offgrid": self.offgrid_tiles,
+            "chunks": [[chunk[0], chunk[1], offgrid, locs] for chunk, (offgrid, locs) in sorted(chunks.items())],
+            "type_index": type_index,
+            "collision": collision, # merged physics rects of the whole map, for tools; the game collides against the grid
+        }
+        return json.dumps(header) + '\n' + json.dumps(body, separators=(',', ':')) + '\n'
+
+    def load_compiled(self, path, resources):
+        """Load the baked map for path; returns False (nothing loaded) if it is missing or stale."""
+        name = "compiled/" + path
+        if not resources.exists(name):
+            return False
+        header, _, body = bytes(resources.read(name)).partition(b'\n')
+        if json.loads(header).get("hash") != self.content_hash(resources.read(path)):
+            print(f"{name} is out of date, loading {path} (run python -m engine.compile_map)")
+            return False
+        map_data = json.loads(body)
+
+        self.tilemap = map_data["tilemap"]
+        self.tile_size = map_data["tile_size"]
+        self.offgrid_tiles = map_data["offgrid"]
+        self.type_index = map_data["type_index"]
+        self.chunks = {}
+        for cx, cy, offgrid, locs in map_data["chunks"]:
+            self.chunks[(cx, cy)] = ([(i, self.offgrid_tiles[i]) for i in offgrid], locs)
+        self.sight_cache = {}
+        for listener in self.listeners:
+            listener.map_loaded()
+        return True
+
+    def render_chunk(self, x, y):
+        return (int(x) // RENDER_CHUNK, int(y) // RENDER_CHUNK)
+
+    def write_cell(self, loc, tile):
+        """Put tile in the grid cell loc ("x;y"), or clear the cell when tile is None.
+
+        Editors change the map only through write_cell and the offgrid methods below, so
+        listeners see every change. Tiles are replaced, never changed in place, so a
+        listener may keep the old dict.
+        """
+        old = self.tilemap.get(loc)
+        if tile is None:
+            if old is None:
+                return
+            del self.tilemap[loc]
+        else:
+            self.tilemap[loc] = tile
+        self.chunks = self.type_index = None # the compiled indexes no longer match
+        for listener in self.listeners:
+            listener.cell_changed(loc, old, tile)
+
+    def set_tile(self, pos, tile_type, variant):
+        loc = str(pos[0]) + ';' + str(pos[1])
+        old = self.tilemap.get(loc)
+        if old is None or old['type'] != tile_type or old['variant'] != variant: # painting over the same tile every frame is a no-op
+            self.write_cell(loc, {"type": tile_type, "variant": variant, "pos": [pos[0], pos[1]]})
+
+    def remove_tile(self, pos):
+        self.write_cell(str(pos[0]) + ';' + str(pos[1]), None)
+
+    def set_variant(self, loc, variant):
+        tile = self.tilemap[loc]
+        if tile['variant'] != variant:
+            self.write_cell(loc, dict(tile, variant=variant))
+
+    def fill_cells(self, cells, tile_type, variant=0):
+        """Paint many tile positions at once (tile_type None erases them).
+
+        Returns the bounding area (x0, y0, x1, y1) of the cells, to autotile only that
+        part of the map afterwards, or None when cells is empty.
+        """
+        if not cells:
+            return None
+        for pos in cells:
+            if tile_type is None:
+                self.remove_tile(pos)
+            else:
+                self.set_tile(pos, tile_type, variant)
+        xs = [pos[0] for pos in cells]
+        ys = [pos[1] for pos in cells]
+        return (min(xs), min(ys), max(xs), max(ys))
+
+    def flood_region(self, pos, limit=FLOOD_FILL_LIMIT):
+        """Tile positions connected to pos (4-way) that hold the same tile type as pos.
+
+        An empty start cell collects the connected empty cells, bounded by the extent
+        of the map. Returns None if the region has more than limit cells.
+        """
+        start = str(pos[0]) + ';' + str(pos[1])
+        target = self.tilemap[start]['type'] if start in self.tilemap else None
+        if self.tilemap:
+            xs = [tile['pos'][0] for tile in self.tilemap.values()]
+            ys = [tile['pos'][1] for tile in self.tilemap.values()]
+            bounds = (min(xs), min(ys), max(xs), max(ys))
+        else:
+            bounds = (pos[0], pos[1], pos[0], pos[1])
+        if not (bounds[0] <= pos[0] <= bounds[2] and bounds[1] <= pos[1] <= bounds[3]):
+            return [] # outside the map an empty region has no edge
+
+        region = [tuple(pos)]
+        seen = {tuple(pos)}
+        i = 0
+        while i < len(region):
+            x, y = region[i]
+            i += 1
+            for shift in CROSS_SHIFTS:
+                nx, ny = x + shift[0], y + shift[1]
+                if (nx, ny) in seen or not (bounds[0] <= nx <= bounds[2] and bounds[1] <= ny <= bounds[3]):
+                    continue
+                tile = self.tilemap.get(str(nx) + ';' + str(ny))
+                if (tile['type'] if tile else None) == target:
+                    seen.add((nx, ny))
+                    region.append((nx, ny))
+                    if len(region) > limit:
+                        return None
+        return region
+
+    def add_offgrid(self, tile, index=None):
+        index = len(self.offgrid_tiles) if index is None else index
+        self.offgrid_tiles.insert(index, tile)
+        self.chunks = self.type_index = None
+        for listener in self.listeners:
+            listener.offgrid_changed(tile, index, True)
+
+    def remove_offgrid(self, tile):
+        index = self.offgrid_tiles.index(tile)
+        del self.offgrid_tiles[index]
+        self.chunks = self.type_index = None
+        for listener in self.listeners:
+            listener.offgrid_changed(tile, index, False)
+
+    def solid_check(self, pos):
+        tile_loc = str(int(pos[0]//self.tile_size)) + ';' + str(int(pos[1]//self.tile_size)) #get tile coordinates
+        if tile_loc in self.tilemap:
+            if self.tilemap[tile_loc]['type'] in self.physics_tiles:
+                return self.tilemap[tile_loc]
+    
+    def raycast(self, start, end):
+        """Walk every tile the segment start -> end passes through (Amanatides & Woo grid traversal).
+
+        Returns the point where the segment enters the first physics tile, or None if it is clear.
+        """
+        x, y = start
+        dx, dy = end[0] - x, end[1] - y
+        tile_x, tile_y = int(x // self.tile_size), int(y // self.tile_size)
+        end_tile = (int(end[0] // self.tile_size), int(end[1] // self.tile_size))
+        step_x = 1 if dx > 0 else -1
+        step_y = 1 if dy > 0 else -1
+        # t (0 = start, 1 = end) of the next vertical / horizontal grid line, and t per whole tile
+        if dx:
+            t_max_x = ((tile_x + (dx > 0)) * self.tile_size - x) / dx
+            t_delta_x = self.tile_size / abs(dx)
+        else:
+            t_max_x = t_delta_x = float('inf')
+        if dy:
+            t_max_y = ((tile_y + (dy > 0)) * self.tile_size - y) / dy
+            t_delta_y = self.tile_size / abs(dy)
+        else:
+            t_max_y = t_delta_y = float('inf')
+
+        t = 0.0
+        while True:
+            tile = self.tilemap.get(str(tile_x) + ';' + str(tile_y))
+            if tile and tile['type'] in self.physics_tiles:
+                return (x + dx * t, y + dy * t)
+            if (tile_x, tile_y) == end_tile:
+                return None
+            if t_max_x < t_max_y:
+                t = t_max_x
+                tile_x += step_x
+                t_max_x += t_delta_x
+            else:
+                t = t_max_y
+                tile_y += step_y
+                t_max_y += t_delta_y
+            if t > 1:
+                return None
+
+    def line_of_sight(self, start, end):
+        return self.raycast(start, end) is None
+
+    def lines_of_sight(self, origins, target, cache_ticks=SIGHT_CACHE_TICKS):
+        """Line of sight from every origin (e.g. each enemy) to one target, in one call.
+
+        Results are cached per (origin tile, target tile) for cache_ticks calls, so an enemy
+        standing still while the player moves inside one tile costs nothing. Call once per frame.
+        """
+        self.sight_tick += 1
+        if len(self.sight_cache) > 1024:
+            self.sight_cache = {key: hit for key, hit in self.sight_cache.items() if self.sight_tick - hit[1] < cache_ticks}
+        target_tile = (int(target[0] // self.tile_size), int(target[1] // self.tile_size))
+        results = []
+        for origin in origins:
+            key = (int(origin[0] // self.tile_size), int(origin[1] // self.tile_size), target_tile)
+            hit = self.sight_cache.get(key)
+            if hit is None or self.sight_tick - hit[1] >= cache_ticks:
+                hit = (self.line_of_sight(origin, target), self.sight_tick)
+                self.sight_cache[key] = hit
+            results.append(hit[0])
+        return results
+
+    def physics_rects_in(self, area):
+        """Physics tiles overlapping the pixel rect area, merged into as few rects as possible.
+
+        A horizontal run of solid tiles becomes one rect, and a run with the same span as the
+        run in the row above is merged into it, so most walls and floors come back as one rect.
+        """
+        x0, x1 = area.left // self.tile_size, (area.right - 1) // self.tile_size
+        y0, y1 = area.top // self.tile_size, (area.bottom - 1) // self.tile_size
+        rects = []
+        runs_above = {}  # (first tile x, length) -> rect of a run that reached the previous row
+        for y in range(y0, y1 + 1):
+            runs = {}
+            run_start = None
+            for x in range(x0, x1 + 2):
+                tile = self.tilemap.get(str(x) + ';' + str(y)) if x <= x1 else None
+                solid = tile is not None and tile['type'] in self.physics_tiles
+                if solid and run_start is None:
+                    run_start = x
+                elif not solid and run_start is not None:
+                    key = (run_start, x - run_start)
+                    rect = runs_above.get(key)
+                    if rect:
+                        rect.height += self.tile_size
+                    else:
+                        rect = pygame.Rect(run_start * self.tile_size, y * self.tile_size, (x - run_start) * self.tile_size, self.tile_size)
+                        rects.append(rect)
+                    runs[key] = rect
+                    run_start = None
+            runs_above = runs
+        return rects
+
+    def sweep_rect(self, pos, size, axis, amount):
+        """Move a box at pos (floats) along one axis (0 = x, 1 = y), stopping at the first physics tile in the way.
+
+        Tiles are tested over the whole swept area, so fast movement can't skip past a tile.
+        Returns (new x or y, hit) where hit is True when a tile stopped the movement.
+        """
+        entity_rect = pygame.Rect(pos[0], pos[1], size[0], size[1])
+        target = pos[axis] + amount
+        moved_rect = entity_rect.copy()
+        moved_rect[axis] = target
+        edge = None
+        tiles = self.physics_rects_in(entity_rect.union(moved_rect))
+        for rect in tiles:
+            if axis == 0 and rect.top < entity_rect.bottom and rect.bottom > entity_rect.top:
+                if amount > 0 and entity_rect.right <= rect.left < moved_rect.right:
+                    edge = rect.left - entity_rect.width if edge is None else min(edge, rect.left - entity_rect.width)
+                elif amount < 0 and moved_rect.left < rect.right <= entity_rect.left:
+                    edge = rect.right if edge is None else max(edge, rect.right)
+            elif axis == 1 and rect.left < entity_rect.right and rect.right > entity_rect.left:
+                if amount > 0 and entity_rect.bottom <= rect.top < moved_rect.bottom:
+                    edge = rect.top - entity_rect.height if edge is None else min(edge, rect.top - entity_rect.height)
+                elif amount < 0 and moved_rect.top < rect.bottom <= entity_rect.top:
+                    edge = rect.bottom if edge is None else max(edge, rect.bottom)
+        if edge is not None:
+            return edge, True # time of impact = nearest tile edge
+
+        if moved_rect.collidelist(tiles) == -1:
+            return target, False
+        # Already inside a tile (e.g. spawned overlapping the ground): push out against the single tiles around
+        moved_pos = [pos[0], pos[1]]
+        moved_pos[axis] = target
+        for rect in self.physics_rects_around(moved_pos, size):
+            if moved_rect.colliderect(rect):
+                if axis == 0:
+                    if amount > 0:
+                        moved_rect.right = rect.left
+                    else:
+                        moved_rect.left = rect.right
+                else:
+                    if amount > 0:
+                        moved_rect.bottom = rect.top
+                    else:
+                        moved_rect.top = rect.bottom
+                target = moved_rect[axis]
+        return target, True
+
+    def physics_rects_around(self, pos, entity_size=None):
+        """Return physics tile rects around the given position.
+        Expands the search area based on `entity_size` to avoid misses that cause bouncing.
+        """
+        rects = []
+        # Determine bounds in tile coordinates covering the entity rect with 1-tile padding
+        width = entity_size[0] if entity_size else self.tile_size
+        height = entity_size[1] if entity_size else self.tile_size
+        x0 = int((pos[0] - self.tile_size) // self.tile_size)
+        x1 = int((pos[0] + width + self.tile_size) // self.tile_size)
+        y0 = int((pos[1] - self.tile_size) // self.tile_size)
+        y1 = int((pos[1] + height + self.tile_size) // self.tile_size)
+
+        for x in range(x0, x1 + 1):
+            for y in range(y0, y1 + 1):
+                loc = str(x) + ';' + str(y)
+                if loc in self.tilemap:
+                    tile = self.tilemap[loc]
+                    if tile['type'] in self.physics_tiles:
+                        rects.append(pygame.Rect(
+                            tile['pos'][0] * self.tile_size,
+                            tile['pos'][1] * self.tile_size,
+                            self.tile_size,
+                            self.tile_size
+                        ))
+        return rects
+    
+    def auto_tile(self, area=None):
+        """Pick variants from the neighbours; area (x0, y0, x1, y1 in tiles) limits it to that
+        part of the map and the tiles bordering it, for tools that changed only a region."""
+        if area is None:
+            locs = list(self.tilemap)
+        else:
+            x0, y0, x1, y1 = area[0] - 1, area[1] - 1, area[2] + 1, area[3] + 1
+            if (x1 - x0 + 1) * (y1 - y0 + 1) < len(self.tilemap):
+                locs = [loc for loc in (str(x) + ';' + str(y) for x in range(x0, x1 + 1) for y in range(y0, y1 + 1)) if loc in self.tilemap]
+            else:
+                locs = [loc for loc, tile in self.tilemap.items() if x0 <= tile['pos'][0] <= x1 and y0 <= tile['pos'][1] <= y1]
+        for loc in locs:
+            tile = self.tilemap[loc]
+            group = self.autotile_groups.get(tile["type"], (tile["type"],)) # types that count as the same surface
+            neighbors = set()
+            for shift in self.autotile_shifts:
+                check_loc = str(tile['pos'][0] + shift[0]) + ';' + str(tile['pos'][1] + shift[1])
+                if check_loc in self.tilemap and self.tilemap[check_loc]["type"] in group:
+                    neighbors.add(shift)
+            variant = self.autotile_variant(tile, tuple(sorted(neighbors)))
+            if variant is not None:
+                self.set_variant(loc, variant)
+
+    def autotile_variant(self, tile, neighbors):
+        """Variant for a tile given its sorted neighbour shifts, or None to leave it as it is."""
+        if tile["type"] in self.autotile_tiles:
+            return self.autotile_map.get(neighbors)
+        return None
+
+    def randomize_tiles(self):
+        for loc in self.tilemap:
+            tile = self.tilemap[loc]
+            if tile["type"] in self.random_variant_tiles:
+                self.set_variant(loc, random.randint(0, len(self.game.assets[tile["type"]]) - 1))
+
+    def render(self, surf, offset=(0, 0)):
+        if self.chunks is not None:
+            self.render_chunks(surf, offset)
+            return
+        for tile in self.offgrid_tiles:
+            surf.blit(self.game.assets[tile['type']][tile['variant']], (tile['pos'][0] - offset[0], tile['pos'][1] - offset[1]))
+            
+        for x in range(offset[0] // self.tile_size, (offset[0] + surf.get_width()) // self.tile_size + 1):
+            for y in range(offset[1] // self.tile_size, (offset[1] + surf.get_height()) // self.tile_size + 1):
+                loc = str(x) + ';' + str(y)
+                if loc in self.tilemap:
+                    tile = self.tilemap[loc]
+                    surf.blit(self.game.assets[tile['type']][tile['variant']], (tile['pos'][0] * self.tile_size - offset[0], tile['pos'][1] * self.tile_size - offset[1]))
+
+    def render_chunks(self, surf, offset=(0, 0)):
+        """render() for a compiled map: only the chunks in view are looked at, and offgrid
+        tiles off screen are skipped (an offgrid image is assumed smaller than a chunk)."""
+        assets = self.game.assets
+        x0, x1 = offset[0] // self.tile_size, (offset[0] + surf.get_width()) // self.tile_size
+        y0, y1 = offset[1] // self.tile_size, (offset[1] + surf.get_height()) // self.tile_size
+        chunk_x = range(x0 // RENDER_CHUNK, x1 // RENDER_CHUNK + 1)
+        chunk_y = range(y0 // RENDER_CHUNK, y1 // RENDER_CHUNK + 1)
+
+        offgrid = []
+        for cx in range(chunk_x.start - 1, chunk_x.stop): # offgrid tiles reach in from the chunks left of / above the view
+            for cy in range(chunk_y.start - 1, chunk_y.stop):
+                chunk = self.chunks.get((cx, cy))
+                if chunk:
+                    offgrid.extend(chunk[0])
+        offgrid.sort(key=lambda entry: entry[0]) # same order as the offgrid list
+        surf.blits([(assets[tile['type']][tile['variant']], (tile['pos'][0] - offset[0], tile['pos'][1] - offset[1])) for _, tile in offgrid], doreturn=False)
+
+        blits = []
+        for cx in chunk_x:
+            for cy in chunk_y:
+                chunk = self.chunks.get((cx, cy))
+                if not chunk:
+                    continue
+                inside = x0 <= cx * RENDER_CHUNK and (cx + 1) * RENDER_CHUNK - 1 <= x1 and y0 <= cy * RENDER_CHUNK and (cy + 1) * RENDER_CHUNK - 1 <= y1
+                for loc in chunk[1]:
+                    tile = self.tilemap[loc]
+                    x, y = tile['pos']
+                    if inside or (x0 <= x <= x1 and y0 <= y <= y1):
+                        blits.append((assets[tile['type']][tile['variant']], (x * self.tile_size - offset[0], y * self.tile_size - offset[1])))
+        surf.blits(blits, doreturn=False)
+
+    def render_debug_hitboxes(self, surf, offset=(0, 0)):
+        # Draw physics tile rectangles in green
+        for x in range(offset[0] // self.tile_size, (offset[0] + surf.get_width()) // self.tile_size + 1):
+            for y in range(offset[1] // self.tile_size, (offset[1] + surf.get_height()) // self.tile_size + 1):
+                loc = str(x) + ';' + str(y)
+                if loc in self.tilemap:
+                    tile = self.tilemap[loc]
+                    if tile['type'] in self.physics_tiles:
+                        rect = pygame.Rect(
+                            tile['pos'][0] * self.tile_size - offset[0],
+                            tile['pos'][1] * self.tile_size - offset[1],
+                            self.tile_size,
+                            self.tile_size
+                        )
+                        pygame.draw.rect(surf, (0, 255, 0), rect, 1)
\ No newline at end of file
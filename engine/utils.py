@@ -0,0 +1,44 @@
+import pygame
+
+
+class ImageLoader:
+    """load_image / load_images bound to one game's resources, so call sites only pass the path inside its image folder."""
+
+    def __init__(self, resources, base_path='images/'):
+        self.resources = resources
+        self.base_path = base_path
+
+    def load_image(self, path):
+        name = self.base_path + path
+        img = pygame.image.load(self.resources.open(name), name).convert() # name is the format hint
+        img.set_colorkey((0, 0, 0))
+        return img
+
+    def load_images(self, path):
+        images = []
+        for img_name in self.resources.listdir(self.base_path + path):
+            images.append(self.load_image(path + '/' + img_name))
+        return images
+
+
+class Animation:
+    def __init__(self, images, img_dur=5, loop=True):
+        self.images = images
+        self.loop = loop
+        self.img_duration = img_dur
+        self.done = False
+        self.frame = 0 #current frame index
+
+    def copy(self):
+        return Animation(self.images, self.img_duration, self.loop)
+    
+    def update(self):
+        if self.loop:
+            self.frame = (self.frame + 1) % (len(self.images) * self.img_duration) #looping animation
+        else:
+            self.frame = min(self.frame + 1, self.img_duration * len(self.images) - 1) #non-looping animation
+            if self.frame >= self.img_duration * len(self.images) - 1:
+                self.done = True
+
+    def img(self):
+        return self.images[self.frame // self.img_duration]
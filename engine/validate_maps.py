@@ -0,0 +1,235 @@
+"""Checks and statistics for every shipped map, the maps spread over worker processes.
+
+    python -m engine.validate_maps                 # Ninja_game and Corebound
+    python -m engine.validate_maps Corebound --json
+
+Errors (exit status 1): a map that does not load, tiles whose type or variant has no
+image, spawner tiles the game does not know (Game.load_level leaves them in the map,
+where nothing can draw them), and spawners inside a solid tile or walled off from the
+player spawn.
+Warnings: neighbour masks auto_tile() has no variant for, a missing player spawn,
+spawners with no floor below them, and views that draw more than --max-blits tiles per
+frame.
+"""
+import argparse
+import json
+import os
+import sys
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+GAMES = ('Ninja_game', 'Corebound')
+MAP_DIRS = ('maps', 'the_secret_level')  # folders in data/ that hold maps
+VIEW_SIZE = (320, 240)  # display size both games render at
+MAX_BLITS = 1500  # tiles drawn in one view before a map is reported as expensive
+
+
+def init_worker(game_dir):
+    os.environ['PYGAME_HIDE_SUPPORT_PROMPT'] = '1'
+    sys.path.insert(0, game_dir)  # the game's scripts package holds its Tilemap tables
+
+
+def map_files(game_dir):
+    for folder in MAP_DIRS:
+        path = os.path.join(game_dir, 'data', folder)
+        if os.path.isdir(path):
+            for name in sorted(os.listdir(path)):
+                if name.endswith('.json'):
+                    yield os.path.join(path, name)
+
+
+def variant_counts(game_dir, tile_images):
+    counts = {}
+    for tile_type, images in tile_images.items():
+        if isinstance(images, int):
+            counts[tile_type] = images
+        else:
+            folder = os.path.join(game_dir, 'data', 'images', *images.split('/'))
+            counts[tile_type] = len(os.listdir(folder)) if os.path.isdir(folder) else 0
+    return counts
+
+
+def validate_map(game_dir, path, max_blits=MAX_BLITS):
+    """Report (a plain dict) for one map file; runs in a worker set up by init_worker."""
+    from scripts.tilemap import Tilemap
+
+    report = {"map": os.path.relpath(path, ROOT), "errors": [], "warnings": []}
+    tilemap = Tilemap(None)
+    try:
+        tilemap.load(path)
+    except (OSError, ValueError, KeyError) as e:
+        report["errors"].append(f"does not load: {e}")
+        return report
+    size = tilemap.tile_size
+    grid = tilemap.tilemap
+    tiles = [(tile, tuple(tile['pos'])) for tile in grid.values()]
+    tiles += [(tile, (int(tile['pos'][0] // size), int(tile['pos'][1] // size))) for tile in tilemap.offgrid_tiles]
+
+    # Images for every tile type and variant
+    if tilemap.tile_images:
+        counts = variant_counts(game_dir, tilemap.tile_images)
+        missing = Counter()
+        example = {}
+        for tile, cell in tiles:
+            key = (tile['type'], tile['variant'])
+            if tile['type'] not in counts or not 0 <= tile['variant'] < counts[tile['type']]:
+                missing[key] += 1
+                example.setdefault(key, cell)
+        for (tile_type, variant), n in sorted(missing.items()):
+            what = f"unknown tile type {tile_type}" if tile_type not in counts else f"{tile_type} variant {variant} has no image"
+            report["errors"].append(f"{what} ({n} tiles, e.g. at {example[(tile_type, variant)]})")
+
+    # Spawners
+    spawner_types = {tile_type for tile_type, variant in tilemap.spawner_tiles}
+    spawns = []
+    for tile, cell in tiles:
+        if tile['type'] not in spawner_types:
+            continue
+        kind = tilemap.spawner_tiles.get((tile['type'], tile['variant']))
+        if kind is None:
+            report["errors"].append(f"unknown spawner {tile['type']} variant {tile['variant']} at {cell} is left in the map")
+        else:
+            spawns.append((kind, cell))
+    players = [cell for kind, cell in spawns if kind == "player"]
+    if spawner_types and not players:
+        report["warnings"].append("no player spawn, the player starts at the game's default position")
+    elif len(players) > 1:
+        report["warnings"].append(f"{len(players)} player spawns, the game uses the last one")
+
+    bounds = None
+    if grid:
+        xs = [tile['pos'][0] for tile in grid.values()]
+        ys = [tile['pos'][1] for tile in grid.values()]
+        bounds = (min(xs), min(ys), max(xs), max(ys))
+        report["bounds"] = list(bounds)
+
+    # Reachability: air cells connected to the player spawn, inside the map plus a border
+    solid = {tuple(tile['pos']) for tile in grid.values() if tile['type'] in tilemap.physics_tiles}
+    if players and bounds:
+        x0, y0, x1, y1 = bounds[0] - 1, bounds[1] - 1, bounds[2] + 1, bounds[3] + 1
+        start = players[-1]
+        region = set()
+        if x0 <= start[0] <= x1 and y0 <= start[1] <= y1 and start not in solid:
+            region.add(start)
+            stack = [start]
+            while stack:
+                x, y = stack.pop()
+                for nx, ny in ((x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)):
+                    if x0 <= nx <= x1 and y0 <= ny <= y1 and (nx, ny) not in region and (nx, ny) not in solid:
+                        region.add((nx, ny))
+                        stack.append((nx, ny))
+        floors = {}  # column -> lowest solid row
+        for x, y in solid:
+            floors[x] = max(floors.get(x, y), y)
+        for kind, cell in spawns:
+            if cell in solid:
+                report["errors"].append(f"{kind} spawner at {cell} is inside a solid tile")
+            elif kind != "player" and cell not in region:
+                report["errors"].append(f"{kind} spawner at {cell} is walled off from the player spawn")
+            elif floors.get(cell[0], cell[1]) <= cell[1]:
+                report["warnings"].append(f"{kind} spawner at {cell} has no floor below it")
+
+    # Autotile masks with no variant
+    unmatched = Counter()
+    example = {}
+    for loc, tile in grid.items():
+        if tile['type'] not in tilemap.autotile_tiles:
+            continue
+        group = tilemap.autotile_groups.get(tile['type'], (tile['type'],))
+        neighbors = set()
+        for shift in tilemap.autotile_shifts:
+            neighbor = grid.get(str(tile['pos'][0] + shift[0]) + ';' + str(tile['pos'][1] + shift[1]))
+            if neighbor is not None and neighbor['type'] in group:
+                neighbors.add(shift)
+        neighbors = tuple(sorted(neighbors))
+        if tilemap.autotile_variant(tile, neighbors) is None:
+            unmatched[(tile['type'], neighbors)] += 1
+            example.setdefault((tile['type'], neighbors), loc)
+    for (tile_type, neighbors), n in unmatched.most_common():
+        report["warnings"].append(f"no autotile variant for {tile_type} with neighbours {list(neighbors)} ({n} tiles, e.g. at {example[(tile_type, neighbors)]})")
+
+    # Statistics and per-frame cost
+    report["tiles"] = len(grid)
+    report["offgrid"] = len(tilemap.offgrid_tiles)
+    report["types"] = dict(Counter(tile['type'] for tile, cell in tiles).most_common())
+    report["physics_tiles"] = len(solid)
+    report["entities"] = len(spawns)  # each one collides against the map every frame
+    if bounds:
+        import pygame
+        area = pygame.Rect(bounds[0] * size, bounds[1] * size, (bounds[2] - bounds[0] + 1) * size, (bounds[3] - bounds[1] + 1) * size)
+        report["collision_rects"] = len(tilemap.physics_rects_in(area))
+        blits = []
+        for left in range(area.left - VIEW_SIZE[0] // 2, area.right, VIEW_SIZE[0] // 2):
+            for top in range(area.top - VIEW_SIZE[1] // 2, area.bottom, VIEW_SIZE[1] // 2):
+                count = 0
+                for x in range(left // size, (left + VIEW_SIZE[0]) // size + 1): # the cells Tilemap.render looks at
+                    for y in range(top // size, (top + VIEW_SIZE[1]) // size + 1):
+                        if str(x) + ';' + str(y) in grid:
+                            count += 1
+                for tile in tilemap.offgrid_tiles:
+                    if left - size * 4 <= tile['pos'][0] < left + VIEW_SIZE[0] and top - size * 4 <= tile['pos'][1] < top + VIEW_SIZE[1]:
+                        count += 1
+                blits.append(count)
+        report["blits_avg"] = round(sum(blits) / len(blits), 1)
+        report["blits_max"] = max(blits)
+        if report["blits_max"] > max_blits:
+            report["warnings"].append(f"up to {report['blits_max']} tiles drawn per frame (limit {max_blits})")
+    return report
+
+
+def validate_games(game_dirs, jobs=None, max_blits=MAX_BLITS):
+    """Reports for every map of the given game folders, in map order."""
+    executors = []
+    futures = []
+    try:
+        for game_dir in game_dirs:
+            game_dir = os.path.abspath(game_dir)
+            executor = ProcessPoolExecutor(max_workers=jobs, initializer=init_worker, initargs=(game_dir,))  # one pool per game, both have a scripts package
+            executors.append(executor)
+            futures += [executor.submit(validate_map, game_dir, path, max_blits) for path in map_files(game_dir)]
+        return [future.result() for future in futures]
+    finally:
+        for executor in executors:
+            executor.shutdown()
+
+
+def format_report(report):
+    lines = []
+    if "tiles" in report:
+        summary = f"{report['tiles']} tiles, {report['offgrid']} offgrid, {report['entities']} entities"
+        if "bounds" in report:
+            x0, y0, x1, y1 = report["bounds"]
+            summary += f", {x1 - x0 + 1}x{y1 - y0 + 1} tiles from ({x0}, {y0})"
+            summary += f", {report['collision_rects']} collision rects, {report['blits_avg']} tiles drawn per frame (max {report['blits_max']})"
+        lines.append(f"{report['map']}: {summary}")
+        lines.append("  types: " + ", ".join(f"{tile_type} {n}" for tile_type, n in report["types"].items()))
+    else:
+        lines.append(f"{report['map']}:")
+    lines += ["  error: " + error for error in report["errors"]]
+    lines += ["  warning: " + warning for warning in report["warnings"]]
+    return '\n'.join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Validate maps and report their statistics.")
+    parser.add_argument('games', nargs='*', help="game folders (default: %s)" % ', '.join(GAMES))
+    parser.add_argument('--jobs', type=int, help="worker processes per game (default: one per CPU)")
+    parser.add_argument('--max-blits', type=int, default=MAX_BLITS, help="tiles drawn per frame before a map is reported as expensive")
+    parser.add_argument('--json', action='store_true', help="print the reports as JSON")
+    args = parser.parse_args()
+
+    games = args.games or [os.path.join(ROOT, game) for game in GAMES]
+    reports = validate_games(games, args.jobs, args.max_blits)
+    if args.json:
+        print(json.dumps(reports, indent=2))
+    else:
+        print('\n\n'.join(format_report(report) for report in reports))
+        errors = sum(len(report["errors"]) for report in reports)
+        warnings = sum(len(report["warnings"]) for report in reports)
+        print(f"\n{len(reports)} maps, {errors} errors, {warnings} warnings")
+    sys.exit(1 if any(report["errors"] for report in reports) else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,7 @@
+import os, sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)  # repo root, for the shared engine package
+sys.path.insert(0, os.path.join(ROOT, 'Ninja_game'))  # scripts.leaderboard; one game's scripts package per process
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
@@ -0,0 +1,133 @@
+import json
+import os
+
+from engine.autosave import Autosave, CHUNK_SIZE
+from engine.tilemap import Tilemap
+
+
+def tile(x, y, kind="grass"):
+    return {"type": kind, "variant": 0, "pos": [x, y]}
+
+
+def make_map(path, tiles=()):
+    with open(path, 'w') as f:
+        json.dump({"tilemap": {f"{x};{y}": tile(x, y) for x, y in tiles}, "tile_size": 16, "offgrid": []}, f)
+
+
+def editor(path, interval=0):
+    tilemap = Tilemap(None)
+    autosave = Autosave(tilemap, interval=interval)
+    tilemap.load(path)
+    return tilemap, autosave, autosave.open(path)
+
+
+def journal(path):
+    with open(path) as f:
+        return [json.loads(line) for line in f]
+
+
+def test_journal_holds_only_dirty_chunks(tmp_path):
+    path = str(tmp_path / "0.json")
+    make_map(path, [(0, 0), (CHUNK_SIZE * 3, 0)])
+    tilemap, autosave, recovery = editor(path)
+    assert not recovery
+    tilemap.set_tile((1, 0), "stone", 0)
+    autosave.flush()
+    records = journal(path + ".autosave")
+    assert [record["chunk"] for record in records] == [[0, 0]]
+    assert set(records[0]["tiles"]) == {"0;0", "1;0"}
+    autosave.close()
+
+
+def test_recover_replays_unsaved_session(tmp_path):
+    path = str(tmp_path / "0.json")
+    make_map(path, [(0, 0)])
+    tilemap, autosave, recovery = editor(path)
+    tilemap.set_tile((2, 0), "stone", 0)
+    tilemap.remove_tile((0, 0))
+    tilemap.add_offgrid({"type": "decor", "variant": 1, "pos": [5.5, 3.0]})
+    autosave.close()  # the editor quits without saving
+
+    tilemap, autosave, recovery = editor(path)
+    assert recovery
+    assert set(tilemap.tilemap) == {"0;0"}  # the map file is untouched
+    assert autosave.recover() == 2
+    autosave.flush()
+    assert set(tilemap.tilemap) == {"2;0"}
+    assert tilemap.offgrid_tiles == [{"type": "decor", "variant": 1, "pos": [5.5, 3.0]}]
+    assert not os.path.exists(autosave.pending_path)
+    assert {tuple(record["chunk"]) for record in journal(autosave.journal_path) if "chunk" in record} == {(0, 0)}  # recovered edits are journaled again
+    autosave.close()
+
+
+def test_edits_before_answering_the_prompt_stay_out_of_the_old_journal(tmp_path):
+    path = str(tmp_path / "0.json")
+    make_map(path, [(0, 0)])
+    tilemap, autosave, recovery = editor(path)
+    tilemap.set_tile((1, 0), "stone", 0)
+    autosave.close()
+
+    tilemap, autosave, recovery = editor(path)
+    assert recovery
+    tilemap.set_tile((CHUNK_SIZE * 2, 0), "grass", 0)  # edited while the prompt is up
+    autosave.flush()
+    assert [record["chunk"] for record in journal(autosave.pending_path)] == [[0, 0]]
+    assert [record["chunk"] for record in journal(autosave.journal_path)] == [[2, 0]]
+    autosave.discard()
+    autosave.flush()
+    assert not os.path.exists(autosave.pending_path)
+    assert os.path.exists(autosave.journal_path)
+    autosave.close()
+
+
+def test_save_writes_full_map_and_drops_journals(tmp_path):
+    path = str(tmp_path / "0.json")
+    make_map(path, [(x, 0) for x in range(40)])
+    tilemap, autosave, recovery = editor(path)
+    tilemap.set_tile((0, 1), "stone", 0)
+    autosave.update(force=True)
+    tilemap.remove_tile((39, 0))  # still dirty when saving
+    autosave.save()
+    autosave.flush()
+    with open(path) as f:
+        saved = json.load(f)
+    assert saved["tilemap"] == tilemap.tilemap
+    assert saved["tile_size"] == 16
+    assert not os.path.exists(autosave.journal_path)
+    autosave.close()
+
+
+def test_compaction_replaces_journal_with_a_snapshot(tmp_path, monkeypatch):
+    monkeypatch.setattr("engine.autosave.COMPACT_RECORDS", 3)
+    path = str(tmp_path / "0.json")
+    make_map(path, [(0, 0)])
+    tilemap, autosave, recovery = editor(path)
+    for i in range(5):
+        tilemap.set_tile((CHUNK_SIZE * i, 5), "stone", i)
+        autosave.update(force=True)
+    autosave.flush()
+    records = journal(autosave.journal_path)
+    assert "snapshot" in records[0]
+    expected = dict(tilemap.tilemap)
+    autosave.close()
+
+    tilemap, autosave, recovery = editor(path)
+    assert recovery
+    autosave.recover()
+    assert tilemap.tilemap == expected
+    autosave.close()
+
+
+def test_cut_off_last_record_is_skipped(tmp_path):
+    path = str(tmp_path / "0.json")
+    make_map(path, [(0, 0)])
+    tilemap, autosave, recovery = editor(path)
+    tilemap.set_tile((1, 0), "stone", 0)
+    autosave.close()
+    with open(path + ".autosave", 'a') as f:
+        f.write('{"chunk": [4, 0], "tiles": {"64;0"')  # crashed mid write
+
+    tilemap, autosave, recovery = editor(path)
+    assert autosave.recover() == 1
+    assert "1;0" in tilemap.tilemap
+    autosave.close()
@@ -0,0 +1,51 @@
+from engine.ecs import World, update_physics
+from engine.tilemap import Tilemap
+
+
+class WallMap(Tilemap):
+    physics_tiles = frozenset({'stone'})
+
+
+def make_map():
+    tilemap = WallMap(None, tile_size=16)
+    for x in range(10):
+        tilemap.set_tile((x, 4), 'stone', 0)  # floor at y = 64
+    for y in range(5):
+        tilemap.set_tile((5, y), 'stone', 0)  # wall at x = 80
+    return tilemap
+
+
+def columns(world):
+    archetype, = world.query('position', 'velocity', 'collider')
+    return archetype.columns
+
+
+def test_wall_hit_stops_horizontal_motion():
+    world = World()
+    world.spawn(position=(60.0, 54.0), velocity=(3.0, 0.0), collider=(8, 8, False))
+    tilemap = make_map()
+    for _ in range(20):
+        update_physics(world, tilemap)
+    cols = columns(world)
+    assert cols['x'][0] == 72.0  # flush against the wall
+    assert cols['vx'][0] == 0
+    assert cols['y'][0] == 56.0  # still falls and lands after the wall hit
+
+
+def test_falling_entity_lands_on_the_floor():
+    world = World()
+    world.spawn(position=(20.0, 0.0), velocity=(0.0, 0.0), collider=(8, 8, False))
+    tilemap = make_map()
+    for _ in range(100):
+        update_physics(world, tilemap)
+    cols = columns(world)
+    assert cols['y'][0] == 56.0
+    assert cols['vy'][0] == 0
+    assert cols['grounded'][0]
+
+
+def test_clear_resets_ids():
+    world = World()
+    world.spawn(lifetime=(5,))
+    world.clear()
+    assert world.spawn(lifetime=(5,)) == 0
@@ -0,0 +1,102 @@
+from engine.history import EditHistory
+from engine.tilemap import Tilemap
+
+
+def make_tilemap():
+    tilemap = Tilemap(None)
+    history = EditHistory(tilemap)
+    return tilemap, history
+
+
+def cells(tilemap):
+    return {loc: (tile['type'], tile['variant']) for loc, tile in tilemap.tilemap.items()}
+
+
+def test_stroke_is_one_step():
+    tilemap, history = make_tilemap()
+    tilemap.set_tile((0, 0), "grass", 0)
+    before = cells(tilemap)
+
+    history.begin()
+    for x in range(5):
+        tilemap.set_tile((x, 1), "stone", 0)
+    tilemap.set_tile((2, 1), "stone", 1)  # painted twice in the same drag
+    tilemap.remove_tile((0, 0))
+    history.end()
+    after = cells(tilemap)
+
+    assert len(history.undo_stack) == 2
+    assert history.undo()
+    assert cells(tilemap) == before
+    assert history.redo()
+    assert cells(tilemap) == after
+    assert not history.redo()
+
+
+def test_bulk_fill_is_one_step():
+    tilemap, history = make_tilemap()
+    for x in range(-1, 11):  # walls around a 10x3 room
+        tilemap.set_tile((x, -1), "stone", 0)
+        tilemap.set_tile((x, 3), "stone", 0)
+    for y in range(3):
+        tilemap.set_tile((-1, y), "stone", 0)
+        tilemap.set_tile((10, y), "stone", 0)
+    before = cells(tilemap)
+    steps = len(history.undo_stack)
+
+    region = tilemap.flood_region((4, 1))
+    assert len(region) == 30
+    with history.group():
+        tilemap.fill_cells(region, "grass", 0)
+    assert len(history.undo_stack) == steps + 1
+    assert history.undo_stack[-1].size() == 30
+
+    history.undo()
+    assert cells(tilemap) == before
+    history.redo()
+    assert all(cells(tilemap)[f"{x};{y}"] == ("grass", 0) for x in range(10) for y in range(3))
+
+
+def test_new_edit_clears_redo():
+    tilemap, history = make_tilemap()
+    tilemap.set_tile((0, 0), "grass", 0)
+    history.undo()
+    tilemap.set_tile((1, 0), "grass", 0)
+    assert not history.redo()
+    assert set(tilemap.tilemap) == {"1;0"}
+
+
+def test_undo_closes_a_stroke_whose_end_was_lost():
+    tilemap, history = make_tilemap()
+    history.begin()
+    tilemap.set_tile((0, 0), "grass", 0)
+    tilemap.set_tile((1, 0), "grass", 0)
+    # the button-up never arrives
+    assert history.undo()
+    assert tilemap.tilemap == {}
+    assert history.depth == 0
+    history.end()  # a late end() is harmless
+    tilemap.set_tile((5, 5), "grass", 0)
+    assert len(history.undo_stack) == 1
+
+
+def test_close_ends_nested_groups():
+    tilemap, history = make_tilemap()
+    history.begin()
+    history.begin()
+    tilemap.set_tile((0, 0), "grass", 0)
+    history.close()
+    assert history.depth == 0
+    assert history.current is None
+    assert len(history.undo_stack) == 1
+
+
+def test_undo_restores_offgrid_tiles():
+    tilemap, history = make_tilemap()
+    decor = {"type": "decor", "variant": 0, "pos": [3.5, 2.0]}
+    tilemap.add_offgrid(decor)
+    tilemap.remove_offgrid(decor)
+    history.undo()
+    assert tilemap.offgrid_tiles == [decor]
+    history.undo()
+    assert tilemap.offgrid_tiles == []
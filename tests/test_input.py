@@ -0,0 +1,109 @@
+import pygame
+
+from engine.input import InputMap, InputSnapshot, NO_INPUT, parse_binding
+
+pygame.init()  # key names are looked up like in the games, after init
+
+BINDINGS = {
+    "left": ["a", "left"],
+    "right": ["d", "right"],
+    "jump": ["w", "space"],
+    "undo": ["ctrl+z"],
+    "redo": ["ctrl+shift+z", "ctrl+y"],
+    "zoom_in": ["+"],
+}
+
+
+def down(key, mod=0):
+    return pygame.event.Event(pygame.KEYDOWN, key=key, mod=mod)
+
+
+def up(key, mod=0):
+    return pygame.event.Event(pygame.KEYUP, key=key, mod=mod)
+
+
+def test_parse_binding():
+    assert parse_binding("z") == (pygame.K_z, ())
+    assert parse_binding("ctrl+shift+z") == (pygame.K_z, (pygame.KMOD_CTRL, pygame.KMOD_SHIFT))
+    assert parse_binding("+") == (pygame.K_PLUS, ())
+    assert parse_binding("ctrl++") == (pygame.K_PLUS, (pygame.KMOD_CTRL,))
+
+
+def test_snapshot_reports_presses_once_and_holds_until_release():
+    controls = InputMap(BINDINGS)
+    controls.handle(down(pygame.K_d))
+    controls.handle(down(pygame.K_SPACE))
+    assert controls.snapshot() == InputSnapshot(frozenset({"right", "jump"}), frozenset({"right", "jump"}))
+    snapshot = controls.snapshot()
+    assert snapshot == InputSnapshot(frozenset({"right", "jump"}), frozenset())
+    assert snapshot.move == 1
+    controls.handle(up(pygame.K_d))
+    controls.handle(up(pygame.K_SPACE))
+    assert controls.snapshot() == NO_INPUT
+
+
+def test_tap_within_one_tick_is_still_a_press():
+    controls = InputMap(BINDINGS)
+    controls.handle(down(pygame.K_w))
+    controls.handle(up(pygame.K_w))
+    assert controls.snapshot() == InputSnapshot(frozenset(), frozenset({"jump"}))
+
+
+def test_binding_with_more_modifiers_wins():
+    controls = InputMap(BINDINGS)
+    assert controls.handle(down(pygame.K_z, pygame.KMOD_LCTRL | pygame.KMOD_LSHIFT))
+    assert controls.snapshot().pressed == {"redo"}
+    controls.handle(up(pygame.K_z))
+    controls.handle(down(pygame.K_z, pygame.KMOD_RCTRL))
+    assert controls.snapshot().pressed == {"undo"}
+    controls.handle(up(pygame.K_z))
+    assert not controls.handle(down(pygame.K_z))  # plain z is not bound
+    assert controls.snapshot() == NO_INPUT
+
+
+def test_rebind_replaces_the_old_keys():
+    controls = InputMap(BINDINGS)
+    controls.rebind("jump", ["up", "k"])
+    assert not controls.handle(down(pygame.K_w))
+    assert controls.handle(down(pygame.K_k))
+    assert controls.snapshot().pressed == {"jump"}
+    controls.rebind("dash", ["shift+d"])  # a new action
+    assert "dash" in controls.actions
+    controls.handle(down(pygame.K_d, pygame.KMOD_LSHIFT))
+    controls.handle(down(pygame.K_d))
+    assert controls.snapshot().pressed == {"dash", "right"}
+
+
+def test_buffered_press_lasts_until_consumed():
+    controls = InputMap(BINDINGS, buffer={"jump": 3})
+    controls.handle(down(pygame.K_SPACE))
+    controls.handle(up(pygame.K_SPACE))
+    assert "jump" in controls.snapshot().pressed
+    assert "jump" in controls.snapshot().pressed
+    controls.consume("jump")
+    assert controls.snapshot() == NO_INPUT
+
+    controls.handle(down(pygame.K_SPACE))
+    controls.handle(up(pygame.K_SPACE))
+    assert ["jump" in controls.snapshot().pressed for _ in range(4)] == [True, True, True, False]
+
+
+def test_encode_decode_round_trip_and_record():
+    controls = InputMap(BINDINGS)
+    controls.record = []
+    controls.handle(down(pygame.K_a))
+    first = controls.snapshot()
+    controls.handle(down(pygame.K_y, pygame.KMOD_CTRL))
+    second = controls.snapshot()
+    assert [controls.decode(value) for value in controls.record] == [first, second]
+    assert controls.encode(NO_INPUT) == 0
+    assert controls.decode(controls.encode(second)) == second
+
+
+def test_clear_forgets_held_keys():
+    controls = InputMap(BINDINGS, buffer={"jump": 5})
+    controls.handle(down(pygame.K_a))
+    controls.handle(down(pygame.K_w))
+    controls.clear()
+    assert controls.snapshot() == NO_INPUT
+    assert not controls.handle(up(pygame.K_a))  # its press was forgotten too
@@ -0,0 +1,98 @@
+import json
+import os
+import threading
+
+import pytest
+
+from scripts import leaderboard
+from scripts.leaderboard import Leaderboard, LeaderboardWriter, write_atomic
+
+
+def entry(time_ms):
+    return {"time_ms": time_ms, "att:": 1, "timestamp": str(time_ms), "formatted_time": leaderboard.format_time(time_ms)}
+
+
+def test_writer_coalesces_saves_while_busy(tmp_path, monkeypatch):
+    writes = []
+    started = threading.Event()
+    release = threading.Event()
+
+    def slow_write(path, entries):
+        writes.append((path, entries))
+        started.set()
+        release.wait(5)
+
+    monkeypatch.setattr(leaderboard, "write_atomic", slow_write)
+    writer = LeaderboardWriter()
+    path = str(tmp_path / "leaderboard_normal.json")
+    writer.submit(path, [entry(1)])
+    assert started.wait(5)  # the first save is being written
+    for i in range(2, 6):
+        writer.submit(path, [entry(i)])
+    release.set()
+    writer.close()
+    assert writes == [(path, [entry(1)]), (path, [entry(5)])]
+
+
+def test_submit_takes_a_copy_of_the_entries(tmp_path):
+    writer = LeaderboardWriter()
+    path = str(tmp_path / "scores" / "leaderboard_hard.json")
+    entries = [entry(100)]
+    writer.submit(path, entries)
+    entries.append(entry(200))
+    writer.close()
+    with open(path) as f:
+        assert json.load(f) == [entry(100)]
+
+
+def test_write_atomic_replaces_only_a_complete_file(tmp_path, monkeypatch):
+    path = str(tmp_path / "leaderboard_normal.json")
+    write_atomic(path, [entry(1)])
+    replaced = []
+    real_replace = os.replace
+
+    def checked_replace(src, dst):
+        with open(src) as f:
+            replaced.append(json.load(f))  # the temporary file is complete before it goes live
+        real_replace(src, dst)
+
+    monkeypatch.setattr(leaderboard.os, "replace", checked_replace)
+    write_atomic(path, [entry(2), entry(3)])
+    assert replaced == [[entry(2), entry(3)]]
+    assert not os.path.exists(path + ".tmp")
+
+
+def test_failed_write_keeps_the_old_scores(tmp_path, monkeypatch):
+    path = str(tmp_path / "leaderboard_normal.json")
+    write_atomic(path, [entry(1)])
+
+    def crash(entries, f, **kwargs):
+        f.write('[{"time_ms": ')
+        raise OSError("disk full")
+
+    monkeypatch.setattr(leaderboard.json, "dump", crash)
+    with pytest.raises(OSError):
+        write_atomic(path, [entry(2)])
+    monkeypatch.undo()
+    with open(path) as f:
+        assert json.load(f) == [entry(1)]
+
+
+def test_add_score_keeps_top_five_on_disk(tmp_path):
+    board = Leaderboard(str(tmp_path))
+    for time_ms in (5000, 3000, 9000, 1000, 7000, 2000, 8000):
+        board.add_score(time_ms, 1, "hard")
+    assert board.add_score(500, 2, "hard") == 1
+    assert board.add_score(99999, 1, "hard") is None
+    board.close()
+    with open(tmp_path / "leaderboard_hard.json") as f:
+        assert [run["time_ms"] for run in json.load(f)] == [500, 1000, 2000, 3000, 5000]
+    assert Leaderboard(str(tmp_path)).get_leaderboard("hard")[0]["time_ms"] == 500
+
+
+def test_unreadable_file_is_moved_aside(tmp_path):
+    (tmp_path / "leaderboard_baby.json").write_text('[{"time_ms": 12')
+    board = Leaderboard(str(tmp_path))
+    assert board.get_leaderboard("baby_mode") == []
+    assert (tmp_path / "leaderboard_baby.json.bad").exists()
+    board.close()
@@ -0,0 +1,143 @@
+import json
+import random
+
+import pytest
+
+from scripts.leaderboard_sqlite import SQLiteLeaderboard, BUCKET_MS
+
+
+@pytest.fixture
+def board(tmp_path):
+    board = SQLiteLeaderboard(str(tmp_path))
+    yield board
+    board.close()
+
+
+def buckets(board, dif):
+    return dict(board.db.execute("SELECT bucket, runs FROM run_buckets WHERE difficulty = ?", (dif,)))
+
+
+def test_rank_matches_a_full_sort(board):
+    random.seed(3)
+    times = [random.randrange(0, 20 * BUCKET_MS) for _ in range(300)]
+    times += times[:20]  # ties
+    ids = []
+    for time_ms in times:
+        board.add_score(time_ms, 1, "normal")
+        ids.append(board.db.execute("SELECT MAX(id) FROM runs").fetchone()[0])
+    order = sorted(zip(times, ids))
+    for position, (time_ms, run_id) in enumerate(order, 1):
+        assert board.rank("normal", time_ms, run_id) == position
+
+
+def test_ties_go_to_the_earlier_run(board):
+    assert board.add_score(4200, 1, "hard") == 1
+    assert board.add_score(4200, 3, "hard") == 2
+    assert board.add_score(4199, 2, "hard") == 1
+    assert [run["att:"] for run in board.top("hard")] == [2, 1, 3]
+    assert board.rank("hard", 4200) == 2  # a time that is not stored yet ranks before equal runs
+
+
+def test_trigger_keeps_bucket_counts(board):
+    for time_ms in (999, 1000, 1500, 2999, 1000):
+        board.add_score(time_ms, 1, "normal")
+    board.add_score(1200, 1, "hard")
+    assert buckets(board, "normal") == {0: 1, 1: 3, 2: 1}
+    assert buckets(board, "hard") == {1: 1}
+    with board.db:
+        board.db.execute("DELETE FROM runs WHERE difficulty = 'normal' AND time_ms = 1500")
+    assert buckets(board, "normal") == {0: 1, 1: 2, 2: 1}
+    assert board.count("normal") == 4
+    assert board.rank("normal", 2999) == 4
+
+
+def test_rank_with_heavy_clustering_inside_one_second(board):
+    random.seed(5)
+    times = [45000 + min(999, max(0, int(random.gauss(500, 40)))) for _ in range(3000)]
+    times += [44999, 46000] * 5
+    with board.db:
+        ids = [board.db.execute("INSERT INTO runs (difficulty, time_ms, attempts, timestamp) VALUES ('normal', ?, 1, '')",
+                                (time_ms,)).lastrowid for time_ms in times]
+    order = sorted(zip(times, ids))
+    for position, (time_ms, run_id) in enumerate(order, 1):
+        if position % 7 == 0 or time_ms in (44999, 46000):
+            assert board.rank("normal", time_ms, run_id) == position
+    assert board.rank("normal", 45500) == sum(time_ms < 45500 for time_ms in times) + 1
+    assert board.percentile("normal", 45500) == pytest.approx(sum(time_ms > 45500 for time_ms in times) * 100.0 / len(times))
+
+
+def test_trigger_keeps_millisecond_counts(board):
+    for time_ms in (1000, 1000, 1001):
+        board.add_score(time_ms, 1, "normal")
+    assert dict(board.db.execute("SELECT time_ms, runs FROM run_times WHERE difficulty = 'normal'")) == {1000: 2, 1001: 1}
+    with board.db:
+        board.db.execute("DELETE FROM runs WHERE time_ms = 1000 AND id = (SELECT MIN(id) FROM runs)")
+    assert dict(board.db.execute("SELECT time_ms, runs FROM run_times WHERE difficulty = 'normal'")) == {1000: 1, 1001: 1}
+    assert board.rank("normal", 1001) == 2
+
+
+def test_older_database_gets_millisecond_counts(tmp_path):
+    board = SQLiteLeaderboard(str(tmp_path))
+    for time_ms in (3000, 1200, 1200, 1100):
+        board.add_score(time_ms, 1, "normal")
+    with board.db:  # back to how the first schema version left it
+        board.db.execute("DROP TRIGGER count_run_time")
+        board.db.execute("DROP TRIGGER uncount_run_time")
+        board.db.execute("DROP TABLE run_times")
+        board.db.execute("PRAGMA user_version = 1")
+    board.close()
+
+    board = SQLiteLeaderboard(str(tmp_path))
+    assert board.count("normal") == 4  # nothing imported twice
+    assert board.rank("normal", 1200) == 2
+    assert board.add_score(1150, 1, "normal") == 2
+    board.close()
+
+
+def test_percentile(board):
+    assert board.percentile("normal", 1000) == 100.0  # no runs yet
+    for time_ms in (1000, 2000, 3000, 4000):
+        board.add_score(time_ms, 1, "normal")
+    assert board.percentile("normal", 500) == 100.0
+    assert board.percentile("normal", 2000) == 50.0
+    assert board.percentile("normal", 2500) == 50.0
+    assert board.percentile("normal", 4000) == 0.0
+
+
+def test_add_score_reports_only_top_list_ranks(board):
+    for time_ms in range(1000, 6000, 1000):
+        board.add_score(time_ms, 1, "normal")
+    assert board.add_score(9000, 1, "normal") is None
+    assert board.add_score(1500, 1, "normal") == 2
+    assert len(board.get_leaderboard("normal")) == board.max_entries
+
+
+def test_migrate_json_imports_once(tmp_path):
+    runs = [{"time_ms": 3000, "att:": 2, "timestamp": "2024-01-01T10:00:00", "formatted_time": "00:03:000"},
+            {"time_ms": 1000, "att:": 5, "timestamp": "2024-01-02T10:00:00", "formatted_time": "00:01:000"}]
+    (tmp_path / "leaderboard_normal.json").write_text(json.dumps(runs))
+    (tmp_path / "leaderboard_baby.json").write_text(json.dumps(runs[:1]))
+    (tmp_path / "leaderboard_hard.json").write_text("not json")
+
+    board = SQLiteLeaderboard(str(tmp_path))
+    assert [(run["time_ms"], run["att:"]) for run in board.top("normal")] == [(1000, 5), (3000, 2)]
+    assert board.count("baby_mode") == 1
+    assert board.count("hard") == 0
+    assert buckets(board, "normal") == {1: 1, 3: 1}
+    board.close()
+
+    board = SQLiteLeaderboard(str(tmp_path))  # the schema version is set, nothing is imported again
+    assert board.count("normal") == 2
+    assert (tmp_path / "leaderboard_normal.json").exists()
+    board.close()
+
+
+def test_history_and_personal_best(board):
+    board.add_score(5000, 1, "normal", player="ana")
+    board.add_score(3000, 2, "normal", player="ana")
+    board.add_score(1000, 1, "normal", player="ben")
+    board.add_score(2000, 1, "hard", player="ana")
+    assert [run["time_ms"] for run in board.history("ana")] == [2000, 3000, 5000]
+    assert [run["time_ms"] for run in board.history("ana", "normal")] == [3000, 5000]
+    assert board.personal_best("ana", "normal")["time_ms"] == 3000
+    assert board.personal_best("ben", "hard") is None